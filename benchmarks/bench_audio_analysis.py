@@ -0,0 +1,112 @@
+# benchmarks/bench_audio_analysis.py
+"""
+Audio analysis on synthesized tracks: a noise-burst click on every beat
+over a sustained triad and scale tones, at known BPMs and keys. Reports
+throughput per worker count and checks the detected BPM and key, that a
+second run analyzes nothing, and what the analysis does to the set's
+transition cost (unanalyzed tracks have bpm=0, key="").
+Run from the repo root:  python -m benchmarks.bench_audio_analysis
+"""
+
+import os
+import random
+import shutil
+import tempfile
+import time
+import wave
+from pathlib import Path
+
+import numpy as np
+
+from utils.audio_analysis import analyze_files, find_wavs
+from utils.camelot import key_name, pitch_class_code
+from utils.sequencing import order_tracks, sequence_cost
+from utils.track import Track
+from utils.track_db import DB_PATH, TrackDB
+
+N_FILES = 24
+SECONDS = 60
+SR = 44100
+
+
+def synth(bpm, pitch_class, minor, seconds, rng):
+    """Stereo int16 samples: tonic triad, quieter scale tones, beat clicks."""
+    t = np.arange(int(seconds * SR)) / SR
+    scale = (0, 2, 3, 5, 7, 8, 10) if minor else (0, 2, 4, 5, 7, 9, 11)
+    y = np.zeros_like(t)
+    for step, amp in ((0, 1.0), (3 if minor else 4, 0.7), (7, 0.8)):
+        y += amp * np.sin(2 * np.pi * 220 * 2 ** ((pitch_class + step - 9) / 12) * t)
+    for step in scale:
+        y += 0.15 * np.sin(2 * np.pi * 440 * 2 ** ((pitch_class + step - 9) / 12) * t)
+    y *= 0.2
+    click_len = int(0.02 * SR)
+    click = rng.standard_normal(click_len) * np.exp(-np.arange(click_len) / (0.004 * SR))
+    for beat in np.arange(0, seconds - 0.05, 60 / bpm):
+        i = int(beat * SR)
+        y[i:i + click_len] += click
+    y = (y / np.abs(y).max() * 32000).astype(np.int16)
+    return np.repeat(y, 2)
+
+
+def write_wav(path, samples):
+    with wave.open(str(path), "wb") as wf:
+        wf.setnchannels(2)
+        wf.setsampwidth(2)
+        wf.setframerate(SR)
+        wf.writeframes(samples.tobytes())
+
+
+def main():
+    rng = random.Random(0)
+    nrng = np.random.default_rng(0)
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        truth = {}
+        for i in range(N_FILES):
+            bpm = round(rng.uniform(75, 175), 1)
+            pc, minor = rng.randrange(12), rng.random() < 0.5
+            title = f"Bench Track {i}"
+            write_wav(tmp / f"Synth Artist - {title}.wav",
+                      synth(bpm, pc, minor, SECONDS, nrng))
+            truth[title] = (bpm, key_name(pitch_class_code(pc, minor)))
+        wavs = find_wavs([tmp])
+
+        print(f"{N_FILES} files x {SECONDS} s")
+        print(f"  {'workers':>7} {'wall s':>8} {'files/s':>8} {'x realtime':>11}")
+        cores = os.cpu_count() or 1
+        for workers in sorted({1, cores}):
+            db_copy = tmp / f"track_info_{workers}.db"
+            shutil.copy(DB_PATH, db_copy)
+            db = TrackDB(db_copy)
+            t0 = time.perf_counter()
+            analyzed, skipped, failed = analyze_files(wavs, db, workers)
+            dt = time.perf_counter() - t0
+            assert (analyzed, skipped, failed) == (N_FILES, 0, 0)
+            print(f"  {workers:7d} {dt:8.2f} {N_FILES / dt:8.1f} "
+                  f"{N_FILES * SECONDS / dt:11.0f}")
+
+        # results are in the library, within 0.1 BPM and in the right key
+        tracks = {t.title: t for t in db.get_all_tracks() if t.title in truth}
+        assert len(tracks) == N_FILES
+        for title, (bpm, key) in truth.items():
+            t = tracks[title]
+            assert abs(t.bpm - bpm) <= 0.1 and t.key == key, (title, bpm, key, t)
+        print(f"  all {N_FILES} within 0.1 BPM, keys exact")
+
+        # nothing is analyzed twice
+        t0 = time.perf_counter()
+        again = analyze_files(wavs, db, workers=1)
+        assert again == (0, N_FILES, 0)
+        print(f"  re-run: {again[1]} skipped in {(time.perf_counter() - t0) * 1000:.1f} ms")
+
+        blind = [Track(t.title, t.artist) for t in tracks.values()]
+        known = list(tracks.values())
+        before = sequence_cost(order_tracks(blind, mode="fast"))
+        after = sequence_cost(order_tracks(known, mode="fast"))
+        print(f"  set transition cost: {before:.1f} unanalyzed, {after:.1f} analyzed")
+        assert after < before
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
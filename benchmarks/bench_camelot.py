@@ -0,0 +1,88 @@
+# benchmarks/bench_camelot.py
+"""
+Camelot key distance: the old string-parsing camelot_distance vs the
+precomputed code tables in utils.camelot, per pair and vectorized.
+Run from the repo root:  python -m benchmarks.bench_camelot
+"""
+
+import random
+import time
+
+from utils.camelot import (DISTANCE, DISTANCE_NP, distance_matrix, encode_keys,
+                           parse_key, relation)
+from utils.setlist_order import camelot_distance
+
+PAIRS = 1_000_000
+MATRIX_N = 2000
+KEYS = [f"{n}{l}" for n in range(1, 13) for l in "AB"] + [""]
+
+
+def old_camelot_distance(key1, key2):
+    # the string version camelot_distance replaced, kept for comparison
+    if not key1 or not key2 or key1 == key2:
+        return 0 if key1 == key2 else 2
+    try:
+        num1, let1 = int(key1[:-1]), key1[-1]
+        num2, let2 = int(key2[:-1]), key2[-1]
+    except ValueError:
+        return 2
+    if num1 == num2 and let1 != let2:
+        return 1
+    if let1 == let2:
+        if abs(num1 - num2) == 1 or {num1, num2} == {1, 12}:
+            return 1
+    return 2
+
+
+def timed(fn):
+    t0 = time.perf_counter()
+    out = fn()
+    return out, time.perf_counter() - t0
+
+
+def main():
+    for a in KEYS:
+        for b in KEYS:
+            assert camelot_distance(a, b) == old_camelot_distance(a, b), (a, b)
+    print("table distances match the string version for all 25x25 key pairs")
+    for a in ("", "N/A", "Am"):
+        for b in ("", "N/A", "Am"):
+            assert camelot_distance(a, b) == old_camelot_distance(a, b), (a, b)
+
+    for a, b in (("8A", "9A"), ("8A", "10A"), ("8A", "3A"), ("8A", "1A"),
+                 ("8A", "8B"), ("8A", "9B"), ("8A", "2A"), ("8A", "")):
+        print(f"  {a:>3} -> {b or '?':<3} {relation(a, b)}")
+
+    rng = random.Random(0)
+    k1 = [rng.choice(KEYS) for _ in range(PAIRS)]
+    k2 = [rng.choice(KEYS) for _ in range(PAIRS)]
+
+    old, t_old = timed(lambda: [old_camelot_distance(a, b) for a, b in zip(k1, k2)])
+    new, t_new = timed(lambda: [camelot_distance(a, b) for a, b in zip(k1, k2)])
+    assert old == new
+
+    c1, c2 = encode_keys(k1), encode_keys(k2)
+    rows = [DISTANCE[a] for a in range(len(DISTANCE))]
+    codes, t_codes = timed(lambda: [rows[a][b] for a, b in zip(c1.tolist(), c2.tolist())])
+    assert codes == old
+    vec, t_vec = timed(lambda: DISTANCE_NP[c1, c2])
+    assert vec.tolist() == old
+
+    print(f"\n{PAIRS:,} random key pairs")
+    print(f"  string camelot_distance   {t_old * 1000:8.1f} ms")
+    print(f"  table camelot_distance    {t_new * 1000:8.1f} ms  {t_old / t_new:5.1f}x")
+    print(f"  pre-parsed codes, lookup  {t_codes * 1000:8.1f} ms  {t_old / t_codes:5.1f}x")
+    print(f"  numpy table lookup        {t_vec * 1000:8.1f} ms  {t_old / t_vec:5.0f}x")
+
+    keys = [rng.choice(KEYS) for _ in range(MATRIX_N)]
+    _, t_mat_old = timed(lambda: [[old_camelot_distance(a, b) for b in keys] for a in keys])
+    mat, t_mat = timed(lambda: distance_matrix(encode_keys(keys)))
+    assert mat[5, 7] == old_camelot_distance(keys[5], keys[7])
+    assert parse_key(keys[5]) == encode_keys(keys)[5]
+    print(f"\n{MATRIX_N}x{MATRIX_N} distance matrix")
+    print(f"  nested string loops       {t_mat_old * 1000:8.1f} ms")
+    print(f"  encode + distance_matrix  {t_mat * 1000:8.1f} ms  {t_mat_old / t_mat:5.0f}x")
+
+
+if __name__ == "__main__":
+    main()
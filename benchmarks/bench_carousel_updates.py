@@ -0,0 +1,77 @@
+# benchmarks/bench_carousel_updates.py
+"""
+Counts CarouselItem constructions for single-track queue edits.
+Run from the repo root:  python -m benchmarks.bench_carousel_updates
+"""
+
+import os
+import sys
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtWidgets import QApplication
+
+import widgets.cover_carousel as cc
+from utils.track import Track
+
+QUEUE_LEN = 500
+
+
+class CountingItem(cc.CarouselItem):
+    constructed = 0
+
+    def __init__(self, *args, **kwargs):
+        CountingItem.constructed += 1
+        super().__init__(*args, **kwargs)
+
+
+def make_track(i):
+    # no thumbnail: keeps the network out of the measurement
+    return Track(f"Track {i}", f"Artist {i % 40}", 120 + i % 10, f"{i % 12 + 1}A")
+
+
+def timed(label, fn):
+    CountingItem.constructed = 0
+    t0 = time.perf_counter()
+    fn()
+    dt = time.perf_counter() - t0
+    print(f"  {label:32s} {CountingItem.constructed:4d} constructions "
+          f"{dt*1000:9.2f} ms")
+    return CountingItem.constructed
+
+
+def main():
+    app = QApplication(sys.argv)
+    cc.CarouselItem = CountingItem
+
+    queue = [make_track(i) for i in range(QUEUE_LEN)]
+    carousel = cc.CoverCarousel(queue)
+    carousel.show()
+    app.processEvents()
+    print(f"{QUEUE_LEN}-track queue")
+
+    req = make_track(QUEUE_LEN)
+    queue.insert(250, req)
+    n_insert = timed("insert_item", lambda: carousel.insert_item(250, req))
+
+    req2 = make_track(QUEUE_LEN + 1)
+    queue.insert(100, req2)
+    n_diff = timed("set_items (diffed)", lambda: carousel.set_items(queue))
+
+    n_move = timed("move_item", lambda: carousel.move_item(100, 400))
+    n_remove = timed("remove_item", lambda: carousel.remove_item(400))
+
+    fresh = [make_track(10_000 + i) for i in range(QUEUE_LEN)]
+    timed("set_items (all new, old cost)", lambda: carousel.set_items(fresh))
+
+    assert n_insert == 1, n_insert
+    assert n_diff == 1, n_diff
+    assert n_move == 0 and n_remove == 0
+    assert [w.data for w in (carousel.h_layout.itemAt(i).widget()
+            for i in range(carousel.h_layout.count()))] == carousel.items
+    print("ok: single-track edits construct at most one widget")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+# benchmarks/bench_carousel_virtual.py
+"""
+Next/Previous latency of the classic vs virtualized carousel.
+Run from the repo root:  python -m benchmarks.bench_carousel_virtual
+"""
+
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtWidgets import QApplication
+from PySide6.QtCore import QBuffer, QIODevice
+from PySide6.QtGui import QImage, QColor
+
+from utils.track import Track
+from widgets.cover_carousel import CoverCarousel
+from widgets.thumbnail_loader import ThumbnailLoader
+
+SIZES = (50, 500, 5000)
+N_COVERS = 64     # distinct cover images shared by the synthetic tracks
+PRESSES = 60
+
+
+def make_png(seed):
+    img = QImage(500, 500, QImage.Format_RGB32)
+    img.fill(QColor((seed * 37) % 256, (seed * 91) % 256, (seed * 53) % 256))
+    buf = QBuffer()
+    buf.open(QIODevice.WriteOnly)
+    img.save(buf, "PNG")
+    return bytes(buf.data())
+
+
+def make_items(n):
+    return [
+        Track(f"Track {i}", f"Artist {i % 50}", 110 + i % 30,
+              f"{i % 12 + 1}{'AB'[i % 2]}",
+              thumbnail=f"bench://cover/{i % N_COVERS}")
+        for i in range(n)
+    ]
+
+
+def press_latency(app, carousel):
+    lat = []
+    for step in [carousel.next] * PRESSES + [carousel.previous] * PRESSES:
+        t0 = time.perf_counter()
+        step()
+        app.processEvents()
+        lat.append(time.perf_counter() - t0)
+    return statistics.mean(lat), sorted(lat)[int(len(lat) * 0.95)]
+
+
+def check_window(carousel):
+    for i in range(carousel._lo, carousel._hi):
+        assert carousel.widget_at(i).data is carousel.items[i], i
+    assert carousel._lo <= carousel.current_index < carousel._hi
+
+
+def main():
+    app = QApplication(sys.argv)
+    with tempfile.TemporaryDirectory() as cache_dir:
+        loader = ThumbnailLoader(cache_dir=cache_dir, max_items=N_COVERS)
+        # seed the in-memory cache directly; this measures layout/scaling only
+        for i in range(N_COVERS):
+            loader._on_fetched(f"bench://cover/{i}", make_png(i))
+
+        print(f"{'tracks':>6} {'mode':>8} {'build ms':>9} {'widgets':>8} "
+              f"{'next mean ms':>13} {'p95 ms':>8}")
+        for n in SIZES:
+            for virtual in (False, True):
+                if n > 500 and not virtual:
+                    print(f"{n:6d} {'classic':>8}   (skipped: one widget per track)")
+                    continue
+                items = make_items(n)
+                t0 = time.perf_counter()
+                carousel = CoverCarousel(items, loader=loader, virtual=virtual)
+                carousel.resize(900, 320)
+                carousel.show()
+                app.processEvents()
+                build = time.perf_counter() - t0
+                # start mid-set so both directions recycle widgets
+                carousel.current_index = n // 2
+                carousel.update_focus()
+                mean, p95 = press_latency(app, carousel)
+                widgets = carousel._hi - carousel._lo
+                print(f"{n:6d} {'virtual' if virtual else 'classic':>8} "
+                      f"{build*1000:9.1f} {widgets:8d} {mean*1000:13.3f} "
+                      f"{p95*1000:8.3f}")
+                if virtual:
+                    check_window(carousel)
+                    rng = random.Random(n)
+                    for _ in range(50):
+                        op = rng.randrange(3)
+                        if op == 0:
+                            carousel.insert_item(rng.randrange(len(carousel.items)+1),
+                                                 make_items(1)[0])
+                        elif op == 1:
+                            carousel.remove_item(rng.randrange(len(carousel.items)))
+                        else:
+                            carousel.move_item(rng.randrange(len(carousel.items)),
+                                               rng.randrange(len(carousel.items)))
+                        check_window(carousel)
+                carousel.close()
+                carousel.deleteLater()
+                app.processEvents()
+        loader.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+# benchmarks/bench_cold_start.py
+"""
+Cold start to first window, each run in a fresh interpreter: with the
+old eager imports (matplotlib, requests, yt-dlp) and energy figure
+built up front, vs the lazy imports. The playlist import is stubbed,
+so only start-up cost is measured.
+Run from the repo root:  python -m benchmarks.bench_cold_start
+"""
+
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+RUNS = 5
+ROOT = Path(__file__).resolve().parent.parent
+
+CHILD = r"""
+import os, sys, time, json, tempfile, shutil
+t0 = time.perf_counter()
+os.environ["QT_QPA_PLATFORM"] = "offscreen"
+EAGER = sys.argv[1] == "eager"
+from PySide6.QtWidgets import QApplication
+if EAGER:
+    import requests, yt_dlp
+    import matplotlib.pyplot as plt
+    from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg
+from ui.main_window import MainWindow
+from ui.startup_loader import StartupLoader
+from utils.soundcloud_import import SCCache
+from utils.track_db import DB_PATH, TrackDB
+from benchmarks.bench_sc_import import PLAYLIST_URL, StubYoutubeDL
+t_import = time.perf_counter() - t0
+
+app = QApplication([])
+tmp = tempfile.mkdtemp()
+# the loader migrates its DB; keep that off the user's library
+shutil.copy(DB_PATH, os.path.join(tmp, "track_info.db"))
+loader = StartupLoader(PLAYLIST_URL, db=TrackDB(os.path.join(tmp, "track_info.db")),
+                       ydl_factory=StubYoutubeDL,
+                       sc_cache=SCCache(os.path.join(tmp, "c.db")))
+win = MainWindow(PLAYLIST_URL, loader=loader,
+                 session_path=os.path.join(tmp, "session.json"))
+if EAGER:
+    # what the constructor used to do for the hidden energy curve
+    fig, ax = plt.subplots(figsize=(6,2), dpi=100)
+    ax.plot([], [], marker="o")
+    fig.tight_layout()
+    win.main_layout.addWidget(FigureCanvasQTAgg(fig))
+win.show()
+app.processEvents()
+t_shown = time.perf_counter() - t0
+loader.cancel()
+print(json.dumps({"imports": t_import, "shown": t_shown,
+                  "modules": len(sys.modules)}))
+"""
+
+
+def run(mode):
+    env = dict(os.environ, PYTHONPATH=str(ROOT))
+    t0 = time.perf_counter()
+    out = subprocess.run([sys.executable, "-c", CHILD, mode], cwd=ROOT, env=env,
+                         capture_output=True, text=True, check=True)
+    wall = time.perf_counter() - t0
+    res = json.loads(out.stdout.strip().splitlines()[-1])
+    res["wall"] = wall
+    return res
+
+
+def main():
+    # one throwaway run of each so the disk cache is warm for both
+    run("eager")
+    run("lazy")
+    print(f"median of {RUNS} fresh interpreters")
+    print(f"{'':>8} {'imports ms':>11} {'first window ms':>16} {'process ms':>11} {'modules':>8}")
+    medians = {}
+    for mode in ("eager", "lazy"):
+        rs = [run(mode) for _ in range(RUNS)]
+        med = {k: statistics.median(r[k] for r in rs) for k in rs[0]}
+        medians[mode] = med
+        print(f"{mode:>8} {med['imports'] * 1000:11.0f} {med['shown'] * 1000:16.0f} "
+              f"{med['wall'] * 1000:11.0f} {med['modules']:8.0f}")
+    cut = 1 - medians["lazy"]["shown"] / medians["eager"]["shown"]
+    print(f"time to first window cut by {cut:.0%}")
+    assert cut > 0.2
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+# benchmarks/bench_energy_timeline.py
+"""
+Energy curve redraw cost on a 1000-track set: the matplotlib figure the
+window used to redraw from scratch vs EnergyTimeline, for a request
+insert, a reorder and a step of the current track.
+Run from the repo root:  python -m benchmarks.bench_energy_timeline
+"""
+
+import os
+import random
+import statistics
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtWidgets import QApplication
+
+from benchmarks.bench_sequencing import make_crate
+from utils.track import Track
+from widgets.energy_timeline import EnergyTimeline
+
+QUEUE_LEN = 1000
+EDITS = 50
+FRAME_MS = 1000 / 60
+
+
+def old_redraw(fig, ax, canvas, items):
+    # what update_energy_curve did on every change
+    bpm_vals = [it.bpm for it in items]
+    ax.clear()
+    ax.plot(range(1, len(bpm_vals) + 1), bpm_vals, marker="o")
+    ax.set_title("Energy Curve (BPM)")
+    ax.set_xlabel("Track Position")
+    ax.set_ylabel("BPM")
+    fig.tight_layout()
+    canvas.draw()
+
+
+def timed(fn, runs):
+    times = []
+    for args in runs:
+        t0 = time.perf_counter()
+        fn(*args)
+        times.append((time.perf_counter() - t0) * 1000)
+    return statistics.median(times), max(times)
+
+
+def main():
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    app = QApplication.instance() or QApplication([])
+    rng = random.Random(0)
+    items = make_crate(QUEUE_LEN, rng)
+    requests = make_crate(EDITS, rng)
+
+    fig = Figure(figsize=(6, 2), dpi=100)
+    ax = fig.add_subplot()
+    canvas = FigureCanvasAgg(fig)
+    old_items = list(items)
+
+    def old_insert(i, t):
+        old_items.insert(i, t)
+        old_redraw(fig, ax, canvas, old_items)
+
+    w = EnergyTimeline(items)
+    w.resize(780, 200)
+    w.show()
+    app.processEvents()
+
+    def new_insert(i, t):
+        w.insert_track(i, t)
+        w.repaint()
+
+    def new_move(src, dst):
+        w.move_track(src, dst)
+        w.repaint()
+
+    def new_step(i):
+        w.set_current(i)
+        w.repaint()
+
+    inserts = [(rng.randrange(QUEUE_LEN), t) for t in requests]
+    moves = [(rng.randrange(QUEUE_LEN), rng.randrange(QUEUE_LEN)) for _ in range(EDITS)]
+    steps = [(i,) for i in range(1, EDITS + 1)]
+
+    print(f"{QUEUE_LEN}-track set, {EDITS} edits each (frame = {FRAME_MS:.1f} ms)")
+    print(f"{'':>34} {'median ms':>10} {'max ms':>8}")
+    rows = (
+        ("matplotlib redraw, insert", old_insert, inserts[:10]),
+        ("EnergyTimeline, insert", new_insert, inserts),
+        ("EnergyTimeline, reorder", new_move, moves),
+        ("EnergyTimeline, next track", new_step, steps),
+    )
+    results = {}
+    for name, fn, runs in rows:
+        med, worst = timed(fn, runs)
+        results[name] = med
+        print(f"{name:>34} {med:10.2f} {worst:8.2f}")
+
+    # the incremental clash flags match a full rebuild after all the edits
+    full = EnergyTimeline()
+    full.set_tracks([Track(bpm=b, key_code=c) for b, c in zip(w._bpm, w._codes)])
+    assert full._clash == w._clash and len(w._bpm) == QUEUE_LEN + EDITS
+    assert results["EnergyTimeline, insert"] < FRAME_MS
+    assert results["EnergyTimeline, reorder"] < FRAME_MS
+    assert results["EnergyTimeline, next track"] < results["EnergyTimeline, insert"]
+    w.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+# benchmarks/bench_focus_scaling.py
+"""
+Counts cover rescales and resized items per CoverCarousel.next().
+Run from the repo root:  python -m benchmarks.bench_focus_scaling
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtWidgets import QApplication
+
+import widgets.cover_carousel as cc
+import widgets.thumbnail_loader as tl
+from benchmarks.bench_carousel_virtual import make_items, make_png, N_COVERS
+
+QUEUE_LEN = 300
+STEPS = 40
+
+counts = {"scale": 0, "resize": 0}
+_scale_pixmap = tl.scale_pixmap
+_set_size = cc.CarouselItem.set_size
+
+
+def counting_scale(pixmap, size):
+    counts["scale"] += 1
+    return _scale_pixmap(pixmap, size)
+
+
+def counting_set_size(self, size):
+    if size != self.cover_size:
+        counts["resize"] += 1
+    return _set_size(self, size)
+
+
+def run(app, loader, virtual):
+    carousel = cc.CoverCarousel(make_items(QUEUE_LEN), loader=loader, virtual=virtual)
+    carousel.show()
+    app.processEvents()
+    per_step = []
+    t0 = time.perf_counter()
+    for _ in range(STEPS):
+        counts["scale"] = counts["resize"] = 0
+        carousel.next()
+        per_step.append((counts["scale"], counts["resize"]))
+    dt = (time.perf_counter() - t0) / STEPS
+    carousel.close()
+    return per_step, dt
+
+
+def main():
+    app = QApplication(sys.argv)
+    tl.scale_pixmap = cc.scale_pixmap = counting_scale
+    cc.CarouselItem.set_size = counting_set_size
+
+    print(f"{QUEUE_LEN}-track queue, {STEPS} next() calls "
+          f"(rescaling every item cost {QUEUE_LEN} scales/next)")
+    with tempfile.TemporaryDirectory() as cache_dir:
+        for prescale in ((160, 240), ()):
+            loader = tl.ThumbnailLoader(cache_dir=cache_dir, prescale=prescale)
+            for i in range(N_COVERS):
+                loader._on_fetched(f"bench://cover/{i}", make_png(i))
+            for virtual in (False, True):
+                per_step, dt = run(app, loader, virtual)
+                scales = [s for s, _ in per_step]
+                resized = [r for _, r in per_step]
+                label = (f"{'virtual' if virtual else 'classic'}, "
+                         f"{'prescaled' if prescale else 'no prescale'}")
+                print(f"  {label:24s} scales/next max {max(scales):3d} "
+                      f"mean {sum(scales)/STEPS:5.2f}   items resized/next "
+                      f"max {max(resized)}   {dt*1000:6.3f} ms/next")
+                assert max(resized) <= 4
+            loader.shutdown()
+
+
+if __name__ == "__main__":
+    main()
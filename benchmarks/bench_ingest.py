@@ -0,0 +1,93 @@
+# benchmarks/bench_ingest.py
+"""
+Library ingest on generated Rekordbox-style UTF-16 TSV exports:
+first run, unchanged re-run, and a re-run after one export changes.
+Run from the repo root:  python -m benchmarks.bench_ingest
+"""
+
+import os
+import random
+import tempfile
+import time
+from contextlib import redirect_stdout
+from io import StringIO
+from pathlib import Path
+
+from utils.track_db import TrackDB, create_track_db, get_all_tracks
+
+N_EXPORTS = 200
+TRACKS_PER_EXPORT = 150
+LIBRARY_SIZE = 20_000
+
+HEADER = ["#", "Track Title", "Artist", "BPM", "Key", "Album", "Genre",
+          "Rating", "Time", "Date Added"]
+
+
+def write_export(path, rows):
+    with open(path, "w", newline="", encoding="utf-16") as f:
+        f.write("\t".join(HEADER) + "\n")
+        for i, (title, artist, bpm, key) in enumerate(rows, 1):
+            f.write(f"{i}\t{title}\t{artist}\t{bpm:.2f}\t{key}\t\tHouse\t     \t"
+                    f"05:{i % 60:02d}\t2025-04-29\n")
+
+
+def generate_library(data_dir, n_exports=N_EXPORTS, per_export=TRACKS_PER_EXPORT,
+                     library_size=LIBRARY_SIZE, seed=0):
+    rng = random.Random(seed)
+    library = [
+        (f"Track {i} (Extended Mix)", f"Artist {i % 997}",
+         rng.uniform(100, 140), f"{rng.randint(1, 12)}{rng.choice('AB')}")
+        for i in range(library_size)
+    ]
+    for n in range(n_exports):
+        write_export(Path(data_dir) / f"export_{n:04d}.txt",
+                     rng.sample(library, per_export))
+
+
+def timed(label, fn):
+    t0 = time.perf_counter()
+    with redirect_stdout(StringIO()):
+        result = fn()
+    dt = time.perf_counter() - t0
+    print(f"  {label:34s} {dt*1000:9.1f} ms")
+    return result
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        data_dir = Path(tmp) / "exports"
+        data_dir.mkdir()
+        db_path = Path(tmp) / "track_info.db"
+        generate_library(data_dir)
+        print(f"{N_EXPORTS} exports x {TRACKS_PER_EXPORT} tracks")
+
+        timed("full rebuild", lambda: create_track_db(db_path, data_dir, rebuild=True))
+        n_tracks = len(get_all_tracks(db_path))
+        timed("re-run, nothing changed", lambda: create_track_db(db_path, data_dir))
+
+        some = data_dir / "export_0007.txt"
+        os.utime(some)
+        assert timed("re-run, one export touched", lambda: create_track_db(db_path, data_dir)) == 0
+
+        # the edit drops the export's old tracks: each falls back to the
+        # last other export listing it, or leaves the library
+        write_export(some, [("Brand New (Original Mix)", "Someone", 124.0, "8A")])
+        timed("re-run, one export edited", lambda: create_track_db(db_path, data_dir))
+        rebuilt_path = Path(tmp) / "rebuilt.db"
+        with redirect_stdout(StringIO()):
+            create_track_db(rebuilt_path, data_dir, rebuild=True)
+        library = sorted(get_all_tracks(db_path), key=lambda t: t.uid)
+        rebuilt = sorted(get_all_tracks(rebuilt_path), key=lambda t: t.uid)
+        assert [(t.uid, t.bpm, t.key) for t in library] == \
+            [(t.uid, t.bpm, t.key) for t in rebuilt]
+        n_tracks = len(library)
+        # the search index follows both the bulk and the incremental path
+        db = TrackDB(db_path)
+        assert db.search("brand new")[0].title == "Brand New (Original Mix)"
+        assert db.search("track 12 extended")
+        db.close()
+        print(f"  library: {n_tracks} unique tracks, same as a rebuild")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+# benchmarks/bench_insertion.py
+"""
+Request placement on a long queue: the two Python loops handle_request
+used to run vs InsertionScorer.best_slots.
+Run from the repo root:  python -m benchmarks.bench_insertion
+"""
+
+import random
+import time
+
+from benchmarks.bench_sequencing import make_crate
+from utils.insertion import InsertionScorer
+from utils.setlist_order import camelot_distance
+
+QUEUE_LEN = 2000
+LOOKAHEAD = 10
+REQUESTS = 200
+
+
+def old_best(items, new, curr, last):
+    # the loop handle_request ran for both the global and local spot
+    best_idx, best_cost = None, float("inf")
+    for i in range(curr + 1, last + 1):
+        prev = items[i - 1]
+        cost = abs(new.bpm - prev.bpm) + camelot_distance(new.key, prev.key)
+        if i < len(items):
+            nxt = items[i]
+            cost += abs(new.bpm - nxt.bpm) + camelot_distance(new.key, nxt.key)
+        if cost < best_cost:
+            best_cost, best_idx = cost, i
+    return best_idx, best_cost
+
+
+def old_place(items, new, curr):
+    g_idx, g_cost = old_best(items, new, curr, len(items))
+    l_idx, l_cost = old_best(items, new, curr,
+                             min(curr + 1 + LOOKAHEAD, len(items)))
+    g_secs = sum(t.duration for t in items[curr + 1:g_idx + 1])
+    l_secs = sum(t.duration for t in items[curr + 1:l_idx + 1])
+    return (g_idx, g_cost, g_secs), (l_idx, l_cost, l_secs)
+
+
+def new_place(scorer, new, curr):
+    return (scorer.best_slots(new, curr)[0],
+            scorer.best_slots(new, curr, within_songs=LOOKAHEAD)[0])
+
+
+def main():
+    rng = random.Random(0)
+    queue = make_crate(QUEUE_LEN, rng)
+    requests = make_crate(REQUESTS, rng)
+    currs = [rng.randrange(0, QUEUE_LEN // 4) for _ in requests]
+
+    t0 = time.perf_counter()
+    scorer = InsertionScorer(queue)
+    t_build = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    old = [old_place(queue, r, c) for r, c in zip(requests, currs)]
+    t_old = (time.perf_counter() - t0) / REQUESTS
+
+    t0 = time.perf_counter()
+    new = [new_place(scorer, r, c) for r, c in zip(requests, currs)]
+    t_new = (time.perf_counter() - t0) / REQUESTS
+
+    for (og, ol), (ng, nl), c in zip(old, new, currs):
+        # same spots and costs; the time is now measured up to the slot
+        # rather than including the track the request is inserted before
+        for o, n in ((og, ng), (ol, nl)):
+            assert o[0] == n.index and abs(o[1] - n.cost) < 1e-9
+            assert abs(n.seconds - sum(t.duration for t in queue[c + 1:n.index])) < 1e-6
+            assert n.index - c == n.songs
+        assert nl.songs <= LOOKAHEAD + 1
+
+    t0 = time.perf_counter()
+    for r, c in zip(requests, currs):
+        slots = scorer.best_slots(r, c, k=5, within_secs=30 * 60)
+    t_k = (time.perf_counter() - t0) / REQUESTS
+    assert len(slots) == 5 and all(s.seconds <= 30 * 60 for s in slots)
+    assert [s.cost for s in slots] == sorted(s.cost for s in slots)
+
+    print(f"{QUEUE_LEN}-track queue, {REQUESTS} requests "
+          f"(scorer built in {t_build * 1000:.2f} ms)")
+    print(f"  python loops (global + within {LOOKAHEAD})  {t_old * 1000:8.3f} ms/request")
+    print(f"  InsertionScorer (global + within {LOOKAHEAD}) {t_new * 1000:7.3f} ms/request"
+          f"  {t_old / t_new:5.0f}x")
+    print(f"  top-5 within 30 minutes              {t_k * 1000:8.3f} ms/request")
+    assert t_new < 1e-3
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+# benchmarks/bench_parallel_ingest.py
+"""
+Full-library ingest across worker counts and batch sizes, on generated
+UTF-16 TSV exports. Reports wall time and the main process's peak
+Python allocation (tracemalloc), which should follow the batch size
+rather than the size of the library.
+Run from the repo root:  python -m benchmarks.bench_parallel_ingest
+"""
+
+import os
+import tempfile
+import time
+import tracemalloc
+from contextlib import redirect_stdout
+from io import StringIO
+from pathlib import Path
+
+from benchmarks.bench_ingest import generate_library
+from utils.track_db import create_track_db, get_all_tracks
+
+N_EXPORTS = 400
+TRACKS_PER_EXPORT = 250
+LIBRARY_SIZE = 100_000
+
+
+def run(data_dir, db_path, workers, batch_size):
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    with redirect_stdout(StringIO()):
+        create_track_db(db_path, data_dir, rebuild=True,
+                        workers=workers, batch_size=batch_size)
+    dt = time.perf_counter() - t0
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return dt, peak
+
+
+def main():
+    cores = os.cpu_count() or 1
+    with tempfile.TemporaryDirectory() as tmp:
+        data_dir = Path(tmp) / "exports"
+        data_dir.mkdir()
+        db_path = Path(tmp) / "track_info.db"
+        generate_library(data_dir, N_EXPORTS, TRACKS_PER_EXPORT, LIBRARY_SIZE)
+        print(f"{N_EXPORTS} exports x {TRACKS_PER_EXPORT} tracks, {cores} cores")
+
+        print(f"  {'workers':>7} {'batch':>7} {'wall ms':>9} {'peak MiB':>9}")
+        results = set()
+        for workers in sorted({1, 2, 4, cores}):
+            for batch_size in (1_000, 100_000):
+                dt, peak = run(data_dir, db_path, workers, batch_size)
+                print(f"  {workers:7d} {batch_size:7d} {dt*1000:9.1f} "
+                      f"{peak/2**20:9.2f}")
+                results.add(tuple(sorted(
+                    (t.title, t.artist, t.bpm, t.key)
+                    for t in get_all_tracks(db_path)
+                )))
+        assert len(results) == 1, "worker count / batch size changed the result"
+        print(f"  {len(next(iter(results)))} unique tracks, identical for every run")
+
+
+if __name__ == "__main__":
+    main()
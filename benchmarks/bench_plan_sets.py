@@ -0,0 +1,122 @@
+# benchmarks/bench_plan_sets.py
+"""
+Headless batch planning (plan_sets.py) over 100 playlists: half
+Rekordbox exports, half SoundCloud playlists already in the cache, all
+drawn from the library. Reports sets/s per worker count and engine,
+checks every set is written whole and in the library, and that the CLI
+starts without PySide6 or matplotlib.
+Run from the repo root:  python -m benchmarks.bench_plan_sets
+"""
+
+import contextlib
+import io
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import plan_sets
+from utils.soundcloud_import import SCCache
+from utils.track_db import DB_PATH, TrackDB
+
+N_PLAYLISTS = 100
+SET_SIZE = (60, 200)
+HEADER = ["#", "Track Title", "Artist", "BPM", "Key", "Album", "Genre",
+          "Rating", "Time", "Date Added"]
+
+
+def write_export(path, tracks, rng):
+    rows = ["\t".join(HEADER)]
+    for i, t in enumerate(tracks, 1):
+        m, s = divmod(rng.randrange(150, 420), 60)
+        rows.append("\t".join([str(i), t.title, t.artist, f"{t.bpm:.2f}" if t.bpm else "",
+                               t.key, "", "", "", f"{m:02d}:{s:02d}", "2025-04-29"]))
+    Path(path).write_text("\n".join(rows) + "\n", encoding="utf-16")
+
+
+def cache_playlist(cache, url, tracks, rng):
+    entries = []
+    for i, t in enumerate(tracks):
+        track_url = f"{url}/t{i}"
+        meta = {"url": track_url, "title": t.title, "artist": t.artist,
+                "thumbnail": None, "duration": rng.randrange(150, 420) * 1000,
+                "bpm": None, "key": None}
+        entries.append(meta)
+        cache.put_track(track_url, meta)
+    cache.put_playlist(url, entries)
+
+
+def main():
+    rng = random.Random(0)
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        db_path = tmp / "track_info.db"
+        shutil.copy(DB_PATH, db_path)
+        library = TrackDB(db_path).get_all_tracks()
+        cache_path = tmp / "sc_cache.db"
+        cache = SCCache(cache_path)
+
+        sources, sizes = [], {}
+        for i in range(N_PLAYLISTS):
+            tracks = rng.sample(library, min(rng.randint(*SET_SIZE), len(library)))
+            if i % 2:
+                src = f"https://soundcloud.com/bench/sets/set-{i}"
+                cache_playlist(cache, src, tracks, rng)
+            else:
+                src = str(tmp / f"export_{i}.txt")
+                write_export(src, tracks, rng)
+            sources.append(src)
+            sizes[src] = len(tracks)
+        cache.close()
+        n_tracks = sum(sizes.values())
+
+        # startup: no GUI toolkit, no plotting
+        t0 = time.perf_counter()
+        out = subprocess.run(
+            [sys.executable, "-c",
+             "import sys, plan_sets; print(sorted({m.split('.')[0] for m in sys.modules"
+             " if m.startswith(('PySide6', 'matplotlib'))}))"],
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+        startup = time.perf_counter() - t0
+        assert out == "[]", out
+        print(f"{N_PLAYLISTS} playlists, {n_tracks} tracks; "
+              f"CLI imports in {startup * 1000:.0f} ms without PySide6/matplotlib")
+
+        print(f"  {'engine':>7} {'workers':>7} {'wall s':>7} {'sets/s':>7} {'tracks/s':>9}")
+        cores = os.cpu_count() or 1
+        for engine in ("hybrid", "best", "arc"):
+            for workers in sorted({1, cores}):
+                out_dir = tmp / f"out_{engine}_{workers}"
+                out_dir.mkdir()
+                t0 = time.perf_counter()
+                done = 0
+                for plan in plan_sets.plan_all(sources, engine, next(iter(plan_sets.ARCS)),
+                                               workers=workers, db_path=db_path,
+                                               cache_path=cache_path, offline=True):
+                    assert plan.error is None, plan.error
+                    assert len(plan.tracks) == plan.matched == sizes[plan.source]
+                    plan_sets.write_set(plan, out_dir, "csv")
+                    done += 1
+                dt = time.perf_counter() - t0
+                assert done == N_PLAYLISTS and len(list(out_dir.glob("*.csv"))) == N_PLAYLISTS
+                print(f"  {engine:>7} {workers:7d} {dt:7.2f} {N_PLAYLISTS / dt:7.1f} "
+                      f"{n_tracks / dt:9.0f}")
+
+        # the CLI end to end, every format
+        for fmt in plan_sets.FORMATS:
+            with contextlib.redirect_stdout(io.StringIO()), \
+                    contextlib.redirect_stderr(io.StringIO()):
+                rc = plan_sets.main(sources[:4] + ["-o", str(tmp / fmt), "-f", fmt,
+                                                   "--offline", "--db", str(db_path),
+                                                   "--sc-cache", str(cache_path)])
+            assert rc == 0 and len(list((tmp / fmt).iterdir())) == 4
+        print(f"  CLI wrote {', '.join(plan_sets.FORMATS)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+# benchmarks/bench_queue_model.py
+"""
+Queue dock on a 5000-track set: rebuilding the QListWidget, as
+filter_queue_list did after every change, vs QueueModel/QueueFilter
+in a QListView. For each edit, reports the time until the event loop
+is idle again and its longest single pass (what the user feels as
+jank).
+Run from the repo root:  python -m benchmarks.bench_queue_model
+"""
+
+import os
+import random
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtCore import QSize
+from PySide6.QtWidgets import (
+    QAbstractItemView, QApplication, QListView, QListWidget, QListWidgetItem
+)
+
+from benchmarks.bench_sequencing import make_crate
+from widgets.queue_model import QueueFilter, QueueModel
+
+QUEUE_LEN = 5000
+EDITS = 10
+QUERIES = ("t", "tr", "track 1", "track 12", "", "track 4")
+
+
+def old_rebuild(lst, items, text, current):
+    # filter_queue_list, as it was
+    lst.clear()
+    q = text.lower()
+    for i, tr in enumerate(items, start=1):
+        title = tr.title
+        if q and q not in title.lower():
+            continue
+        item = QListWidgetItem(f"{i}. {title}")
+        item.setSizeHint(QSize(0, 50))
+        lst.addItem(item)
+    lst.setCurrentRow(current)
+    curr_item = lst.currentItem()
+    if curr_item:
+        lst.scrollToItem(curr_item, QAbstractItemView.PositionAtCenter)
+
+
+def settle(app, fn):
+    """Run fn, then the event loop until idle: (total ms, longest step ms)."""
+    t0 = time.perf_counter()
+    fn()
+    longest = time.perf_counter() - t0
+    quiet = 0
+    while quiet < 3:
+        t = time.perf_counter()
+        app.processEvents()
+        dt = time.perf_counter() - t
+        longest = max(longest, dt)
+        quiet = quiet + 1 if dt < 0.0005 else 0
+    return (time.perf_counter() - t0) * 1000, longest * 1000
+
+
+def run(app, label, fns):
+    totals, longest = [], []
+    for fn in fns:
+        total, worst = settle(app, fn)
+        totals.append(total)
+        longest.append(worst)
+    avg = sum(totals) / len(totals)
+    print(f"  {label:28s} {avg:9.1f} {max(longest):12.1f}")
+    return avg, max(longest)
+
+
+def main():
+    app = QApplication.instance() or QApplication([])
+    rng = random.Random(0)
+    items = make_crate(QUEUE_LEN, rng)
+    requests = make_crate(EDITS, rng)
+    spots = [rng.randrange(QUEUE_LEN) for _ in requests]
+
+    old_items = list(items)
+    lst = QListWidget()
+    lst.resize(300, 700)
+    lst.show()
+    old_rebuild(lst, old_items, "", 0)
+    app.processEvents()
+
+    model = QueueModel(items)
+    filt = QueueFilter(model)
+    view = QListView()
+    view.setModel(filt)
+    view.setUniformItemSizes(True)
+    view.setLayoutMode(QListView.Batched)
+    view.setBatchSize(250)
+    view.resize(300, 700)
+    view.show()
+    app.processEvents()
+
+    def old_insert(i, t):
+        old_items.insert(i, t)
+        old_rebuild(lst, old_items, "", 0)
+
+    def new_filter(q):
+        filt.set_query(q)
+        filt.apply_query()
+
+    print(f"{QUEUE_LEN}-track queue")
+    print(f"  {'':28s} {'avg ms':>9} {'longest ms':>12}")
+    old_ins = run(app, "QListWidget rebuild, insert",
+                  [lambda i=i, t=t: old_insert(i, t) for i, t in zip(spots, requests)])
+    new_ins = run(app, "QueueModel, insert",
+                  [lambda i=i, t=t: model.insert_track(i, t) for i, t in zip(spots, requests)])
+    old_flt = run(app, "QListWidget rebuild, filter",
+                  [lambda q=q: old_rebuild(lst, old_items, q, 0) for q in QUERIES])
+    new_flt = run(app, "QueueFilter, filter",
+                  [lambda q=q: new_filter(q) for q in QUERIES])
+
+    # both show the same rows
+    for q in QUERIES:
+        old_rebuild(lst, old_items, q, 0)
+        new_filter(q)
+        assert [lst.item(r).text() for r in range(lst.count())] == \
+               [filt.data(filt.index(r)) for r in range(filt.rowCount())]
+
+    # typing: the filter is applied once, after the pause
+    applied = []
+    filt.modelReset.connect(lambda: applied.append(1))
+    for n in range(1, len("track 12") + 1):
+        filt.set_query("track 12"[:n])
+        app.processEvents()
+    t0 = time.perf_counter()
+    while not applied and time.perf_counter() - t0 < 1:
+        app.processEvents()
+        time.sleep(0.005)
+    assert len(applied) == 1
+
+    # the view still lays out every row, but in batches between events,
+    # so no single step blocks input for long
+    assert new_ins[1] < 25 and new_flt[1] < 25
+    assert new_ins[1] < old_ins[1] / 3 and new_flt[1] < old_flt[1] / 3
+
+
+if __name__ == "__main__":
+    main()
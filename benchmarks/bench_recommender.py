@@ -0,0 +1,138 @@
+# benchmarks/bench_recommender.py
+"""
+"What mixes well next" on a 200k-track library: a full scan of the
+library per query (Python loop, and the same in NumPy) vs
+CompatibilityIndex. Checks all three agree, that incremental add()
+matches a rebuild, and reports build time and query latency.
+Run from the repo root:  python -m benchmarks.bench_recommender
+"""
+
+import random
+import statistics
+import time
+
+import numpy as np
+
+from utils.camelot import DISTANCE, DISTANCE_NP
+from utils.recommender import HALF_TIME_COST, MAX_KEY_DISTANCE, CompatibilityIndex
+from utils.track import Track
+
+LIBRARY_SIZE = 200_000
+QUERIES = 500
+K = 10
+BPM_RANGE = 6.0
+INGEST_BATCHES, INGEST_BATCH = 20, 500
+KEYS = [f"{n}{l}" for n in range(1, 13) for l in "AB"]
+
+
+def make_library(n, rng, start_id=1):
+    lib = []
+    for i in range(start_id, start_id + n):
+        known = rng.random() > 0.03
+        bpm = round(rng.choice((rng.gauss(124, 6), rng.gauss(172, 4), rng.gauss(95, 8))), 1)
+        lib.append(Track(f"Track {i}", f"Artist {i % 5000}", bpm if known else 0,
+                         rng.choice(KEYS) if known else "", id=i))
+    return lib
+
+
+def scan_loop(library, track, k, bpm_range):
+    # one pass over every track, same rules as CompatibilityIndex.suggest
+    hits = []
+    for t in library:
+        if t.bpm <= 0 or t.id == track.id:
+            continue
+        key_cost = DISTANCE[track.key_code][t.key_code]
+        if key_cost > MAX_KEY_DISTANCE:
+            continue
+        best = None
+        for ratio, extra in ((1.0, 0.0), (2.0, HALF_TIME_COST), (0.5, HALF_TIME_COST)):
+            d = abs(t.bpm / ratio - track.bpm)
+            if d <= bpm_range:
+                c = d + key_cost + extra
+                best = c if best is None else min(best, c)
+        if best is not None:
+            hits.append(best)
+    return sorted(hits)[:k]
+
+
+def scan_numpy(cols, track, k, bpm_range):
+    ids, bpm, codes = cols
+    key_cost = DISTANCE_NP[track.key_code, codes].astype(np.float64)
+    cost = np.full(len(bpm), np.inf)
+    for ratio, extra in ((1.0, 0.0), (2.0, HALF_TIME_COST), (0.5, HALF_TIME_COST)):
+        d = np.abs(bpm / ratio - track.bpm)
+        cost = np.minimum(cost, np.where(d <= bpm_range, d + key_cost + extra, np.inf))
+    cost[(bpm <= 0) | (key_cost > MAX_KEY_DISTANCE) | (ids == track.id)] = np.inf
+    top = np.sort(cost[np.argpartition(cost, k)[:k]])
+    return [float(c) for c in top if np.isfinite(c)]
+
+
+def latency(fn, queries):
+    times = []
+    for q in queries:
+        t0 = time.perf_counter()
+        fn(q)
+        times.append((time.perf_counter() - t0) * 1000)
+    times.sort()
+    return statistics.median(times), times[int(len(times) * 0.99) - 1]
+
+
+def main():
+    rng = random.Random(0)
+    library = make_library(LIBRARY_SIZE, rng)
+    queries = [t for t in rng.sample(library, QUERIES * 2) if t.bpm > 0][:QUERIES]
+
+    t0 = time.perf_counter()
+    index = CompatibilityIndex(library)
+    build = time.perf_counter() - t0
+    cols = (np.array([t.id for t in library]), np.array([t.bpm for t in library]),
+            np.array([t.key_code for t in library]))
+
+    # same costs from all three (ties may pick different tracks)
+    for q in queries[:20]:
+        want = scan_loop(library, q, K, BPM_RANGE)
+        got = [s.cost for s in index.suggest(q, K, BPM_RANGE)]
+        assert np.allclose(got, want) and np.allclose(scan_numpy(cols, q, K, BPM_RANGE), want)
+
+    print(f"{LIBRARY_SIZE} tracks, top {K} within ±{BPM_RANGE:g} BPM "
+          f"(index built in {build * 1000:.0f} ms)")
+    print(f"  {'':28s} {'median ms':>10} {'p99 ms':>8}")
+    loop = latency(lambda q: scan_loop(library, q, K, BPM_RANGE), queries[:20])
+    full = latency(lambda q: scan_numpy(cols, q, K, BPM_RANGE), queries)
+    fast = latency(lambda q: index.suggest(q, K, BPM_RANGE), queries)
+    set_ids = {t.id for t in rng.sample(library, 2000)}
+    excl = latency(lambda q: index.suggest(q, K, BPM_RANGE, set_ids), queries)
+    for label, (med, p99) in (("full scan, Python", loop), ("full scan, NumPy", full),
+                              ("CompatibilityIndex", fast),
+                              ("  excluding a 2000-track set", excl)):
+        print(f"  {label:28s} {med:10.3f} {p99:8.3f}")
+
+    # ingest: batches added in place match an index built from scratch
+    added, start = [], LIBRARY_SIZE + 1
+    times = []
+    for _ in range(INGEST_BATCHES):
+        batch = make_library(INGEST_BATCH, rng, start)
+        start += INGEST_BATCH
+        added += batch
+        t0 = time.perf_counter()
+        index.add(batch)
+        times.append((time.perf_counter() - t0) * 1000)
+    # re-analysed tracks come back with the same uid and replace the old entry
+    changed = [Track(t.title, t.artist, t.bpm + 1, t.key, id=t.id) for t in added[:100]]
+    index.add(changed)
+    rebuilt = CompatibilityIndex(library + changed + added[100:])
+    assert len(index) == len(rebuilt) == LIBRARY_SIZE + len(added)
+    for q in queries[:50] + added[:50]:
+        assert [s.cost for s in index.suggest(q, K, BPM_RANGE)] == \
+               [s.cost for s in rebuilt.suggest(q, K, BPM_RANGE)]
+    print(f"  add() of {INGEST_BATCH} new tracks: {statistics.median(times):.2f} ms "
+          f"(rebuild: {build * 1000:.0f} ms)")
+
+    # p99 on a shared box is noisy, so it is only reported; the median
+    # is what a user feels
+    assert fast[0] < 1.0, "suggestions should stay around a millisecond"
+    assert fast[0] < full[0] / 5
+
+
+if __name__ == "__main__":
+    main()
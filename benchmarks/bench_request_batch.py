@@ -0,0 +1,118 @@
+# benchmarks/bench_request_batch.py
+"""
+Placing a batch of requests: one at a time the way handle_request does
+(each at its best slot, optionally within its deadline) vs plan_requests
+placing them jointly. Also checks plan_requests against brute force on
+small instances.
+Run from the repo root:  python -m benchmarks.bench_request_batch
+"""
+
+import itertools
+import random
+import time
+
+from benchmarks.bench_sequencing import make_crate
+from utils.insertion import InsertionScorer
+from utils.request_batch import plan_requests
+from utils.sequencing import transition_cost_matrix
+from utils.track import Track
+
+QUEUE_LEN = 300
+N_REQUESTS = 20
+CURR = 10
+SMALL_CASES = 30
+
+
+def set_cost(tracks):
+    # handle_request's model, unknown BPMs included as 0
+    cost = transition_cost_matrix(
+        [Track(bpm=t.bpm or 1e-9, key_code=t.key_code) for t in tracks]
+    )
+    return float(sum(cost[i, i + 1] for i in range(len(tracks) - 1)))
+
+
+def misses(queue, requests, deadlines, curr):
+    pos = {id(t): i for i, t in enumerate(queue)}
+    late = 0
+    for r, d in zip(requests, deadlines):
+        secs = sum(t.duration for t in queue[curr + 1:pos[id(r)]])
+        late += d is not None and secs > d + 1e-9
+    return late
+
+
+def one_at_a_time(queue, requests, deadlines, curr, respect):
+    queue = list(queue)
+    scorer = InsertionScorer(queue)
+    for r, d in zip(requests, deadlines):
+        slot = scorer.best_slots(r, curr, within_secs=d if respect else None)[0]
+        queue.insert(slot.index, r)
+        scorer.insert(slot.index, r)
+    return queue
+
+
+def brute_force(queue, requests, deadlines, curr):
+    # every way to interleave the requests into the tail, tail order fixed
+    head, tail = queue[:curr + 1], queue[curr + 1:]
+    n = len(tail) + len(requests)
+    best = None
+    for slots in itertools.combinations(range(n), len(requests)):
+        for perm in itertools.permutations(requests):
+            it_r, it_t = iter(perm), iter(tail)
+            seq = head + [next(it_r) if i in slots else next(it_t) for i in range(n)]
+            if misses(seq, requests, deadlines, curr):
+                continue
+            c = set_cost(seq)
+            if best is None or c < best:
+                best = c
+    return best
+
+
+def main():
+    rng = random.Random(3)
+    queue = make_crate(QUEUE_LEN, rng)
+    requests = make_crate(N_REQUESTS, rng)
+    for i, r in enumerate(requests):
+        r.title = f"Request {i}"
+    # every third request has to play within 20-60 minutes
+    deadlines = [rng.choice((20, 40, 60)) * 60 if i % 3 == 0 else None
+                 for i in range(N_REQUESTS)]
+
+    base = set_cost(queue)
+    print(f"{N_REQUESTS} requests into a {QUEUE_LEN}-track set "
+          f"({sum(d is not None for d in deadlines)} with deadlines), "
+          f"set cost before: {base:.1f}")
+    print(f"{'strategy':>28} {'ms':>8} {'added cost':>11} {'missed':>7}")
+    for name, fn in (
+        ("one at a time, no deadlines", lambda: one_at_a_time(queue, requests, deadlines, CURR, False)),
+        ("one at a time, deadlines", lambda: one_at_a_time(queue, requests, deadlines, CURR, True)),
+        ("plan_requests, no deadlines", lambda: plan_requests(queue, requests, CURR)[0]),
+        ("plan_requests", lambda: plan_requests(queue, requests, CURR, deadlines)[0]),
+    ):
+        t0 = time.perf_counter()
+        out = fn()
+        ms = (time.perf_counter() - t0) * 1000
+        assert [t for t in out if t in queue] == queue  # queue order kept
+        print(f"{name:>28} {ms:8.2f} {set_cost(out) - base:11.1f} "
+              f"{misses(out, requests, deadlines, CURR):7d}")
+        if name == "plan_requests":
+            planned = out
+    assert misses(planned, requests, deadlines, CURR) == 0
+
+    gaps = []
+    for _ in range(SMALL_CASES):
+        q = make_crate(7, rng)
+        reqs = make_crate(3, rng)
+        dls = [rng.choice((None, 400, 900)) for _ in reqs]
+        opt = brute_force(q, reqs, dls, 1)
+        got, placed = plan_requests(q, reqs, 1, dls)
+        if opt is None:
+            continue
+        assert not any(p.late for p in placed)
+        gaps.append(set_cost(got) - opt)
+    print(f"\nbrute force, {len(gaps)} cases of 3 requests into 7 tracks: "
+          f"optimal in {sum(g < 1e-6 for g in gaps)}, "
+          f"mean gap {sum(gaps) / len(gaps):.2f}")
+
+
+if __name__ == "__main__":
+    main()
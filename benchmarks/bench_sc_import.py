@@ -0,0 +1,111 @@
+# benchmarks/bench_sc_import.py
+"""
+SoundCloud playlist import against a stubbed YoutubeDL with injected
+latency: the old one-shot extract_flat=False import vs the two-phase
+concurrent import, cold and with a warm SQLite cache.
+Run from the repo root:  python -m benchmarks.bench_sc_import
+"""
+
+import tempfile
+import time
+from pathlib import Path
+
+from utils.soundcloud_import import SCCache, fetch_sc_playlist_full, iter_sc_playlist
+
+PLAYLIST_LEN = 100
+FLAT_LATENCY = 0.3      # one request for the playlist listing
+TRACK_LATENCY = 0.05    # one request per track
+PLAYLIST_URL = "https://soundcloud.com/dj/sets/friday"
+
+
+def track_info(i):
+    return {"title": f"Track {i}", "uploader": f"Artist {i % 7}",
+            "thumbnail": f"https://i1.sndcdn.com/artworks-{i}.jpg",
+            "duration": 180 + i, "webpage_url": f"https://soundcloud.com/a/t{i}"}
+
+
+class StubYoutubeDL:
+    """Answers like yt-dlp for PLAYLIST_URL and its tracks, after a delay."""
+    calls = 0
+
+    def __init__(self, opts):
+        self.opts = opts
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def extract_info(self, url, download=False):
+        StubYoutubeDL.calls += 1
+        if url == PLAYLIST_URL:
+            time.sleep(FLAT_LATENCY)
+            entries = [track_info(i) for i in range(PLAYLIST_LEN)]
+            if self.opts.get("extract_flat"):
+                entries = [{"url": e["webpage_url"], "title": e["title"]} for e in entries]
+            else:
+                time.sleep(TRACK_LATENCY * PLAYLIST_LEN)  # resolved one by one
+            return {"entries": entries}
+        time.sleep(TRACK_LATENCY)
+        return track_info(int(url.rsplit("t", 1)[1]))
+
+
+def old_fetch(url):
+    # the import before the cache: one extract_info that resolves every track
+    with StubYoutubeDL({"extract_flat": False, "skip_download": True}) as ydl:
+        info = ydl.extract_info(url, download=False)
+    return [{"title": e.get("title"), "artist": e.get("uploader"),
+             "thumbnail": e.get("thumbnail"), "duration": e.get("duration")}
+            for e in info.get("entries", [])]
+
+
+def timed_stream(cache, workers):
+    t0 = time.perf_counter()
+    first = None
+    n = 0
+    for _ in iter_sc_playlist(PLAYLIST_URL, workers, StubYoutubeDL, cache):
+        first = first or time.perf_counter() - t0
+        n += 1
+    assert n == PLAYLIST_LEN
+    return first, time.perf_counter() - t0
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f"{PLAYLIST_LEN}-track playlist, {FLAT_LATENCY * 1000:.0f} ms listing, "
+              f"{TRACK_LATENCY * 1000:.0f} ms per track")
+        print(f"{'import':>24} {'first track s':>14} {'all tracks s':>13} {'requests':>9}")
+
+        t0 = time.perf_counter()
+        old = old_fetch(PLAYLIST_URL)
+        t_old = time.perf_counter() - t0
+        print(f"{'extract_flat=False':>24} {t_old:14.2f} {t_old:13.2f} {1:9d}")
+
+        for workers in (4, 8, 16):
+            cache = SCCache(Path(tmp) / f"cold{workers}.db")
+            StubYoutubeDL.calls = 0
+            first, total = timed_stream(cache, workers)
+            print(f"{f'cold, {workers} workers':>24} {first:14.2f} {total:13.2f} "
+                  f"{StubYoutubeDL.calls:9d}")
+
+        StubYoutubeDL.calls = 0
+        first, total = timed_stream(cache, 16)
+        print(f"{'warm cache':>24} {first:14.4f} {total:13.4f} {StubYoutubeDL.calls:9d}")
+        assert StubYoutubeDL.calls == 0 and total < 0.1
+
+        # an interrupted import resumes: only the missing tracks are fetched
+        cache = SCCache(Path(tmp) / "resume.db")
+        stream = iter_sc_playlist(PLAYLIST_URL, 8, StubYoutubeDL, cache)
+        for _ in range(40):
+            next(stream)
+        stream.close()
+        StubYoutubeDL.calls = 0
+        tracks = fetch_sc_playlist_full(PLAYLIST_URL, 8, StubYoutubeDL, cache)
+        print(f"resumed after 40 tracks: {StubYoutubeDL.calls} requests to finish")
+        assert StubYoutubeDL.calls <= PLAYLIST_LEN - 40
+        assert [{k: t[k] for k in old[0]} for t in tracks] == old
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+# benchmarks/bench_search.py
+"""
+Keystroke-to-suggestion latency of the FTS5 search index on a
+100k-track library, against the old linear substring scan.
+Run from the repo root:  python -m benchmarks.bench_search
+"""
+
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtCore import QCoreApplication
+
+from utils.track_db import TrackDB
+from widgets.track_completer import TrackSearchModel
+
+LIBRARY_SIZE = 100_000
+WORDS = ("night sun drive fire ocean echo dance gold city heart lost wild "
+         "summer deep love dream light rise fall higher danza marea delilah "
+         "shiver focus kids brazil replay clouds tokyo").split()
+GENRES = ("House", "Tech House", "Techno", "Electronic", "Pop", "Hip-Hop")
+
+
+def populate(db, rng):
+    rows = [
+        (" ".join(rng.sample(WORDS, 3)).title() + f" {i}", f"Artist {i % 5000}",
+         rng.uniform(90, 150), f"{rng.randint(1, 12)}{rng.choice('AB')}",
+         f"Album {i % 9000}", rng.choice(GENRES))
+        for i in range(LIBRARY_SIZE)
+    ]
+    # the best match for "danza", inserted after thousands of weaker ones
+    rows.append(("Danza", "Solo", 124.0, "8A", "", "House"))
+    conn = db.connection()
+    with conn:
+        conn.executemany(
+            'INSERT INTO track_info (track_title, artist, bpm, key, album, genre) '
+            'VALUES (?, ?, ?, ?, ?, ?)', rows
+        )
+    return [r[0] for r in rows]
+
+
+def keystrokes(rng, n=40):
+    """Every prefix of some typed queries, as the user would produce them."""
+    out = []
+    for _ in range(n):
+        typed = " ".join(rng.sample(WORDS, rng.choice((1, 2))))
+        if rng.random() < 0.3:
+            typed = typed[2:]   # mid-word fragment: substring path
+        out.extend(typed[:i] for i in range(1, len(typed) + 1))
+    return out
+
+
+def report(label, lat):
+    """Print and return (mean, p95) in ms."""
+    lat = sorted(lat)
+    mean, p95 = statistics.mean(lat) * 1000, lat[int(len(lat) * 0.95)] * 1000
+    print(f"  {label:26s} mean {mean:8.3f} ms   "
+          f"p95 {p95:8.3f} ms   max {lat[-1]*1000:8.3f} ms")
+    return mean, p95
+
+
+def main():
+    app = QCoreApplication(sys.argv)
+    rng = random.Random(0)
+    with tempfile.TemporaryDirectory() as tmp:
+        db = TrackDB(Path(tmp) / "track_info.db")
+        db.migrate()
+        titles = populate(db, rng)
+        keys = keystrokes(rng)
+        print(f"{LIBRARY_SIZE} tracks, {len(keys)} keystrokes")
+
+        lat = []
+        for q in keys[:200]:
+            t0 = time.perf_counter()
+            ql = q.lower()
+            [t for t in titles if ql in t.lower()][:15]
+            lat.append(time.perf_counter() - t0)
+        report("linear scan (first 200)", lat)
+
+        lat = []
+        for q in keys:
+            t0 = time.perf_counter()
+            db.search(q, 15)
+            lat.append(time.perf_counter() - t0)
+        mean, p95 = report("TrackDB.search", lat)
+        # a few ms per keystroke, every keystroke
+        assert mean < 2.0 and p95 < 5.0, (mean, p95)
+
+        model = TrackSearchModel(db, 15)
+        lat = []
+        for q in keys:
+            t0 = time.perf_counter()
+            model.set_query(q)
+            lat.append(time.perf_counter() - t0)
+        report("TrackSearchModel.set_query", lat)
+
+        top = db.search("danza marea", 5)
+        assert top and all("danza" in h.title.lower() and "marea" in h.title.lower()
+                           for h in top), top
+        assert db.search("area", 5), "substring fallback"
+        assert db.search("danza", 1)[0].title == "Danza", "exact title first"
+        assert db.search("d", 5) == []
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+# benchmarks/bench_sequencing.py
+"""
+Runtime and total transition cost of hybrid_order vs order_tracks
+("fast" and time-budgeted "best") on synthetic crates.
+Run from the repo root:  python -m benchmarks.bench_sequencing
+"""
+
+import random
+import time
+
+from utils.setlist_order import hybrid_order
+from utils.sequencing import order_tracks, sequence_cost
+from utils.track import Track
+
+SIZES = (100, 300, 1000)
+KEYS = [f"{n}{l}" for n in range(1, 13) for l in "AB"]
+
+
+def make_crate(n, rng):
+    crate = []
+    for i in range(n):
+        known = rng.random() > 0.05
+        crate.append(Track(
+            title=f"Track {i}",
+            bpm=round(rng.gauss(124, 8), 1) if known else 0,
+            key=rng.choice(KEYS) if known else "",
+            duration=rng.uniform(180, 420),
+        ))
+    return crate
+
+
+def main():
+    rng = random.Random(0)
+    print(f"{'tracks':>6} {'engine':>16} {'ms':>9} {'total cost':>11} {'vs greedy':>9}")
+    for n in SIZES:
+        crate = make_crate(n, rng)
+        t0 = time.perf_counter()
+        greedy = hybrid_order(crate)
+        base = sequence_cost(greedy)
+        rows = [("hybrid_order", time.perf_counter() - t0, base)]
+        for mode, budget in (("fast", None), ("best", 50), ("best", 250)):
+            t0 = time.perf_counter()
+            seq = order_tracks(crate, mode=mode, budget_ms=budget)
+            dt = time.perf_counter() - t0
+            assert sorted(t.title for t in seq) == sorted(t.title for t in crate)
+            label = mode if budget is None else f"{mode} {budget}ms"
+            rows.append((label, dt, sequence_cost(seq)))
+        for label, dt, cost in rows:
+            print(f"{n:6d} {label:>16} {dt*1000:9.1f} {cost:11.1f} "
+                  f"{cost/base:9.1%}")
+
+
+if __name__ == "__main__":
+    main()
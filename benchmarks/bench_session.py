@@ -0,0 +1,165 @@
+# benchmarks/bench_session.py
+"""
+Time to a restored window, each run in a fresh interpreter: a cold
+start from the playlist URL (stubbed yt-dlp with the latency of
+bench_sc_import, empty cache) vs resuming a session snapshot, which
+must not touch the network. Also times snapshot encode/write/load at
+set sizes up to 2000 tracks, and checks that a write that fails part
+way leaves the previous snapshot intact and that unchanged snapshots
+are not rewritten.
+Run from the repo root:  python -m benchmarks.bench_session
+"""
+
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from unittest import mock
+
+from benchmarks.bench_sc_import import PLAYLIST_LEN, track_info
+from utils import session as session_mod
+from utils.session import Session, SessionWriter, encode, load_session, save_session
+from utils.track import Track
+
+RUNS = 3
+SIZES = (100, 500, 2000)
+ROOT = Path(__file__).resolve().parent.parent
+
+CHILD = r"""
+import os, sys, time, json, tempfile, shutil
+t0 = time.perf_counter()
+os.environ["QT_QPA_PLATFORM"] = "offscreen"
+mode, session_path = sys.argv[1], sys.argv[2]
+from PySide6.QtWidgets import QApplication
+from ui.main_window import MainWindow
+from ui.startup_loader import StartupLoader
+from utils.session import load_session
+from utils.soundcloud_import import SCCache
+from utils.track_db import DB_PATH, TrackDB
+from widgets.thumbnail_loader import ThumbnailLoader
+from benchmarks.bench_sc_import import PLAYLIST_URL, StubYoutubeDL
+
+class NoNetwork(StubYoutubeDL):
+    def extract_info(self, url, download=False):
+        raise AssertionError("resume went to the network")
+
+app = QApplication([])
+# the stub's cover URLs don't exist; keep both modes off the network for covers
+ThumbnailLoader.instance().offline = True
+tmp = tempfile.mkdtemp()
+session = load_session(session_path) if mode == "resume" else None
+# the loader migrates its DB; keep that off the user's library
+shutil.copy(DB_PATH, os.path.join(tmp, "track_info.db"))
+loader = StartupLoader(PLAYLIST_URL, db=TrackDB(os.path.join(tmp, "track_info.db")),
+                       sc_cache=SCCache(os.path.join(tmp, "c.db")),
+                       ydl_factory=NoNetwork if session else StubYoutubeDL,
+                       load_playlist=session is None)
+failed = []
+loader.failed.connect(failed.append)
+win = MainWindow(PLAYLIST_URL, loader=loader, session=session,
+                 session_path=os.path.join(tmp, "session.json"))
+win.show()
+app.processEvents()
+t_shown = time.perf_counter() - t0
+while not win.ordered_items and not failed:
+    app.processEvents()
+    time.sleep(0.001)
+app.processEvents()
+t_set = time.perf_counter() - t0
+assert not failed, failed
+loader.cancel()
+print(json.dumps({"shown": t_shown, "restored": t_set,
+                  "current": win.carousel.current_index, "tracks": len(win.ordered_items),
+                  "network": sorted(m for m in ("requests", "yt_dlp") if m in sys.modules)}))
+"""
+
+
+def run(mode, session_path):
+    env = dict(os.environ, PYTHONPATH=str(ROOT))
+    out = subprocess.run([sys.executable, "-c", CHILD, mode, str(session_path)],
+                         cwd=ROOT, env=env, capture_output=True, text=True, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def make_session(n):
+    tracks = []
+    for i in range(n):
+        info = track_info(i % PLAYLIST_LEN)
+        tracks.append(Track(info["title"], info["uploader"], 120 + i % 12, f"{i % 12 + 1}A",
+                            info["duration"], info["thumbnail"], url=f"{info['webpage_url']}-{i}"))
+    notes = {(a.uid, b.uid): f"loop the outro {i}" for i, (a, b) in
+             enumerate(zip(tracks[::10], tracks[1::10]))}
+    covers = {t.thumbnail: f"{i:040x}" for i, t in enumerate(tracks[:PLAYLIST_LEN])}
+    return Session("https://soundcloud.com/dj/sets/friday", tracks, n // 2, notes, covers)
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "session.json"
+
+        print(f"{'tracks':>6} {'bytes':>8} {'encode ms':>10} {'write ms':>9} {'load ms':>8}")
+        for n in SIZES:
+            s = make_session(n)
+            t0 = time.perf_counter()
+            data = encode(s)
+            t_enc = time.perf_counter() - t0
+            t0 = time.perf_counter()
+            save_session(s, path)
+            t_write = time.perf_counter() - t0
+            t0 = time.perf_counter()
+            back = load_session(path)
+            t_load = time.perf_counter() - t0
+            assert [(t.title, t.url, t.bpm, t.key_code) for t in back.tracks] == \
+                   [(t.title, t.url, t.bpm, t.key_code) for t in s.tracks]
+            assert back.current_index == s.current_index and back.notes == s.notes
+            assert back.covers == s.covers
+            print(f"{n:6d} {len(data):8d} {t_enc * 1000:10.2f} {t_write * 1000:9.2f} "
+                  f"{t_load * 1000:8.2f}")
+            assert t_load < 0.1
+
+        # a crash mid-write leaves the last good snapshot
+        good = path.read_bytes()
+        with mock.patch.object(session_mod.os, "replace", side_effect=OSError("crash")):
+            try:
+                save_session(make_session(10), path)
+            except OSError:
+                pass
+        assert path.read_bytes() == good and load_session(path) is not None
+
+        # the writer skips snapshots identical to the last one written
+        writer = SessionWriter(Path(tmp) / "periodic.json")
+        s = make_session(500)
+        for _ in range(20):
+            writer.submit(s)
+            writer.flush()
+        writer.submit(s._replace(current_index=s.current_index + 1))
+        writer.close()
+        assert writer.writes == 2, writer.writes
+        print("  interrupted write keeps the old snapshot; 21 submits -> 2 writes")
+
+        # time to the set on screen, fresh interpreters
+        resume_path = Path(tmp) / "resume.json"
+        save_session(make_session(PLAYLIST_LEN), resume_path)
+        run("resume", resume_path)      # warm the disk cache
+        print(f"median of {RUNS} fresh interpreters, {PLAYLIST_LEN}-track set")
+        print(f"{'':>8} {'window ms':>10} {'set restored ms':>16}")
+        medians = {}
+        for mode in ("cold", "resume"):
+            rs = [run(mode, resume_path) for _ in range(RUNS)]
+            medians[mode] = {k: statistics.median(r[k] for r in rs)
+                             for k in ("shown", "restored")}
+            print(f"{mode:>8} {medians[mode]['shown'] * 1000:10.0f} "
+                  f"{medians[mode]['restored'] * 1000:16.0f}")
+            if mode == "resume":
+                for r in rs:
+                    assert r["network"] == [], r["network"]
+                    assert r["tracks"] == PLAYLIST_LEN and r["current"] == PLAYLIST_LEN // 2
+        assert medians["resume"]["restored"] < medians["cold"]["restored"] / 2
+
+
+if __name__ == "__main__":
+    main()
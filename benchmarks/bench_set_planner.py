@@ -0,0 +1,84 @@
+# benchmarks/bench_set_planner.py
+"""
+Energy-arc set planning on synthetic crates: runtime, curve-fit error
+(RMS |BPM - target| over tracks with a known BPM) and transition cost
+of plan_set per beam width, against hybrid_order and order_tracks,
+which ignore the arc. "floor" is the fit of the best possible
+assignment (sorted BPMs onto sorted targets), what any order is
+held to by the pool's own BPMs. Also checks a time budget is kept.
+Run from the repo root:  python -m benchmarks.bench_set_planner
+"""
+
+import random
+import time
+
+import numpy as np
+
+from benchmarks.bench_sequencing import make_crate
+from utils.set_planner import ARCS, arc_curve, curve_targets, plan_set
+from utils.setlist_order import hybrid_order
+from utils.sequencing import order_tracks, sequence_cost
+
+SIZES = (100, 300, 1000)
+WIDTHS = (1, 8, 32, 64)
+ARC = "Warm-up, peak, breather, close"
+BUDGET_MS = 100
+
+
+def fit_error(order, curve, per):
+    known = [t for t in order if t.bpm > 0]
+    bpm = np.array([t.bpm for t in known])
+    return float(np.sqrt(np.mean((bpm - curve_targets(curve, known, per)) ** 2)))
+
+
+def fit_floor(tracks, curve, per):
+    known = sorted((t for t in tracks if t.bpm > 0), key=lambda t: t.bpm)
+    targets = np.sort(curve_targets(curve, known, per))
+    return float(np.sqrt(np.mean((np.array([t.bpm for t in known]) - targets) ** 2)))
+
+
+def main():
+    rng = random.Random(0)
+    print(f"arc: {ARC}")
+    print(f"{'tracks':>6} {'per':>8} {'engine':>14} {'ms':>8} {'fit BPM':>8} {'cost':>8}")
+    for n in SIZES:
+        crate = make_crate(n, rng)
+        for per in ("position", "minute"):
+            curve = arc_curve(ARCS[ARC], crate, per)
+            rows = []
+            for label, fn in (("hybrid_order", lambda: hybrid_order(crate)),
+                              ("order_tracks", lambda: order_tracks(crate))):
+                t0 = time.perf_counter()
+                seq = fn()
+                rows.append((label, time.perf_counter() - t0, fit_error(seq, curve, per),
+                             sequence_cost(seq)))
+            for w in WIDTHS:
+                t0 = time.perf_counter()
+                plan = plan_set(crate, curve, per, beam_width=w, budget_ms=None)
+                dt = time.perf_counter() - t0
+                assert sorted(t.title for t in plan.order) == sorted(t.title for t in crate)
+                assert abs(plan.fit_error - fit_error(plan.order, curve, per)) < 1e-9
+                assert abs(plan.cost - sequence_cost(plan.order)) < 1e-6
+                rows.append((f"beam {w}", dt, plan.fit_error, plan.cost))
+            floor = fit_floor(crate, curve, per)
+            for label, dt, fit, cost in rows:
+                print(f"{n:6d} {per:>8} {label:>14} {dt * 1000:8.1f} {fit:8.2f} {cost:8.1f}")
+            print(f"{n:6d} {per:>8} {'floor':>14} {'':>8} {floor:8.2f}")
+
+            # follows the arc far better than orders that ignore it
+            best = min(fit for label, _, fit, _ in rows if label.startswith("beam"))
+            assert best < 0.6 * rows[0][2] and best < 0.75 * rows[1][2]
+            assert best < 1.3 * floor
+
+        # a budget cuts the search short instead of running over
+        t0 = time.perf_counter()
+        plan = plan_set(crate, arc_curve(ARCS[ARC], crate), beam_width=256,
+                        budget_ms=BUDGET_MS)
+        dt = (time.perf_counter() - t0) * 1000
+        print(f"{n:6d} beam 256 within {BUDGET_MS} ms: {dt:.0f} ms"
+              f"{' (narrowed)' if plan.narrowed else ''}, fit {plan.fit_error:.2f}")
+        assert dt < BUDGET_MS * 1.5 + 50
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+# benchmarks/bench_startup.py
+"""
+Time to first window and to a fully loaded set, with the playlist
+import stubbed (fixed latency per yt-dlp call): loading inside the
+MainWindow constructor, as before, vs the background StartupLoader.
+Run from the repo root:  python -m benchmarks.bench_startup
+"""
+
+import os
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtWidgets import QApplication
+
+from benchmarks.bench_sc_import import PLAYLIST_URL, StubYoutubeDL
+from ui.main_window import MainWindow
+from ui.startup_loader import StartupLoader
+from utils.soundcloud_import import SCCache
+from utils.track_db import DB_PATH, TrackDB
+
+
+class BlockingLoader(StartupLoader):
+    """Runs every stage inside start(), i.e. inside the constructor."""
+    def start(self):
+        self.run()
+
+
+def measure(app, loader_cls, db, cache, session_path):
+    loader = loader_cls(PLAYLIST_URL, db=db, ydl_factory=StubYoutubeDL, sc_cache=cache)
+    done = []
+    loader.finished.connect(lambda: done.append(time.perf_counter()))
+
+    t0 = time.perf_counter()
+    # closing snapshots the session; keep it away from data/session.json
+    win = MainWindow(PLAYLIST_URL, loader=loader, session_path=session_path)
+    win.show()
+    app.processEvents()
+    first = time.perf_counter() - t0
+    while not done or len(win.ordered_items) < 100:
+        app.processEvents()
+        time.sleep(0.002)
+    app.processEvents()
+    loaded = time.perf_counter() - t0
+    assert len(win.carousel.items) == len(win.ordered_items) == 100
+    win.close()
+    win.deleteLater()
+    app.processEvents()
+    return first, loaded
+
+
+def main():
+    app = QApplication.instance() or QApplication([])
+    with tempfile.TemporaryDirectory() as tmp:
+        db_copy = Path(tmp) / "track_info.db"
+        shutil.copy(DB_PATH, db_copy)
+        db = TrackDB(db_copy)
+
+        print("100-track playlist, stubbed yt-dlp (300 ms listing, 50 ms per track)")
+        print(f"{'startup':>30} {'first window s':>15} {'loaded s':>9}")
+        rows = (
+            ("blocking constructor, cold", BlockingLoader, "a.db"),
+            ("background loader, cold", StartupLoader, "b.db"),
+            ("background loader, warm", StartupLoader, "b.db"),
+        )
+        results = {}
+        for name, cls, cache_name in rows:
+            cache = SCCache(Path(tmp) / cache_name)
+            first, loaded = measure(app, cls, db, cache, Path(tmp) / "session.json")
+            results[name] = first
+            print(f"{name:>30} {first:15.3f} {loaded:9.3f}")
+            cache.close()
+        db.close()
+
+    assert results["background loader, cold"] < results["blocking constructor, cold"] / 3
+
+
+if __name__ == "__main__":
+    main()
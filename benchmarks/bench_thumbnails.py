@@ -0,0 +1,119 @@
+# benchmarks/bench_thumbnails.py
+"""
+Headless cover-loading benchmark against a local HTTP stand-in.
+Run from the repo root:  python -m benchmarks.bench_thumbnails
+"""
+
+import os
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtWidgets import QApplication
+from PySide6.QtCore import QBuffer, QIODevice
+from PySide6.QtGui import QImage, QColor
+import requests
+
+from utils.track import Track
+from widgets.cover_carousel import CoverCarousel
+from widgets.thumbnail_loader import ThumbnailLoader
+
+N_TRACKS = 60
+LATENCY = 0.08   # seconds per cover, roughly a CDN round trip
+
+
+def make_png(seed):
+    img = QImage(300, 300, QImage.Format_RGB32)
+    img.fill(QColor((seed * 37) % 256, (seed * 91) % 256, (seed * 53) % 256))
+    buf = QBuffer()
+    buf.open(QIODevice.WriteOnly)
+    img.save(buf, "PNG")
+    return bytes(buf.data())
+
+
+def serve(covers, hits):
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            time.sleep(LATENCY)
+            hits.append(self.path)
+            i = int(self.path.rsplit("/", 1)[-1])
+            if i >= len(covers):
+                self.send_error(404)
+                return
+            body = covers[i]
+            self.send_response(200)
+            self.send_header("Content-Type", "image/png")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    srv = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    return srv
+
+
+def run(app, items, loader):
+    t0 = time.perf_counter()
+    carousel = CoverCarousel(items, loader=loader)
+    carousel.show()
+    app.processEvents()
+    first_paint = time.perf_counter() - t0
+    while loader.pending():
+        app.processEvents()
+        time.sleep(0.001)
+    total = time.perf_counter() - t0
+    carousel.close()
+    return first_paint, total
+
+
+def main():
+    app = QApplication(sys.argv)
+    covers = [make_png(i) for i in range(N_TRACKS)]
+    hits = []
+    srv = serve(covers, hits)
+    base = f"http://127.0.0.1:{srv.server_address[1]}/cover"
+    items = [
+        Track(f"Track {i}", "Bench", 120, "8A", thumbnail=f"{base}/{i}")
+        for i in range(N_TRACKS)
+    ]
+
+    t0 = time.perf_counter()
+    for it in items:
+        requests.get(it.thumbnail, timeout=5)
+    sync_total = time.perf_counter() - t0
+    print(f"{N_TRACKS} covers, {LATENCY*1000:.0f} ms latency each")
+    print(f"  synchronous baseline      total {sync_total*1000:8.1f} ms "
+          f"(window blocked the whole time)")
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        loader = ThumbnailLoader(cache_dir=cache_dir)
+        for label in ("cold (network)", "warm (memory LRU)", "warm (disk cache)"):
+            if label == "warm (disk cache)":
+                loader.shutdown()
+                loader = ThumbnailLoader(cache_dir=cache_dir)
+            first, total = run(app, items, loader)
+            print(f"  {label:25s} first paint {first*1000:8.1f} ms   "
+                  f"all covers {total*1000:8.1f} ms")
+
+        # covers the server doesn't have: fetched once, then not retried
+        missing = [Track(f"Gone {i}", "Bench", 120, "8A",
+                         thumbnail=f"{base}/{N_TRACKS + i}") for i in range(N_TRACKS)]
+        for label in ("missing, first time", "missing, again"):
+            del hits[:]
+            first, total = run(app, missing, loader)
+            print(f"  {label:25s} first paint {first*1000:8.1f} ms   "
+                  f"all covers {total*1000:8.1f} ms   {len(hits)} requests")
+        assert not hits, "failed covers are retried"
+        loader.shutdown()
+    srv.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+# benchmarks/bench_track_db.py
+"""
+10k title lookups: connect-per-call vs TrackDB vs batched lookup.
+Works on a temporary copy of data/track_info.db.
+Run from the repo root:  python -m benchmarks.bench_track_db
+"""
+
+import random
+import shutil
+import sqlite3
+import tempfile
+import time
+from pathlib import Path
+
+from utils.track_db import DB_PATH, TrackDB
+
+N_LOOKUPS = 10_000
+
+
+def old_get_track_info(title, db_path):
+    # the pre-TrackDB implementation: one connection per call
+    conn = sqlite3.connect(db_path)
+    c = conn.cursor()
+    c.execute('SELECT bpm, key FROM track_info WHERE track_title = ?', (title,))
+    row = c.fetchone()
+    conn.close()
+    if row:
+        return row
+    return (None, None)
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(tmp) / "track_info.db"
+        shutil.copy(DB_PATH, db_path)
+
+        conn = sqlite3.connect(db_path)
+        titles = [r[0] for r in conn.execute('SELECT track_title FROM track_info')]
+        conn.close()
+        rng = random.Random(0)
+        queries = [rng.choice(titles) if rng.random() < 0.9 else f"missing {i}"
+                   for i in range(N_LOOKUPS)]
+        print(f"{N_LOOKUPS} lookups over {len(titles)} tracks")
+
+        t0 = time.perf_counter()
+        before = [old_get_track_info(q, db_path) for q in queries]
+        t_before = time.perf_counter() - t0
+
+        db = TrackDB(db_path)
+        db.migrate()      # open + schema check once, like at app startup
+        t0 = time.perf_counter()
+        after = [db.get_track_info(q) for q in queries]
+        t_after = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        many = db.get_track_info_many(queries)
+        t_many = time.perf_counter() - t0
+        db.close()
+
+        assert before == after
+        assert all(many.get(q, (None, None)) == r for q, r in zip(queries, after))
+
+        for label, dt in (("connect per call", t_before),
+                          ("TrackDB.get_track_info", t_after),
+                          ("TrackDB.get_track_info_many", t_many)):
+            print(f"  {label:28s} {dt*1000:9.1f} ms  "
+                  f"{dt/N_LOOKUPS*1e6:8.2f} us/lookup  "
+                  f"x{t_before/dt:7.1f}")
+
+
+if __name__ == "__main__":
+    main()
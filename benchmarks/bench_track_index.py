@@ -0,0 +1,104 @@
+# benchmarks/bench_track_index.py
+"""
+Playlist-to-library matching: the old exact-title scan vs TrackIndex,
+with a match-rate check on realistic SoundCloud title variants.
+Run from the repo root:  python -m benchmarks.bench_track_index
+"""
+
+import random
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+from utils.track import Track
+from utils.track_db import DB_PATH, get_all_tracks
+from utils.track_index import TrackIndex
+
+LIBRARY_SIZE = 50_000
+PLAYLIST_LEN = 200
+
+WORDS = ("night sun drive fire ocean echo dance gold city heart lost "
+         "wild summer deep love dream light rise fall higher").split()
+
+
+def synthetic_library(n, rng):
+    lib = []
+    for i in range(n):
+        title = " ".join(rng.sample(WORDS, 3)).title() + f" {i}"
+        if rng.random() < 0.3:
+            title += " (Extended Mix)"
+        lib.append(Track(title, f"Artist {i % 3000}", rng.uniform(100, 140), "8A"))
+    return lib
+
+
+def variant(track, rng):
+    """How the same song tends to be titled on SoundCloud."""
+    title, artist = track.title, track.artist
+    bare = title.split(" - ", 1)[-1]
+    kind = rng.randrange(6)
+    if kind == 0:
+        return title, artist
+    if kind == 1:
+        return bare.replace(" (Extended Mix)", "") + " (Original Mix)", "some uploader"
+    if kind == 2:
+        return f"{artist} - {bare}", "label records"
+    if kind == 3:
+        return bare.upper(), artist
+    if kind == 4:
+        return bare.replace(" ", "  ").rstrip(")") + ")!", artist
+    return bare.replace("(Extended Mix)", "[Extended Mix]"), artist.lower()
+
+
+def naive_match(library, title):
+    return next((x for x in library if x.title == title), None)
+
+
+def main():
+    rng = random.Random(0)
+    with tempfile.TemporaryDirectory() as tmp:
+        db_copy = Path(tmp) / "track_info.db"
+        shutil.copy(DB_PATH, db_copy)
+        real = get_all_tracks(db_copy)
+    library = synthetic_library(LIBRARY_SIZE - len(real), rng) + real
+    picks = rng.sample(library, PLAYLIST_LEN - 20)
+    playlist = [(*variant(t, rng), t) for t in picks]
+    playlist += [(f"Unreleased ID {i}", "dj", None) for i in range(20)]
+
+    t0 = time.perf_counter()
+    index = TrackIndex(library)
+    t_build = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    naive = [naive_match(library, title) for title, _, _ in playlist]
+    t_naive = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    indexed = [index.match(title, artist) for title, artist, _ in playlist]
+    t_index = time.perf_counter() - t0
+
+    def rate(results):
+        right = sum(r is want for r, (_, _, want) in zip(results, playlist)
+                    if want is not None)
+        false = sum(r is not None for r, (_, _, want) in zip(results, playlist)
+                    if want is None)
+        return right / len(picks), false
+
+    print(f"{PLAYLIST_LEN}-track playlist vs {len(library)}-track library "
+          f"(index build {t_build*1000:.0f} ms, once per session)")
+    for label, dt, res in (("exact-title scan", t_naive, naive),
+                           ("TrackIndex", t_index, indexed)):
+        hit, false = rate(res)
+        print(f"  {label:18s} {dt*1000:9.2f} ms   match rate {hit:6.1%}   "
+              f"false matches {false}")
+
+    hit, false = rate(indexed)
+    assert hit >= 0.97 and false == 0, (hit, false)
+    # real library titles must keep matching themselves exactly
+    real_index = TrackIndex(real)
+    assert all(real_index.match(t.title, t.artist) is t for t in real)
+    print("ok")
+
+
+if __name__ == "__main__":
+    main()
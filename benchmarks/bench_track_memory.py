@@ -0,0 +1,79 @@
+# benchmarks/bench_track_memory.py
+"""
+Per-track memory of a 100k-track library: the dicts get_all_tracks()
+returned (as StartupLoader kept them, with thumbnail and duration
+added) vs Track. Strings come from the same rows in both, so the
+difference is the record itself; TrackIndex on top of Track is shown
+for scale, since it now reuses the Track's normalized keys.
+Run from the repo root:  python -m benchmarks.bench_track_memory
+"""
+
+import random
+import time
+import tracemalloc
+
+from utils.camelot import parse_key
+from utils.track import Track
+from utils.track_index import TrackIndex
+
+LIBRARY_SIZE = 100_000
+KEYS = [f"{n}{l}" for n in range(1, 13) for l in "AB"]
+
+
+def make_rows(n, rng):
+    # what SELECT id, track_title, artist, bpm, key yields
+    return [(i, f"Track {i} (Extended Mix)", f"Artist {i % 3000}",
+             round(rng.uniform(100, 140), 2), rng.choice(KEYS))
+            for i in range(n)]
+
+
+def old_library(rows):
+    # get_all_tracks() followed by StartupLoader's copy
+    return [
+        {**t, "thumbnail": None, "duration": 0.0}
+        for t in ({"id": i, "title": t, "artist": a, "bpm": b or 0, "key": k or "",
+                   "key_code": parse_key(k or "")} for (i, t, a, b, k) in rows)
+    ]
+
+
+def new_library(rows):
+    return [Track(t, a, b, k, id=i) for (i, t, a, b, k) in rows]
+
+
+def measure(fn, *args):
+    """(result, bytes still allocated, seconds)."""
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    result = fn(*args)
+    dt = time.perf_counter() - t0
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, size, dt
+
+
+def main():
+    rows = make_rows(LIBRARY_SIZE, random.Random(0))
+    parse_key("8A")     # warm the memo so it isn't counted
+
+    old, old_size, old_t = measure(old_library, rows)
+    new, new_size, new_t = measure(new_library, rows)
+    assert [(t["title"], t["bpm"], t["key_code"]) for t in old] == \
+           [(t.title, t.bpm, t.key_code) for t in new]
+    del old
+    _, index_size, index_t = measure(TrackIndex, new)
+
+    print(f"{LIBRARY_SIZE} tracks")
+    print(f"  {'':24s} {'MiB':>8} {'bytes/track':>12} {'build ms':>9}")
+    for label, size, dt in (("dict (old)", old_size, old_t),
+                            ("Track", new_size, new_t),
+                            ("TrackIndex over Track", index_size, index_t)):
+        print(f"  {label:24s} {size/2**20:8.1f} {size/LIBRARY_SIZE:12.0f} {dt*1000:9.1f}")
+
+    # normalized keys are computed once and shared with the index
+    t = new[0]
+    assert t._title_keys is not None and t.title_keys is t.title_keys
+    assert new_size < old_size / 2
+
+
+if __name__ == "__main__":
+    main()
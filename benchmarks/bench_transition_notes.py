@@ -0,0 +1,103 @@
+# benchmarks/bench_transition_notes.py
+"""
+Keystroke cost of transition notes as the notes table grows: the old
+in-memory dict (lost on exit), writing the DB on every keystroke, and
+NotesStore. Also checks that notes survive a restart and that
+prefetched notes are served from memory.
+Run from the repo root:  python -m benchmarks.bench_transition_notes
+"""
+
+import shutil
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from utils.track_db import DB_PATH, TrackDB
+from utils.transition_notes import NotesStore
+
+KEYSTROKES = 300
+TYPING_GAP = 0.004          # seconds between keystrokes
+TABLE_SIZES = (0, 10_000, 100_000)
+SENTENCE = "Loop the outro 16 bars, bring bass in on the drop, "
+
+
+def typed(n):
+    text = (SENTENCE * (n // len(SENTENCE) + 1))[:n]
+    return [text[:i + 1] for i in range(n)]
+
+
+def per_key(fn, pair):
+    times = []
+    for text in typed(KEYSTROKES):
+        t0 = time.perf_counter()
+        fn(pair, text)
+        times.append((time.perf_counter() - t0) * 1e6)
+        time.sleep(TYPING_GAP)
+    return statistics.median(times), max(times)
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        db_copy = Path(tmp) / "track_info.db"
+        shutil.copy(DB_PATH, db_copy)
+        db = TrackDB(db_copy)
+        db.migrate()
+
+        print(f"{KEYSTROKES} keystrokes, {TYPING_GAP * 1000:.0f} ms apart")
+        print(f"{'notes in table':>15} {'engine':>16} {'median us':>10} "
+              f"{'max us':>9} {'writes':>7}")
+        medians, through = [], []
+        filled = 0
+        for size in TABLE_SIZES:
+            db.put_transition_notes({(f"tt:{i}", f"tt:{i + 1}"): "fade"
+                                     for i in range(filled, size)})
+            filled = size
+            pair = (f"tt:bench{size}", "tt:next")
+
+            old_store = {}
+            med, worst = per_key(old_store.__setitem__, pair)
+            print(f"{size:15d} {'dict (old)':>16} {med:10.1f} {worst:9.1f} {0:7d}")
+
+            def write_through(pair, text):
+                db.put_transition_notes({pair: text})
+
+            med, worst = per_key(write_through, pair)
+            through.append(med)
+            print(f"{size:15d} {'write-through':>16} {med:10.1f} {worst:9.1f} "
+                  f"{KEYSTROKES:7d}")
+
+            store = NotesStore(db, debounce=0.05)
+            med, worst = per_key(store.set, (pair[0] + "s", pair[1]))
+            time.sleep(0.1)     # a pause in typing
+            store.close()
+            medians.append(med)
+            print(f"{size:15d} {'NotesStore':>16} {med:10.1f} {worst:9.1f} "
+                  f"{store.writes:7d}")
+            # one write per pause (plus DEBOUNCE_MAX ones), not per keystroke
+            assert store.writes <= 3
+
+        # constant: no growth with the table size, and no disk work
+        # (timings after a sleep include waking the CPU, hence the slack)
+        assert max(medians) < 3 * min(medians)
+        assert all(m < t / 2 for m, t in zip(medians, through))
+
+        # notes persist across a restart, and prefetched ones come from memory
+        pair = (f"tt:bench{TABLE_SIZES[-1]}s", "tt:next")
+        db.close()
+        db = TrackDB(db_copy)
+        store = NotesStore(db)
+        upcoming = [(f"tt:{i}", f"tt:{i + 1}") for i in range(5)]
+        store.prefetch(upcoming + [pair])
+        store.flush()
+        t0 = time.perf_counter()
+        got = [store.get(p) for p in upcoming + [pair]]
+        t_get = (time.perf_counter() - t0) / len(got) * 1e6
+        store.close()
+        assert got[-1] == typed(KEYSTROKES)[-1] and got[:-1] == ["fade"] * 5
+        print(f"restart: notes restored; prefetched get() {t_get:.1f} us")
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,20 @@
 # main.py
 
 import sys, os
-from PySide6.QtWidgets import QApplication, QInputDialog
+
+# --profile-startup has to hook imports before anything heavy is loaded
+PROFILE = "--profile-startup" in sys.argv
+if PROFILE:
+    sys.argv.remove("--profile-startup")
+    from utils import startup_profile
+    profile = startup_profile.start()
+
+from PySide6.QtCore import Qt
+from PySide6.QtWidgets import QApplication, QInputDialog, QMessageBox
 from ui.main_window import MainWindow
+from ui.startup_loader import StartupLoader
+from utils import startup_profile
+from utils.session import load_session
 
 def load_styles(app):
     qss_path = os.path.join(os.path.dirname(__file__), "ui", "styles.qss")
@@ -10,17 +22,63 @@ def load_styles(app):
         with open(qss_path, "r") as f:
             app.setStyleSheet(f.read())
 
+def profile_loader(loader):
+    """Mark each loader stage as it completes, then print the report."""
+    def on_progress(stage, done, total):
+        if done == total:
+            startup_profile.mark(f"loader: {stage}")
+
+    def on_finished():
+        profile.stop()
+        print(profile.report(), file=sys.stderr)
+
+    # direct, so stages are timed on the loader thread, not when the UI gets to them
+    loader.progress.connect(on_progress, Qt.DirectConnection)
+    loader.finished.connect(on_finished)
+
+def ask_resume(session):
+    """Offer the last session when started without a URL."""
+    answer = QMessageBox.question(
+        None, "Resume Session",
+        f"Resume the last session ({len(session.tracks)} tracks, at track "
+        f"{session.current_index + 1})?\n{session.playlist_url}",
+        QMessageBox.Yes | QMessageBox.No,
+    )
+    return answer == QMessageBox.Yes
+
 def main():
+    # --resume: straight back into the last session, no prompts, no network
+    resume = "--resume" in sys.argv
+    if resume:
+        sys.argv.remove("--resume")
+    startup_profile.mark("imports")
     app = QApplication(sys.argv)
     load_styles(app)
+    startup_profile.mark("QApplication and styles")
+
+    session = load_session() if resume or len(sys.argv) == 1 else None
+    if session is not None and not resume and not ask_resume(session):
+        session = None
 
-    # Prompt for SoundCloud playlist URL
-    url, ok = QInputDialog.getText(None, "Load Playlist", "Paste SoundCloud playlist URL:")
-    if not ok or not url.strip():
-        sys.exit(0)
+    # Playlist URL from the session or the command line, else prompt for it
+    if session is not None:
+        url = session.playlist_url
+    elif len(sys.argv) > 1:
+        url = sys.argv[1]
+    else:
+        url, ok = QInputDialog.getText(None, "Load Playlist", "Paste SoundCloud playlist URL:")
+        if not ok or not url.strip():
+            sys.exit(0)
+        startup_profile.mark("URL prompt")
 
-    window = MainWindow(url.strip())
+    loader = StartupLoader(url.strip(), load_playlist=session is None)
+    if PROFILE:
+        profile_loader(loader)
+    window = MainWindow(url.strip(), loader=loader, session=session)
     window.show()
+    if PROFILE:
+        app.processEvents()
+        startup_profile.mark("first window shown")
     sys.exit(app.exec())
 
 if __name__ == "__main__":
@@ -0,0 +1,247 @@
+# plan_sets.py
+"""
+Plan sets without the GUI: load Rekordbox exports and/or SoundCloud
+playlists, match them against the library, order each one and write it
+out as CSV, JSON or M3U, one file per playlist as soon as it's done.
+Independent playlists are planned in parallel on a process pool.
+
+    python plan_sets.py data/*.txt https://soundcloud.com/... -o sets -f m3u
+    python plan_sets.py exports/ --engine arc --arc "Peak hour" --offline
+
+Only numpy and the stdlib are imported (no PySide6, no matplotlib), so
+this runs on a headless box or from cron.
+"""
+
+import argparse
+import csv
+import json
+import math
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import List, NamedTuple, Optional
+
+from utils.sequencing import order_tracks, sequence_cost
+from utils.set_planner import ARCS, arc_curve, plan_set
+from utils.setlist_order import hybrid_order
+from utils.soundcloud_import import (
+    SC_CACHE_PATH, SCCache, fetch_sc_playlist_entries, iter_sc_playlist
+)
+from utils.track import Track
+from utils.track_db import DB_PATH, TrackDB, read_export
+from utils.track_index import TrackIndex
+
+ENGINES = ("hybrid", "fast", "best", "arc")
+FORMATS = ("csv", "json", "m3u")
+# time "best" and "arc" may spend on each playlist
+BUDGET_MS = 250
+
+
+class PlannedSet(NamedTuple):
+    source: str             # export path or playlist URL
+    name: str               # output file name, without extension
+    tracks: List[Track]     # in planned order
+    matched: int            # tracks found in the library
+    cost: float             # total transition cost (sequencing model)
+    seconds: float          # time spent loading and ordering
+    error: Optional[str]    # set if the playlist could not be loaded
+
+
+# --- Loading (runs in the workers) ---
+
+_index = None       # TrackIndex over the library, one per worker
+_cache = None       # SCCache, one per worker
+_offline = False
+
+
+def _init_worker(db_path, cache_path, offline):
+    global _index, _cache, _offline
+    # plan_all migrated the DB before starting the workers
+    db = TrackDB(db_path, readonly=True)
+    _index = TrackIndex(db.get_all_tracks())
+    db.close()
+    _offline = offline
+    # offline, anything cached is good enough however old
+    ttl = {"track_ttl": math.inf, "playlist_ttl": math.inf} if offline else {}
+    _cache = SCCache(cache_path, **ttl)
+
+
+def _no_network(opts):
+    raise RuntimeError("not in the playlist cache (offline)")
+
+
+def is_url(source):
+    return source.startswith(("http://", "https://"))
+
+
+def load_playlist(source):
+    """A source's tracks, matched against the library. Returns (tracks, matched)."""
+    if is_url(source):
+        factory = _no_network if _offline else None
+        entries = fetch_sc_playlist_entries(source, factory, _cache)
+        items = {}
+        for i, t in iter_sc_playlist(source, ydl_factory=factory, cache=_cache,
+                                     entries=entries):
+            rec = _index.match(t.get("title") or "", t.get("artist") or "")
+            items[i] = Track.from_sc(t, rec)
+        tracks = [items[i] for i in sorted(items)]
+        return tracks, sum(t.id is not None for t in tracks)
+
+    tracks = read_export(source)
+    matched = 0
+    for t in tracks:
+        rec = _index.match(t.title, t.artist)
+        if rec is None:
+            continue
+        matched += 1
+        t.id = rec.id
+        # the export's own BPM and key win, as in put_analysis
+        if not t.bpm and rec.bpm:
+            t.bpm = rec.bpm
+        if not t.key and rec.key:
+            t.key, t.key_code = rec.key, rec.key_code
+    return tracks, matched
+
+
+def order(tracks, engine, arc=None, per="position", budget_ms=BUDGET_MS):
+    if engine == "hybrid":
+        return hybrid_order(tracks)
+    if engine == "arc":
+        return plan_set(tracks, arc_curve(ARCS[arc], tracks, per), per,
+                        budget_ms=budget_ms).order
+    return order_tracks(tracks, mode=engine, budget_ms=budget_ms)
+
+
+def plan_one(source, name, engine, arc, per, budget_ms):
+    """Load and order one playlist; errors are returned, not raised."""
+    t0 = time.perf_counter()
+    try:
+        tracks, matched = load_playlist(source)
+        tracks = order(tracks, engine, arc, per, budget_ms)
+    except Exception as e:
+        return PlannedSet(source, name, [], 0, 0.0, time.perf_counter() - t0,
+                          f"{type(e).__name__}: {e}")
+    return PlannedSet(source, name, tracks, matched, sequence_cost(tracks),
+                      time.perf_counter() - t0, None)
+
+
+def plan_all(sources, engine="hybrid", arc=None, per="position",
+             budget_ms=BUDGET_MS, workers=None, db_path=DB_PATH,
+             cache_path=SC_CACHE_PATH, offline=False):
+    """
+    Yield a PlannedSet per source in completion order. Output names are
+    the export's file name or the playlist URL's last path segment,
+    numbered when two sources would share one.
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    jobs, seen = [], {}
+    for src in sources:
+        base = _slug(src.rstrip("/").rsplit("/", 1)[-1] if is_url(src) else Path(src).stem)
+        seen[base] = seen.get(base, 0) + 1
+        name = base if seen[base] == 1 else f"{base}-{seen[base]}"
+        jobs.append((src, name, engine, arc, per, budget_ms))
+    init = (str(db_path), str(cache_path), offline)
+    db = TrackDB(db_path)
+    db.migrate()
+    db.close()
+
+    if workers <= 1 or len(jobs) < 2:
+        _init_worker(*init)
+        for job in jobs:
+            yield plan_one(*job)
+        return
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=init) as pool:
+        for fut in as_completed([pool.submit(plan_one, *job) for job in jobs]):
+            yield fut.result()
+
+
+def expand_sources(args):
+    """URLs as given; directories become the .txt exports inside them."""
+    out = []
+    for a in args:
+        if not is_url(a) and os.path.isdir(a):
+            out.extend(sorted(str(p) for p in Path(a).glob("*.txt")))
+        else:
+            out.append(a)
+    return out
+
+
+def _slug(text):
+    return re.sub(r"[^\w.-]+", "_", text).strip("_") or "set"
+
+
+# --- Output ---
+
+def write_set(plan, out_dir, fmt):
+    """Write one planned set to out_dir/<name>.<fmt>; returns the path."""
+    path = Path(out_dir) / f"{plan.name}.{fmt}"
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "w", newline="", encoding="utf-8") as f:
+        if fmt == "csv":
+            w = csv.writer(f)
+            w.writerow(["#", "Title", "Artist", "BPM", "Key", "Duration", "URL"])
+            for i, t in enumerate(plan.tracks, 1):
+                w.writerow([i, t.title, t.artist, f"{t.bpm:g}" if t.bpm else "",
+                            t.key, round(t.duration), t.url or ""])
+        elif fmt == "json":
+            json.dump({
+                "source": plan.source,
+                "cost": round(plan.cost, 2),
+                "tracks": [{"title": t.title, "artist": t.artist, "bpm": t.bpm or None,
+                            "key": t.key or None, "duration": t.duration or None,
+                            "url": t.url, "id": t.id} for t in plan.tracks],
+            }, f, ensure_ascii=False, indent=1)
+        else:
+            # exports carry no file locations; those entries name the track
+            f.write("#EXTM3U\n")
+            for t in plan.tracks:
+                f.write(f"#EXTINF:{round(t.duration) or -1},{t.artist} - {t.title}\n")
+                f.write(f"{t.url or f'{t.artist} - {t.title}'}\n")
+    os.replace(tmp, path)
+    return path
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    ap.add_argument("sources", nargs="+",
+                    help="Rekordbox .txt exports, folders of them, or SoundCloud playlist URLs")
+    ap.add_argument("-o", "--out", default="sets", help="output folder (default: sets)")
+    ap.add_argument("-f", "--format", choices=FORMATS, default="csv")
+    ap.add_argument("--engine", choices=ENGINES, default="hybrid",
+                    help="hybrid_order, order_tracks fast/best, or plan_set along --arc")
+    ap.add_argument("--arc", choices=list(ARCS), default=next(iter(ARCS)))
+    ap.add_argument("--per", choices=("position", "minute"), default="position")
+    ap.add_argument("--budget-ms", type=float, default=BUDGET_MS)
+    ap.add_argument("-j", "--workers", type=int, default=None,
+                    help="processes (default: one per core)")
+    ap.add_argument("--db", default=str(DB_PATH))
+    ap.add_argument("--sc-cache", default=str(SC_CACHE_PATH))
+    ap.add_argument("--offline", action="store_true",
+                    help="only use cached playlists, never the network")
+    args = ap.parse_args(argv)
+
+    os.makedirs(args.out, exist_ok=True)
+    failed = 0
+    t0 = time.perf_counter()
+    sources = expand_sources(args.sources)
+    for plan in plan_all(sources, args.engine, args.arc, args.per, args.budget_ms,
+                         args.workers, args.db, args.sc_cache, args.offline):
+        if plan.error:
+            failed += 1
+            print(f"{plan.source}: {plan.error}", file=sys.stderr)
+            continue
+        path = write_set(plan, args.out, args.format)
+        print(f"{path}: {len(plan.tracks)} tracks, {plan.matched} in library, "
+              f"cost {plan.cost:.1f} ({plan.seconds * 1000:.0f} ms)", flush=True)
+    print(f"Planned {len(sources) - failed} of {len(sources)} sets in "
+          f"{time.perf_counter() - t0:.1f} s", file=sys.stderr)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
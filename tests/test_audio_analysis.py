@@ -0,0 +1,196 @@
+# tests/test_audio_analysis.py
+"""
+BPM/key estimation on short synthesized signals, and how put_analysis
+shares track_info with Rekordbox exports.
+Run from the repo root:  python -m pytest
+"""
+
+import time
+
+import numpy as np
+import pytest
+
+from utils.audio_analysis import TARGET_SR, estimate_key, estimate_tempo
+from utils.camelot import UNKNOWN, pitch_class_code
+from utils.track_db import TrackDB, create_track_db
+
+HEADER = ["#", "Track Title", "Artist", "BPM", "Key", "Album", "Genre",
+          "Rating", "Time", "Date Added"]
+
+
+def clicks(bpm, seconds=20, sr=TARGET_SR):
+    """A decaying noise burst on every beat."""
+    rng = np.random.default_rng(0)
+    y = np.zeros(int(seconds * sr), dtype=np.float32)
+    n = int(0.02 * sr)
+    click = rng.standard_normal(n) * np.exp(-np.arange(n) / (0.004 * sr))
+    for beat in np.arange(0, seconds - 0.05, 60 / bpm):
+        i = int(beat * sr)
+        y[i:i + n] += click
+    return y
+
+
+def triad(pitch_class, minor, seconds=5, sr=TARGET_SR):
+    """The tonic triad, with the root loudest."""
+    t = np.arange(int(seconds * sr)) / sr
+    y = np.zeros_like(t)
+    for step, amp in ((0, 1.0), (3 if minor else 4, 0.7), (7, 0.8)):
+        y += amp * np.sin(2 * np.pi * 220 * 2 ** ((pitch_class + step - 9) / 12) * t)
+    return (0.2 * y).astype(np.float32)
+
+
+@pytest.mark.parametrize("bpm", [90.0, 124.0, 128.0, 140.0, 172.0])
+def test_estimate_tempo(bpm):
+    assert estimate_tempo(clicks(bpm), TARGET_SR) == pytest.approx(bpm, abs=0.5)
+
+
+def test_estimate_tempo_silence():
+    assert estimate_tempo(np.zeros(5 * TARGET_SR, dtype=np.float32), TARGET_SR) == 0.0
+
+
+@pytest.mark.parametrize("pitch_class, minor", [(9, True), (0, False), (7, False), (2, True)])
+def test_estimate_key(pitch_class, minor):
+    assert estimate_key(triad(pitch_class, minor), TARGET_SR) == \
+        pitch_class_code(pitch_class, minor)
+
+
+def test_estimate_key_silence():
+    assert estimate_key(np.zeros(5 * TARGET_SR, dtype=np.float32), TARGET_SR) == UNKNOWN
+
+
+# --- put_analysis ---
+
+def write_export(path, rows):
+    lines = ["\t".join(HEADER)]
+    for i, (title, artist, bpm, key) in enumerate(rows, 1):
+        lines.append("\t".join([str(i), title, artist, bpm, key, "", "", "",
+                                "04:00", "2025-04-29"]))
+    path.write_text("\n".join(lines) + "\n", encoding="utf-16")
+    # a distinct mtime, so create_track_db sees the edit
+    time.sleep(0.01)
+
+
+@pytest.fixture
+def library(tmp_path):
+    """A DB ingested from one export: BPM only, key only, and both."""
+    export = tmp_path / "export.txt"
+    write_export(export, [("Bpm Only", "A", "124.00", ""),
+                          ("Key Only", "B", "", "8A"),
+                          ("Both", "C", "126.00", "5A")])
+    db_path = tmp_path / "track_info.db"
+    create_track_db(db_path, tmp_path)
+    db = TrackDB(db_path)
+    yield db, export, db_path
+    db.close()
+
+
+def state(db, title, artist):
+    return db.connection().execute(
+        'SELECT bpm, key, bpm_analyzed, key_analyzed FROM track_info '
+        'WHERE track_title = ? AND artist = ?', (title, artist)
+    ).fetchone()
+
+
+def test_put_analysis_keeps_export_fields(library):
+    db, _, _ = library
+    db.put_analysis([("bpm only", "a", 100.0, "1A"), ("Key Only", "B", 110.0, "2A"),
+                     ("Both", "C", 120.0, "3A")], version=1)
+    assert state(db, "Bpm Only", "A") == (124.0, "1A", 0, 1)
+    assert state(db, "Key Only", "B") == (110.0, "8A", 1, 0)
+    assert state(db, "Both", "C") == (126.0, "5A", 0, 0)
+
+
+def test_put_analysis_rerun_replaces_only_analyzed_fields(library):
+    db, _, _ = library
+    db.put_analysis([("Bpm Only", "A", 100.0, "1A")], version=1)
+    # force=True re-analysis, possibly with a newer version
+    db.put_analysis([("Bpm Only", "A", 101.0, "2A")], version=2)
+    assert state(db, "Bpm Only", "A") == (124.0, "2A", 0, 1)
+
+
+def test_put_analysis_adds_unknown_tracks(library):
+    db, _, _ = library
+    db.put_analysis([("New", "D", 128.0, "9B")], version=1)
+    assert state(db, "New", "D") == (128.0, "9B", 1, 1)
+    assert db.get_analysis_state([("new", "d")]) == {("new", "d"): (128.0, "9B", 1)}
+
+
+def test_reingest_keeps_analysis_where_export_is_empty(library):
+    db, export, db_path = library
+    db.put_analysis([("Bpm Only", "A", 100.0, "1A"), ("Key Only", "B", 110.0, "2A")],
+                    version=1)
+    # the export now has a key for "Bpm Only", and still no BPM for "Key Only"
+    write_export(export, [("Bpm Only", "A", "124.00", "11B"),
+                          ("Key Only", "B", "", "8A"),
+                          ("Both", "C", "126.00", "5A")])
+    create_track_db(db_path, export.parent)
+    assert state(db, "Bpm Only", "A") == (124.0, "11B", 0, 0)
+    assert state(db, "Key Only", "B") == (110.0, "8A", 1, 0)
+
+
+def test_put_analysis_marks_tracks_changed(library):
+    db, _, _ = library
+    tracks, since = db.get_tracks_changed()
+    assert len(tracks) == 3
+    time.sleep(0.01)
+    db.put_analysis([("Key Only", "B", 110.0, "2A"), ("New", "D", 128.0, "9B")], version=1)
+    changed, mark = db.get_tracks_changed(since)
+    assert {(t.title, t.bpm) for t in changed} == {("Key Only", 110.0), ("New", 128.0)}
+    assert mark > since
+    assert db.get_tracks_changed(mark) == ([], mark)
+
+
+def test_tracks_changed_in_the_same_instant_come_back_once(library):
+    db, _, _ = library
+    conn = db.connection()
+    with conn:
+        conn.execute('UPDATE track_info SET updated_at = 1000.0')
+    _, since = db.get_tracks_changed()
+    assert since == (1000.0, 3)
+    # stamped in the same instant as the watermark, but after its row
+    db.put_analysis([("New", "D", 128.0, "9B")], version=1)
+    with conn:
+        conn.execute('UPDATE track_info SET updated_at = 1000.0')
+    changed, mark = db.get_tracks_changed(since)
+    assert [t.title for t in changed] == ["New"]
+    assert db.get_tracks_changed(mark)[0] == []
+
+
+# --- create_track_db ---
+
+def bpms(db_path):
+    db = TrackDB(db_path)
+    try:
+        return {t.title: t.bpm for t in db.get_all_tracks()}
+    finally:
+        db.close()
+
+
+def ingest_both_ways(tmp_path):
+    """The incremental DB and a fresh rebuild from the same exports."""
+    create_track_db(tmp_path / "track_info.db", tmp_path)
+    create_track_db(tmp_path / "rebuilt.db", tmp_path, rebuild=True)
+    return bpms(tmp_path / "track_info.db"), bpms(tmp_path / "rebuilt.db")
+
+
+def test_reingest_earlier_export_keeps_last_export_winning(tmp_path):
+    write_export(tmp_path / "a.txt", [("Shared", "A", "120.00", "8A")])
+    write_export(tmp_path / "b.txt", [("Shared", "A", "130.00", "8A")])
+    create_track_db(tmp_path / "track_info.db", tmp_path)
+    write_export(tmp_path / "a.txt", [("Shared", "A", "121.00", "8A"),
+                                      ("Only A", "B", "100.00", "1A")])
+    incremental, rebuilt = ingest_both_ways(tmp_path)
+    assert incremental == rebuilt == {"Shared": 130.0, "Only A": 100.0}
+
+
+def test_reingest_after_export_removed_or_trimmed(tmp_path):
+    write_export(tmp_path / "a.txt", [("Shared", "A", "120.00", "8A"),
+                                      ("Trimmed", "C", "90.00", "3A")])
+    write_export(tmp_path / "b.txt", [("Shared", "A", "130.00", "8A"),
+                                      ("Only B", "B", "100.00", "1A")])
+    create_track_db(tmp_path / "track_info.db", tmp_path)
+    # Shared falls back to a.txt, Only B is listed nowhere any more
+    (tmp_path / "b.txt").unlink()
+    write_export(tmp_path / "a.txt", [("Shared", "A", "120.00", "8A")])
+    incremental, rebuilt = ingest_both_ways(tmp_path)
+    assert incremental == rebuilt == {"Shared": 120.0}
@@ -1,38 +1,55 @@
 
 import sys
+import threading
 from pathlib import Path
+
+import numpy as np
 from PySide6.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
     QPushButton, QTextEdit, QLabel, QSizePolicy,
-    QDockWidget, QListWidget, QListWidgetItem,
-    QLineEdit, QMessageBox, QCompleter, QAbstractItemView,
-    QApplication, QInputDialog
+    QDockWidget, QListView,
+    QLineEdit, QMessageBox, QAbstractItemView,
+    QApplication, QInputDialog, QSpinBox, QComboBox
 )
-from PySide6.QtCore import Qt, QSize
+from PySide6.QtCore import Qt, QTimer, Signal
 from PySide6.QtGui import QFont
 
 from widgets.cover_carousel import CoverCarousel
-from utils.soundcloud_import import fetch_sc_playlist_full
-from utils.track_db import (
-    get_track_info, get_all_track_titles, get_all_tracks
-)
-from utils.setlist_order import hybrid_order, camelot_distance
-
-from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
-import matplotlib.pyplot as plt
+from widgets.energy_timeline import EnergyTimeline
+from widgets.queue_model import QueueFilter, QueueModel
+from widgets.suggestion_panel import SuggestionPanel
+from widgets.thumbnail_loader import ThumbnailLoader
+from widgets.track_completer import RequestCompleter
+from ui.startup_loader import StartupLoader
+from utils.insertion import InsertionScorer
+from utils.recommender import CompatibilityIndex
+from utils.request_batch import plan_requests
+from utils.session import SESSION_PATH, Session, SessionWriter
+from utils.set_planner import ARCS, arc_curve, plan_set
+from utils.track_index import TrackIndex
+from utils.transition_notes import NotesStore, transition_key
+from utils import startup_profile
 
 MAX_LOOKAHEAD = 10
+# transitions ahead of the current one whose notes are loaded early
+NOTES_PREFETCH = 5
+# above this many tracks the carousel only builds widgets near the focus
+VIRTUALIZE_ABOVE = 150
+# time the set planner may take before it finishes greedily
+PLAN_BUDGET_MS = 300
+# how often the session is snapshotted for "resume last session"
+SNAPSHOT_INTERVAL_MS = 5000
 
 
 class MainWindow(QMainWindow):
-    def __init__(self, playlist_url):
+    planReady = Signal(object)      # (plan_state(), Plan or None) from the planning thread
+
+    def __init__(self, playlist_url, loader=None, session=None,
+                 session_path=SESSION_PATH):
         super().__init__()
         self.setWindowTitle("DJ Sidecar")
         self.setMinimumSize(820, 600)
 
-        # store notes per (current,next) pair
-        self.transition_notes_store = {}
-
         # --- Main layout ---
         container = QWidget()
         self.main_layout = QVBoxLayout(container)
@@ -45,52 +62,54 @@ class MainWindow(QMainWindow):
         hdr.setAlignment(Qt.AlignCenter)
         self.main_layout.addWidget(hdr)
 
-        # Build library_items from full DB
-        db_tracks = get_all_tracks()
-        self.library_items = [
-            {**t, "thumbnail": None, "duration": 0.0}
-            for t in db_tracks
-        ]
-
-        # Fetch playlist from SoundCloud
-        raw = fetch_sc_playlist_full(playlist_url)
-        playlist_items = []
-        for t in raw:
-            title = t.get("title","")
-            rec = next((x for x in self.library_items if x["title"]==title), None)
-            bpm, key = (rec["bpm"], rec["key"]) if rec else (0,"")
-            playlist_items.append({
-                "thumbnail": t.get("thumbnail"),
-                "title": title,
-                "artist": t.get("artist",""),
-                "bpm": bpm,
-                "key": key,
-                "duration": t.get("duration",0)/1000.0
-            })
-
-        # Compute initial order
-        self.ordered_items = hybrid_order(playlist_items)
-
-        # Carousel
-        self.carousel = CoverCarousel(self.ordered_items)
+        # Loading status; library, playlist and order fill in as the
+        # StartupLoader reports them. A resumed session brings its own
+        # set, so only the library is loaded.
+        self.playlist_url = playlist_url
+        self.loader = loader or StartupLoader(playlist_url, load_playlist=session is None)
+        self.track_db = self.loader.db
+        # notes per (current,next) pair, saved to the track DB in the background
+        self.notes = NotesStore(self.track_db)
+        self.lbl_status = QLabel("Loading library…")
+        self.lbl_status.setAlignment(Qt.AlignCenter)
+        self.main_layout.addWidget(self.lbl_status)
+
+        self.library_ready = False
+        self.library_items = []
+        self.library_by_id = {}
+        self.library_index = TrackIndex([])
+        self.compat_index = CompatibilityIndex()
+        self.ordered_items = []
+        # library ids already in the set, left out of suggestions
+        self.set_ids = set()
+        self._arrived = []
+        # slot scoring for requests, kept in sync with ordered_items
+        self.insertion = InsertionScorer(self.ordered_items)
+        # a Plan Set search is running on its own thread
+        self._planning = False
+        self.planReady.connect(self.on_plan_ready)
+
+        # Carousel (empty until tracks arrive), with library suggestions
+        # for what to play next beside it
+        carousel_row = QHBoxLayout()
+        self.carousel = CoverCarousel([])
         self.carousel.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Fixed)
-        self.main_layout.addWidget(self.carousel)
+        carousel_row.addWidget(self.carousel, stretch=1)
+        self.suggestions = SuggestionPanel()
+        self.suggestions.trackChosen.connect(self.request_track)
+        carousel_row.addWidget(self.suggestions)
+        self.main_layout.addLayout(carousel_row)
 
         # track index internally
         self.current_index = 0
         self.carousel.indexChanged.connect(self.on_index_changed)
 
-        # Energy curve (hidden)
-        bpm_vals = [it["bpm"] for it in self.ordered_items]
-        fig, ax = plt.subplots(figsize=(6,2), dpi=100)
-        ax.plot(range(1,len(bpm_vals)+1), bpm_vals, marker="o")
-        ax.set_title("Energy Curve (BPM)")
-        ax.set_xlabel("Track Position")
-        ax.set_ylabel("BPM")
-        fig.tight_layout()
-        self.energy_canvas = FigureCanvas(fig)
-        self.energy_canvas.setVisible(False)
-        self.main_layout.addWidget(self.energy_canvas)
+        # Energy/key timeline (hidden until toggled); kept in step with
+        # ordered_items by the same inserts as the carousel
+        self.energy_timeline = EnergyTimeline()
+        self.energy_timeline.setVisible(False)
+        self.main_layout.addWidget(self.energy_timeline)
+        startup_profile.mark("window: shell and carousel")
 
         # --- Bottom: notes | request ---
         bottom = QWidget()
@@ -121,17 +140,36 @@ class MainWindow(QMainWindow):
         lblr.setFont(QFont("Arial",16, QFont.Bold))
         rl.addWidget(lblr)
 
-        titles = get_all_track_titles()
-        comp = QCompleter(titles)
-        comp.setCaseSensitivity(Qt.CaseInsensitive)
         self.req_input = QLineEdit()
         self.req_input.setPlaceholderText("Type track name...")
-        self.req_input.setCompleter(comp)
+        self.req_completer = RequestCompleter(self.track_db, self.req_input, parent=self)
         rl.addWidget(self.req_input)
 
-        btn = QPushButton("Add Request")
-        btn.clicked.connect(self.handle_request)
-        rl.addWidget(btn)
+        self.btn_request = QPushButton("Add Request")
+        self.btn_request.clicked.connect(self.handle_request)
+        rl.addWidget(self.btn_request)
+
+        # Batch: collect several requests, then place them together
+        self.request_batch = []
+        batch_row = QHBoxLayout()
+        self.batch_within = QSpinBox()
+        self.batch_within.setRange(0, 240)
+        self.batch_within.setSingleStep(5)
+        self.batch_within.setSuffix(" min")
+        self.batch_within.setSpecialValueText("Any time")
+        self.batch_within.setToolTip(
+            "Start within this many minutes of queue time after the current track")
+        batch_row.addWidget(self.batch_within)
+        self.btn_add_batch = QPushButton("Add to Batch")
+        self.btn_add_batch.clicked.connect(self.add_to_batch)
+        batch_row.addWidget(self.btn_add_batch)
+        rl.addLayout(batch_row)
+        self.lbl_batch = QLabel()
+        rl.addWidget(self.lbl_batch)
+        self.btn_place_batch = QPushButton("Place Batch")
+        self.btn_place_batch.clicked.connect(self.place_batch)
+        rl.addWidget(self.btn_place_batch)
+        self.update_batch_label()
         rl.addStretch()
         bl.addWidget(req_w, stretch=2)
 
@@ -151,29 +189,168 @@ class MainWindow(QMainWindow):
 
         self.setCentralWidget(container)
         self._init_queue_dock()
+        startup_profile.mark("window: panels and queue dock")
+
+        # session snapshots, written in the background
+        self.session_writer = SessionWriter(session_path)
+        self.snapshot_timer = QTimer(self)
+        self.snapshot_timer.setInterval(SNAPSHOT_INTERVAL_MS)
+        self.snapshot_timer.timeout.connect(self.snapshot_session)
+        self.snapshot_timer.start()
+
+        # requests need the library and the ordered set
+        self.set_requests_enabled(False)
+        self.loader.progress.connect(self.on_load_progress)
+        self.loader.libraryReady.connect(self.on_library_ready)
+        self.loader.playlistListed.connect(self.on_playlist_listed)
+        self.loader.tracksLoaded.connect(self.on_tracks_loaded)
+        self.loader.orderReady.connect(self.on_order_ready)
+        self.loader.failed.connect(self.on_load_failed)
+        if session is not None:
+            self.restore_session(session)
+        self.loader.start()
+
+    # --- Background loading ---
+
+    def on_load_progress(self, stage, done, total):
+        if stage == "library":
+            text = "Loading library…"
+        elif stage == "playlist":
+            text = f"Loading playlist… {done}/{total}"
+        else:
+            text = "Ordering set…"
+        self.lbl_status.setText(text)
+
+    def on_library_ready(self, items, index, compat):
+        self.library_items = items
+        self.library_by_id = {t.id: t for t in items}
+        self.library_index = index
+        self.compat_index = compat
+        self.suggestions.set_index(compat)
+        self.library_ready = True
+        if self.ordered_items:
+            # a resumed set arrived first; its row ids may predate a rebuild
+            self.relink_library_ids()
+            self.set_requests_enabled(True)
+            self.update_suggestions()
+
+    def relink_library_ids(self):
+        """Point the set's tracks at the current library rows, by uid."""
+        by_uid = {t.uid: t.id for t in self.library_items}
+        for t in self.ordered_items:
+            t.id = by_uid.get(t.uid)
+        self.set_ids = {t.id for t in self.ordered_items if t.id is not None}
+
+    def on_playlist_listed(self, total):
+        self.carousel.set_virtual(total > VIRTUALIZE_ABOVE)
+
+    def on_tracks_loaded(self, items):
+        """Show tracks in arrival order until the set is ordered."""
+        self._arrived.extend(items)
+        self.carousel.set_items(self._arrived)
+        self.energy_timeline.set_tracks(self._arrived)
+
+    def on_order_ready(self, ordered, current=0):
+        self.ordered_items = ordered
+        self._arrived = []
+        self.set_ids = {t.id for t in ordered if t.id is not None}
+        self.insertion = InsertionScorer(self.ordered_items)
+        self.carousel.current_index = current
+        self.carousel.set_items(self.ordered_items)
+        self.current_index = current
+        self.energy_timeline.current_index = current
+        self.energy_timeline.set_tracks(self.ordered_items)
+        self.queue_model.current = current
+        self.queue_model.set_items(self.ordered_items)
+        self.show_current_in_queue()
+        self.update_transition_notes()
+        self.update_suggestions()
+        self.set_requests_enabled(self.library_ready)
+        self.lbl_status.setVisible(False)
+
+    def on_load_failed(self, message):
+        self.lbl_status.setText(f"Could not load playlist: {message}")
+
+    def set_requests_enabled(self, enabled):
+        for w in (self.req_input, self.btn_request, self.btn_add_batch,
+                  self.batch_within):
+            w.setEnabled(enabled)
+        self.btn_plan.setEnabled(enabled and not self._planning)
+        self.btn_place_batch.setEnabled(enabled and bool(self.request_batch))
+
+    def closeEvent(self, event):
+        # don't wait on a playlist request in flight
+        self.loader.cancel(wait=False)
+        self.snapshot_timer.stop()
+        self.snapshot_session()
+        self.session_writer.close()
+        self.notes.close()
+        super().closeEvent(event)
+
+    # --- Session snapshots ---
+
+    def snapshot_session(self):
+        """Hand the current set, position, notes and covers to the writer."""
+        if not self.ordered_items:
+            return
+        tracks = list(self.ordered_items)
+        pairs = [self.transition_at(i) for i in range(len(tracks))]
+        thumbs = {t.thumbnail for t in tracks if t.thumbnail}
+        self.session_writer.submit(Session(
+            self.playlist_url, tracks, self.current_index,
+            self.notes.cached(pairs), ThumbnailLoader.instance().refs(thumbs),
+        ))
+
+    def restore_session(self, session):
+        """Show a snapshot's set as it was, without the network."""
+        covers = ThumbnailLoader.instance()
+        covers.offline = True
+        covers.add_refs(session.covers)
+        self.notes.preload(session.notes)
+        self.carousel.set_virtual(len(session.tracks) > VIRTUALIZE_ABOVE)
+        self.on_order_ready(session.tracks, session.current_index)
 
     def on_index_changed(self, idx: int):
         """Called whenever carousel advances."""
         self.current_index = idx
+        self.energy_timeline.set_current(idx)
+        self.queue_model.set_current(idx)
+        self.show_current_in_queue()
         self.update_transition_notes()
+        self.update_suggestions()
 
-    def save_current_notes(self):
-        """Save notes keyed by (current, next)."""
-        curr = self.current_index
+    def transition_at(self, curr):
+        """Notes key for the curr→next pair (see utils.transition_notes)."""
         nxt = min(curr+1, len(self.ordered_items)-1)
-        key = (self.ordered_items[curr]["title"],
-               self.ordered_items[nxt]["title"])
-        self.transition_notes_store[key] = self.transition_notes.toPlainText()
+        return transition_key(self.ordered_items[curr], self.ordered_items[nxt])
+
+    def save_current_notes(self):
+        """Save notes keyed by (current, next); written in the background."""
+        if not self.ordered_items:
+            return
+        self.notes.set(self.transition_at(self.current_index),
+                       self.transition_notes.toPlainText())
 
     def update_transition_notes(self):
-        """Load notes for the current→next pair."""
+        """Load notes for the current→next pair and prefetch the next few."""
+        if not self.ordered_items:
+            return
         curr = self.current_index
-        nxt = min(curr+1, len(self.ordered_items)-1)
-        key = (self.ordered_items[curr]["title"],
-               self.ordered_items[nxt]["title"])
-        self.transition_notes.setPlainText(
-            self.transition_notes_store.get(key, "")
-        )
+        self.transition_notes.setPlainText(self.notes.get(self.transition_at(curr)))
+        last = min(curr + NOTES_PREFETCH, len(self.ordered_items) - 1)
+        self.notes.prefetch([self.transition_at(i) for i in range(curr + 1, last + 1)])
+
+    def update_suggestions(self):
+        """Suggest follow-ups to the current track, picking up ingested or re-analyzed tracks."""
+        if not self.ordered_items or not self.library_ready:
+            return
+        # ingest and analysis add rows and update existing ones (a rebuild
+        # renumbers them all); each write stamps updated_at
+        new, self.compat_index.since = self.track_db.get_tracks_changed(self.compat_index.since)
+        if new:
+            self.compat_index.add(new)
+            self.library_by_id.update((t.id, t) for t in new)
+        self.suggestions.show_for(self.ordered_items[self.current_index], self.set_ids)
 
     def _init_queue_dock(self):
         dock = QDockWidget("Queue & Options", self)
@@ -186,14 +363,45 @@ class MainWindow(QMainWindow):
         # Energy toggle
         chk = QPushButton("Show Energy Curve")
         chk.setCheckable(True)
-        chk.toggled.connect(self.energy_canvas.setVisible)
+        chk.toggled.connect(self.energy_timeline.setVisible)
         l.addWidget(chk)
 
-        # Queue list
-        self.lst = QListWidget()
+        # Replan what's left of the set along an energy arc
+        plan_row = QHBoxLayout()
+        self.arc_choice = QComboBox()
+        self.arc_choice.addItems(list(ARCS))
+        plan_row.addWidget(self.arc_choice, stretch=1)
+        self.arc_per = QComboBox()
+        self.arc_per.addItem("per track", "position")
+        self.arc_per.addItem("per minute", "minute")
+        plan_row.addWidget(self.arc_per)
+        l.addLayout(plan_row)
+        self.btn_plan = QPushButton("Plan Set")
+        self.btn_plan.setToolTip("Reorder the tracks after the current one to follow the arc")
+        self.btn_plan.clicked.connect(self.plan_remaining)
+        l.addWidget(self.btn_plan)
+
+        # Queue search, applied once typing pauses
+        self.queue_search = QLineEdit()
+        self.queue_search.setPlaceholderText("Search queue…")
+        l.addWidget(self.queue_search)
+
+        # Queue list; the model follows ordered_items edit by edit
+        self.queue_model = QueueModel(self.ordered_items, self)
+        self.queue_filter = QueueFilter(self.queue_model, parent=self)
+        self.queue_search.textChanged.connect(self.queue_filter.set_query)
+        self.queue_filter.modelReset.connect(self.show_current_in_queue)
+        self.lst = QListView()
+        self.lst.setModel(self.queue_filter)
         self.lst.setFont(QFont("Arial",14, QFont.Bold))
         self.lst.setAlternatingRowColors(True)
         self.lst.setVerticalScrollMode(QAbstractItemView.ScrollPerPixel)
+        self.lst.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        # every row is one line of the same font; batched layout keeps
+        # a reset of a few thousand rows from blocking the UI
+        self.lst.setUniformItemSizes(True)
+        self.lst.setLayoutMode(QListView.Batched)
+        self.lst.setBatchSize(250)
         l.addWidget(self.lst)
 
         dock.setWidget(w)
@@ -203,69 +411,103 @@ class MainWindow(QMainWindow):
         toggle.setText("Show/Hide Queue")
         tb = self.addToolBar("View")
         tb.addAction(toggle)
-        self.filter_queue_list()
-
-    def filter_queue_list(self, text=""):
-        """Rebuild and highlight current track."""
-        self.lst.clear()
-        q = text.lower()
-        for i, tr in enumerate(self.ordered_items, start=1):
-            title = tr["title"]
-            if q and q not in title.lower():
-                continue
-            item = QListWidgetItem(f"{i}. {title}")
-            item.setSizeHint(QSize(0,50))
-            self.lst.addItem(item)
-        # highlight current
-        self.lst.setCurrentRow(self.current_index)
-        curr_item = self.lst.currentItem()
-        if curr_item:
-            self.lst.scrollToItem(curr_item, QAbstractItemView.PositionAtCenter)
 
+    def plan_state(self):
+        """The current index and the set (by identity) a plan is made for."""
+        return self.carousel.current_index, [id(t) for t in self.ordered_items]
 
-    def handle_request(self):
-        query = self.req_input.text().strip().lower()
-        if not query:
+    def plan_remaining(self):
+        """
+        Reorder the tracks after the current one along the chosen arc.
+        The search runs on a thread; on_plan_ready applies it.
+        """
+        curr = self.carousel.current_index
+        rest = self.ordered_items[curr + 1:]
+        if len(rest) < 2 or self._planning:
+            return
+        per = self.arc_per.currentData()
+        curve = arc_curve(ARCS[self.arc_choice.currentText()], rest, per)
+        start, state = self.ordered_items[curr], self.plan_state()
+
+        def run():
+            try:
+                plan = plan_set(rest, curve, per, budget_ms=PLAN_BUDGET_MS, start=start)
+            except Exception as e:
+                print(f"Could not plan the set: {e}", file=sys.stderr)
+                plan = None
+            self.planReady.emit((state, plan))
+
+        self._planning = True
+        self.btn_plan.setEnabled(False)
+        self.btn_plan.setText("Planning…")
+        threading.Thread(target=run, name="plan-set", daemon=True).start()
+
+    def on_plan_ready(self, result):
+        state, plan = result
+        self._planning = False
+        self.btn_plan.setText("Plan Set")
+        self.btn_plan.setEnabled(self.library_ready and bool(self.ordered_items))
+        # dropped if the set or the current track changed while planning
+        if plan is None or state != self.plan_state():
             return
-        match = next((t for t in self.library_items
-                      if query in t["title"].lower()), None)
+        head = self.ordered_items[:state[0] + 1]
+        self.ordered_items = head + plan.order
+        self.insertion = InsertionScorer(self.ordered_items)
+        self.energy_timeline.set_tracks(self.ordered_items)
+        self.energy_timeline.set_target(
+            np.concatenate((np.full(len(head), np.nan), plan.targets)))
+        self.queue_model.set_items(self.ordered_items)
+        self.carousel.set_items(self.ordered_items)
+        self.show_current_in_queue()
+        self.update_transition_notes()
+        self.update_suggestions()
+
+    def show_current_in_queue(self):
+        """Select and center the current track, if the search shows it."""
+        row = self.queue_filter.row_for_source(self.queue_model.current)
+        if row < 0:
+            self.lst.clearSelection()
+            return
+        idx = self.queue_filter.index(row)
+        self.lst.setCurrentIndex(idx)
+        self.lst.scrollTo(idx, QAbstractItemView.PositionAtCenter)
+
+    def find_request(self):
+        """Library track for the request box, or None (after warning)."""
+        query = self.req_input.text().strip()
+        if not query:
+            return None
+        # the Track picked from the completer, so a title shared by two
+        # artists queues the one chosen; otherwise an exact title, then
+        # the top search hit
+        picked = self.req_completer.selected_track()
+        match = self.library_by_id.get(picked.id) if picked else None
+        if not match:
+            match = self.library_index.match(query)
+        if not match:
+            hits = self.track_db.search(query, limit=1)
+            match = self.library_by_id.get(hits[0].id) if hits else None
         if not match:
             QMessageBox.warning(self, "Not found",
                                 f"No track matching '{self.req_input.text()}'.")
-            return
+        return match
 
+    def handle_request(self):
+        match = self.find_request()
+        if match:
+            self.request_track(match)
+
+    def request_track(self, match):
+        """Offer the best spots for a library track and insert it."""
+        if not self.ordered_items:
+            return
         curr = self.carousel.current_index
-        new_bpm, new_key = match["bpm"], match["key"]
-
-        # find global best
-        global_idx, global_cost = None, float('inf')
-        for i in range(curr+1, len(self.ordered_items)+1):
-            prev = self.ordered_items[i-1]
-            cost = abs(new_bpm - prev["bpm"]) + camelot_distance(new_key, prev["key"])
-            if i < len(self.ordered_items):
-                nxt = self.ordered_items[i]
-                cost += abs(new_bpm - nxt["bpm"]) + camelot_distance(new_key, nxt["key"])
-            if cost < global_cost:
-                global_cost, global_idx = cost, i
-
-        # find local best within MAX_LOOKAHEAD
-        local_idx, local_cost = None, float('inf')
-        for i in range(curr+1, min(curr+1+MAX_LOOKAHEAD, len(self.ordered_items))+1):
-            prev = self.ordered_items[i-1]
-            cost = abs(new_bpm - prev["bpm"]) + camelot_distance(new_key, prev["key"])
-            if i < len(self.ordered_items):
-                nxt = self.ordered_items[i]
-                cost += abs(new_bpm - nxt["bpm"]) + camelot_distance(new_key, nxt["key"])
-            if cost < local_cost:
-                local_cost, local_idx = cost, i
-
-        # compute distances/times
-        g_dist = global_idx - curr
-        g_secs = sum(t["duration"] for t in self.ordered_items[curr+1:global_idx+1])
-        g_m, g_s = divmod(int(g_secs), 60)
-        l_dist = local_idx - curr
-        l_secs = sum(t["duration"] for t in self.ordered_items[curr+1:local_idx+1])
-        l_m, l_s = divmod(int(l_secs), 60)
+        best = self.insertion.best_slots(match, curr)[0]
+        local = self.insertion.best_slots(match, curr, within_songs=MAX_LOOKAHEAD)[0]
+        global_idx, g_dist = best.index, best.songs
+        g_m, g_s = divmod(int(best.seconds), 60)
+        local_idx, l_dist = local.index, local.songs
+        l_m, l_s = divmod(int(local.seconds), 60)
 
         # prompt choice
         msg = QMessageBox(self)
@@ -288,15 +530,73 @@ class MainWindow(QMainWindow):
 
         confirm = QMessageBox.question(
             self, "Confirm",
-            f"Insert '{match['title']}' in {dist} songs (≈{mins}m{secs}s)?",
+            f"Insert '{match.title}' in {dist} songs (≈{mins}m{secs}s)?",
             QMessageBox.Yes | QMessageBox.No
         )
         if confirm != QMessageBox.Yes:
             return
 
         self.ordered_items.insert(insert_idx, match)
-        self.carousel.set_items(self.ordered_items)
-        self.filter_queue_list(self.queue_search.text())
+        self.insertion.insert(insert_idx, match)
+        # timeline and queue first: the carousel's indexChanged must find
+        # them shifted
+        self.energy_timeline.insert_track(insert_idx, match)
+        self.queue_model.insert_track(insert_idx, match)
+        self.carousel.insert_item(insert_idx, match)
+        self.set_ids.add(match.id)
+        self.update_suggestions()
+
+    # --- Request batch ---
+
+    def add_to_batch(self):
+        match = self.find_request()
+        if not match:
+            return
+        mins = self.batch_within.value()
+        self.request_batch.append((match, mins * 60 if mins else None))
+        self.req_input.clear()
+        self.update_batch_label()
+
+    def update_batch_label(self):
+        n = len(self.request_batch)
+        self.lbl_batch.setText(f"Batch: {n} request{'s' if n != 1 else ''}")
+        self.btn_place_batch.setEnabled(n > 0)
+
+    def place_batch(self):
+        """Place every batched request at once, each within its deadline."""
+        if not self.request_batch:
+            return
+        tracks = [t for t, _ in self.request_batch]
+        deadlines = [d for _, d in self.request_batch]
+        curr = self.carousel.current_index
+        new_order, placements = plan_requests(self.ordered_items, tracks, curr, deadlines)
+
+        lines = []
+        for p in placements:
+            m, s = divmod(int(p.seconds), 60)
+            line = f"'{p.track.title}' in {p.index - curr} songs (≈{m}m{s}s)"
+            if p.late:
+                line += f" — misses its {int(p.deadline) // 60} min limit"
+            lines.append(line)
+        confirm = QMessageBox.question(
+            self, "Place batch", "\n".join(lines) + "\n\nInsert all?",
+            QMessageBox.Yes | QMessageBox.No
+        )
+        if confirm != QMessageBox.Yes:
+            return
+
+        self.ordered_items = new_order
+        # queued tracks keep their order, so inserting each request at
+        # its final index, front to back, reproduces new_order
+        for p in sorted(placements, key=lambda p: p.index):
+            self.energy_timeline.insert_track(p.index, p.track)
+            self.queue_model.insert_track(p.index, p.track)
+            self.carousel.insert_item(p.index, p.track)
+        self.insertion = InsertionScorer(self.ordered_items)
+        self.set_ids.update(t.id for t in tracks)
+        self.request_batch.clear()
+        self.update_batch_label()
+        self.update_suggestions()
 
 
 def main():
@@ -0,0 +1,121 @@
+# ui/startup_loader.py
+
+import threading
+import time
+
+from PySide6.QtCore import QObject, Signal
+
+from utils.recommender import CompatibilityIndex
+from utils.sequencing import order_tracks
+from utils.soundcloud_import import (
+    fetch_sc_playlist_entries, get_sc_cache, iter_sc_playlist
+)
+from utils.track import Track
+from utils.track_db import get_db
+from utils.track_index import TrackIndex
+
+# time the initial ordering may spend improving on the greedy seed
+ORDER_BUDGET_MS = 150
+# batch streamed tracks so the UI is not redrawn once per track
+EMIT_INTERVAL = 0.1
+
+
+class StartupLoader(QObject):
+    """
+    Loads everything MainWindow needs on a worker thread, in stages:
+    library (+ TrackIndex, CompatibilityIndex), playlist listing, playlist tracks as they
+    resolve, then the initial ordering. Each stage reports through
+    signals, delivered queued on the UI thread. With load_playlist=False
+    (a resumed session) only the library is loaded.
+    """
+    progress = Signal(str, int, int)        # stage, done, total
+    libraryReady = Signal(object, object, object)  # library, TrackIndex, CompatibilityIndex
+    playlistListed = Signal(int)            # number of playlist entries
+    tracksLoaded = Signal(object)           # newly resolved playlist items
+    orderReady = Signal(object)             # the ordered playlist
+    failed = Signal(str)
+    finished = Signal()
+
+    def __init__(self, playlist_url, db=None, ydl_factory=None,
+                 sc_cache=None, order_budget_ms=ORDER_BUDGET_MS,
+                 load_playlist=True):
+        super().__init__()
+        self.playlist_url = playlist_url
+        self.load_playlist = load_playlist
+        self.db = db or get_db()
+        self.ydl_factory = ydl_factory
+        self.sc_cache = sc_cache
+        self.order_budget_ms = order_budget_ms
+        self.library_index = None
+        self._cancelled = False
+        self._thread = None
+
+    def start(self):
+        """Run on a new daemon thread, so an unfinished load never holds up exit."""
+        self._thread = threading.Thread(target=self.run, name="startup-loader",
+                                        daemon=True)
+        self._thread.start()
+
+    def cancel(self, wait=True):
+        """
+        Stop after the current step. wait=False (on window close) returns
+        at once and leaves the thread to finish the step on its own.
+        """
+        self._cancelled = True
+        if wait and self._thread is not None:
+            self._thread.join()
+
+    def run(self):
+        try:
+            self._run()
+        except Exception as e:
+            self.failed.emit(str(e))
+        self.finished.emit()
+
+    def _run(self):
+        self.progress.emit("library", 0, 1)
+        # once per run, before anything reads or writes the DB
+        self.db.migrate()
+        library, since = self.db.get_tracks_changed()
+        self.library_index = TrackIndex(library)
+        compat = CompatibilityIndex(library)
+        compat.since = since
+        self.libraryReady.emit(library, self.library_index, compat)
+        self.progress.emit("library", 1, 1)
+        if self._cancelled or not self.load_playlist:
+            return
+
+        cache = self.sc_cache or get_sc_cache()
+        entries = fetch_sc_playlist_entries(self.playlist_url, self.ydl_factory, cache)
+        if self._cancelled:
+            return
+        total = len(entries)
+        self.playlistListed.emit(total)
+        self.progress.emit("playlist", 0, total)
+
+        items = {}
+        chunk, last = [], time.perf_counter()
+        stream = iter_sc_playlist(self.playlist_url, ydl_factory=self.ydl_factory,
+                                  cache=cache, entries=entries)
+        for i, t in stream:
+            if self._cancelled:
+                stream.close()
+                return
+            items[i] = self.playlist_item(t)
+            chunk.append(items[i])
+            now = time.perf_counter()
+            if now - last >= EMIT_INTERVAL or len(items) == total:
+                self.tracksLoaded.emit(chunk)
+                self.progress.emit("playlist", len(items), total)
+                chunk, last = [], now
+
+        self.progress.emit("ordering", 0, 1)
+        ordered = order_tracks([items[i] for i in sorted(items)], mode="best",
+                               budget_ms=self.order_budget_ms)
+        self.orderReady.emit(ordered)
+        self.progress.emit("ordering", 1, 1)
+
+    def playlist_item(self, t):
+        """A SoundCloud track as a playlist item, BPM/key from the library."""
+        rec = self.library_index.match(t.get("title") or "", t.get("artist") or "")
+        return Track.from_sc(t, rec)
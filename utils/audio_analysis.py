@@ -0,0 +1,256 @@
+# utils/audio_analysis.py
+"""
+Offline BPM and key analysis of local audio files, for tracks the
+Rekordbox exports don't cover.
+
+Tempo comes from a spectral-flux onset envelope and its autocorrelation,
+key from a chroma profile matched against the Krumhansl-Kessler major
+and minor profiles; both are plain NumPy over a decimated mono signal.
+analyze_files() fans files out over a process pool and writes results
+into track_info tagged with ANALYSIS_VERSION, so a file is only analyzed
+again when the algorithm changes.
+
+Reads PCM WAV files with the stdlib wave module.
+Run:  python -m utils.audio_analysis <folder or .wav> [...]
+"""
+
+import os
+import sys
+import wave
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from utils.camelot import UNKNOWN, key_name, pitch_class_code
+from utils.track_db import get_db
+
+# bump whenever the results would change, so stored tracks are redone
+ANALYSIS_VERSION = 1
+
+# analysis runs on at most this much audio from the middle of the track,
+# resampled to about this rate
+MAX_SECONDS = 120
+TARGET_SR = 11025
+
+# --- Tempo ---
+ONSET_FFT = 512
+ONSET_HOP = 128
+BPM_MIN, BPM_MAX = 70.0, 180.0
+# metrically ambiguous tempos (87 vs 174) go to the one nearer this
+BPM_CENTER = 128.0
+COMB = 4                # autocorrelation peaks summed per candidate period
+
+# --- Key ---
+CHROMA_FFT = 8192
+CHROMA_FMIN, CHROMA_FMAX = 60.0, 2000.0
+_MAJOR = np.array([6.35, 2.23, 3.48, 2.33, 4.38, 4.09, 2.52, 5.19, 2.39, 3.66, 2.29, 2.88])
+_MINOR = np.array([6.33, 2.68, 3.52, 5.38, 2.60, 3.53, 2.54, 4.75, 3.98, 2.69, 3.34, 3.17])
+
+# results are saved every this many files, so an interrupted run keeps them
+SAVE_EVERY = 50
+
+
+def _zscore(x, axis=-1):
+    x = x - x.mean(axis=axis, keepdims=True)
+    norm = np.sqrt((x * x).sum(axis=axis, keepdims=True))
+    return x / np.where(norm > 0, norm, 1)
+
+# row c: the profile of the key with Camelot code c
+_PROFILES = np.zeros((UNKNOWN, 12))
+for _pc in range(12):
+    _PROFILES[pitch_class_code(_pc, False)] = np.roll(_MAJOR, _pc)
+    _PROFILES[pitch_class_code(_pc, True)] = np.roll(_MINOR, _pc)
+_PROFILES = _zscore(_PROFILES)
+
+
+def read_wav(path, max_seconds=MAX_SECONDS):
+    """
+    Mono float32 samples of a PCM WAV file, decimated to about
+    TARGET_SR, and their sample rate. Longer files are cut to the
+    middle max_seconds.
+    """
+    with wave.open(str(path), "rb") as wf:
+        sr, width, channels = wf.getframerate(), wf.getsampwidth(), wf.getnchannels()
+        n = wf.getnframes()
+        if max_seconds and n > max_seconds * sr:
+            wf.setpos((n - int(max_seconds * sr)) // 2)
+            n = int(max_seconds * sr)
+        raw = wf.readframes(n)
+
+    if width == 1:
+        y = np.frombuffer(raw, np.uint8).astype(np.float32) - 128.0
+    elif width == 3:
+        b = np.frombuffer(raw, np.uint8).reshape(-1, 3)
+        y = (b[:, 0].astype(np.int32) | (b[:, 1].astype(np.int32) << 8)
+             | (b[:, 2].astype(np.int8).astype(np.int32) << 16)).astype(np.float32)
+    else:
+        y = np.frombuffer(raw, {2: np.int16, 4: np.int32}[width]).astype(np.float32)
+    y = y[:len(y) // channels * channels].reshape(-1, channels).mean(axis=1)
+
+    # block averaging: a crude low-pass, but the onset envelope and a
+    # chroma below CHROMA_FMAX don't need more
+    factor = max(1, sr // TARGET_SR)
+    if factor > 1:
+        y = y[:len(y) // factor * factor].reshape(-1, factor).mean(axis=1)
+    peak = np.abs(y).max() if len(y) else 0
+    return (y / peak if peak > 0 else y), sr / factor
+
+
+def _spectrogram(y, n_fft, hop):
+    if len(y) < n_fft:
+        y = np.pad(y, (0, n_fft - len(y)))
+    frames = sliding_window_view(y, n_fft)[::hop]
+    return np.abs(np.fft.rfft(frames * np.hanning(n_fft).astype(np.float32), axis=1))
+
+
+def onset_envelope(y, sr):
+    """Spectral flux per ONSET_HOP samples, and its frame rate."""
+    spec = np.log1p(100 * _spectrogram(y, ONSET_FFT, ONSET_HOP))
+    flux = np.maximum(np.diff(spec, axis=0), 0).sum(axis=1)
+    return flux, sr / ONSET_HOP
+
+
+def estimate_tempo(y, sr):
+    """Tempo in BPM (BPM_MIN..BPM_MAX), or 0.0 if there is no beat."""
+    env, fps = onset_envelope(y, sr)
+    n = len(env)
+    if n < 2:
+        return 0.0
+    env = env - env.mean()
+    spec = np.fft.rfft(env, 2 * n)
+    ac = np.fft.irfft(spec * np.conj(spec))[:n]
+    if ac[0] <= 0:
+        return 0.0
+    ac = np.maximum(ac / ac[0], 0)
+
+    # candidate periods in quarter frames, so their multiples still
+    # land on the peaks
+    lags = np.arange(fps * 60 / BPM_MAX, fps * 60 / BPM_MIN, 0.25)
+    lags = lags[COMB * lags + 2 < n]
+    if not len(lags):
+        return 0.0
+    # a period's multiples are peaks too; peaks are a frame or two wide
+    wide = ac.copy()
+    wide[1:-1] = np.maximum(np.maximum(ac[:-2], ac[1:-1]), ac[2:])
+    score = sum(wide[np.rint(k * lags).astype(int)] for k in range(1, COMB + 1)) / COMB
+    bpm = 60 * fps / lags
+    score *= np.exp(-0.5 * np.log2(bpm / BPM_CENTER) ** 2)
+    period = float(lags[score.argmax()])
+
+    # refine on ever later multiples, where a frame is a smaller error;
+    # each step at most doubles the last error, so the peak is within
+    # a couple of frames of where it is expected
+    k = 2
+    while k * period < n / 2:
+        centre = int(round(k * period))
+        p = centre - 2 + int(ac[centre - 2:centre + 3].argmax())
+        a, b, c = ac[p - 1], ac[p], ac[p + 1]
+        denom = a - 2 * b + c
+        offset = 0.5 * (a - c) / denom if denom < 0 else 0.0
+        period = float(p + offset) / k
+        k *= 2
+    # a Python float: sqlite3 would store a NumPy scalar as a blob
+    return round(float(60 * fps / period), 2)
+
+
+def chroma(y, sr):
+    """Mean energy per pitch class (C=0 ... B=11)."""
+    spec = _spectrogram(y, CHROMA_FFT, CHROMA_FFT).mean(axis=0)
+    freqs = np.fft.rfftfreq(CHROMA_FFT, 1 / sr)
+    band = (freqs >= CHROMA_FMIN) & (freqs <= CHROMA_FMAX)
+    pcs = (np.round(12 * np.log2(freqs[band] / 440.0)).astype(int) + 9) % 12
+    return np.bincount(pcs, weights=spec[band], minlength=12)
+
+
+def estimate_key(y, sr):
+    """Camelot code of the best-matching key, or UNKNOWN."""
+    c = chroma(y, sr)
+    if not c.any() or np.allclose(c, c[0]):
+        return UNKNOWN
+    return int((_PROFILES @ _zscore(c)).argmax())
+
+
+def analyze_file(path):
+    """Worker: (path, bpm, Camelot key string), or (path, None, error)."""
+    try:
+        y, sr = read_wav(path)
+    except (OSError, EOFError, KeyError, wave.Error) as e:
+        return path, None, str(e) or type(e).__name__
+    return path, estimate_tempo(y, sr), key_name(estimate_key(y, sr))
+
+
+def track_for_file(path):
+    """(title, artist) from an "Artist - Title.wav" style file name."""
+    stem = Path(path).stem
+    if " - " in stem:
+        artist, title = stem.split(" - ", 1)
+        return title.strip(), artist.strip()
+    return stem.strip(), ""
+
+
+def _analyze_all(paths, workers):
+    if workers <= 1 or len(paths) < 2:
+        yield from map(analyze_file, paths)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        yield from pool.map(analyze_file, paths, chunksize=4)
+
+
+def analyze_files(paths, db=None, workers=None, force=False):
+    """
+    Analyze the WAV files in paths and save BPM and key to track_info.
+
+    Files whose track already has BPM and key from an export, or was
+    analyzed with the current ANALYSIS_VERSION, are skipped unless
+    force=True. Returns (analyzed, skipped, failed) file counts.
+    """
+    db = db or get_db()
+    db.migrate()
+    if workers is None:
+        workers = os.cpu_count() or 1
+    paths = [str(p) for p in paths]
+    names = {p: track_for_file(p) for p in paths}
+    state = db.get_analysis_state(names.values())
+
+    def done(name):
+        bpm, key, version = state.get(name, (None, None, None))
+        if version is not None:
+            return version >= ANALYSIS_VERSION
+        return bool(bpm) and bool(key)
+
+    todo = [p for p in paths if force or not done(names[p])]
+    analyzed = failed = 0
+    batch = []
+    for path, bpm, key in _analyze_all(todo, workers):
+        if bpm is None:
+            print(f"skipped {path}: {key}", file=sys.stderr)
+            failed += 1
+            continue
+        batch.append((*names[path], bpm or None, key))
+        if len(batch) >= SAVE_EVERY:
+            db.put_analysis(batch, ANALYSIS_VERSION)
+            analyzed += len(batch)
+            batch = []
+    db.put_analysis(batch, ANALYSIS_VERSION)
+    analyzed += len(batch)
+    return analyzed, len(paths) - len(todo), failed
+
+
+def find_wavs(targets):
+    """The .wav files among targets, searching folders recursively."""
+    found = []
+    for t in map(Path, targets):
+        if t.is_dir():
+            found.extend(sorted(p for p in t.rglob("*") if p.suffix.lower() == ".wav"))
+        elif t.suffix.lower() == ".wav":
+            found.append(t)
+    return found
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        sys.exit("usage: python -m utils.audio_analysis <folder or .wav> [...]")
+    analyzed, skipped, failed = analyze_files(find_wavs(sys.argv[1:]))
+    print(f"Analyzed {analyzed} files, {skipped} already done, {failed} unreadable")
@@ -0,0 +1,109 @@
+# utils/camelot.py
+
+from functools import lru_cache
+from typing import Iterable
+
+import numpy as np
+
+# Keys are stored as one small int: (number-1)*2 + (0 for A, 1 for B),
+# so 1A=0, 1B=1, ... 12B=23. Anything unparseable is UNKNOWN.
+UNKNOWN = 24
+N_CODES = 25
+
+
+@lru_cache(maxsize=None)
+def parse_key(key: str) -> int:
+    """Camelot key string ("8A", "12b") -> code 0..23, or UNKNOWN."""
+    if not key:
+        return UNKNOWN
+    key = key.strip().upper()
+    num, letter = key[:-1], key[-1:]
+    if letter not in ("A", "B") or not num.isdigit():
+        return UNKNOWN
+    num = int(num)
+    if not 1 <= num <= 12:
+        return UNKNOWN
+    return (num - 1) * 2 + (letter == "B")
+
+
+def key_name(code: int) -> str:
+    """Inverse of parse_key ("" for UNKNOWN)."""
+    if code == UNKNOWN:
+        return ""
+    return f"{code // 2 + 1}{'AB'[code % 2]}"
+
+
+def pitch_class_code(pitch_class: int, minor: bool) -> int:
+    """Code of the key on tonic pitch_class (C=0 ... B=11), major or minor."""
+    # a minor key shares its number with its relative major, 3 semitones up;
+    # each step round the wheel is a fifth (7 semitones), C major being 8B
+    if minor:
+        pitch_class += 3
+    num = (7 * pitch_class + 7) % 12 + 1
+    return (num - 1) * 2 + (not minor)
+
+
+def encode_keys(keys: Iterable[str]) -> np.ndarray:
+    """Parse a column of key strings into an int8 code array."""
+    return np.fromiter((parse_key(k or "") for k in keys), dtype=np.int8)
+
+
+def _wheel_step(a: int, b: int) -> int:
+    # signed steps around the wheel from a's number to b's, in -5..6
+    step = (b // 2 - a // 2) % 12
+    return step - 12 if step > 6 else step
+
+
+def _distance(a: int, b: int) -> int:
+    # the 0/1/2 scale of setlist_order.camelot_distance
+    if a == b:
+        return 0
+    if a == UNKNOWN or b == UNKNOWN:
+        return 2
+    same_letter = a % 2 == b % 2
+    step = _wheel_step(a, b)
+    if step == 0 and not same_letter:
+        return 1
+    if same_letter and abs(step) == 1:
+        return 1
+    return 2
+
+
+def _relation(a: int, b: int) -> str:
+    if a == UNKNOWN or b == UNKNOWN:
+        return "unknown"
+    if a == b:
+        return "same"
+    step = _wheel_step(a, b)
+    if a % 2 != b % 2:
+        if step == 0:
+            return "relative"
+        return "diagonal" if abs(step) == 1 else "clash"
+    return {1: "+1", -1: "-1", 2: "+2", -2: "-2",
+            # +7 around the wheel is one semitone up, -7 one down
+            -5: "+7", 5: "-7"}.get(step, "clash")
+
+
+DISTANCE = [[_distance(a, b) for b in range(N_CODES)] for a in range(N_CODES)]
+DISTANCE_NP = np.array(DISTANCE, dtype=np.int8)
+
+# Named mixing relation from a to b: "same", "relative", "+1", "-1",
+# "+2", "-2", "+7", "-7", "diagonal", "clash" or "unknown".
+RELATION = [[_relation(a, b) for b in range(N_CODES)] for a in range(N_CODES)]
+
+# Signed wheel steps from a to b (-5..6), 0 where either key is unknown.
+WHEEL_STEP = np.array(
+    [[0 if UNKNOWN in (a, b) else _wheel_step(a, b) for b in range(N_CODES)]
+     for a in range(N_CODES)], dtype=np.int8
+)
+
+
+def distance_matrix(codes) -> np.ndarray:
+    """N×N key distances for an array of codes, in one lookup."""
+    codes = np.asarray(codes, dtype=np.intp)
+    return DISTANCE_NP[codes[:, None], codes[None, :]]
+
+
+def relation(key1: str, key2: str) -> str:
+    """Named mixing relation between two key strings."""
+    return RELATION[parse_key(key1)][parse_key(key2)]
@@ -0,0 +1,99 @@
+# utils/insertion.py
+
+from typing import List, NamedTuple, Optional
+
+import numpy as np
+
+from utils.camelot import DISTANCE_NP
+from utils.track import Track
+
+
+class Slot(NamedTuple):
+    index: int      # insert before ordered_items[index]
+    cost: float     # |ΔBPM| + camelot_distance to both neighbours
+    songs: int      # index - current position (1 = plays next)
+    seconds: float  # queue time between the current track and this slot
+
+
+class InsertionScorer:
+    """
+    Scores every insertion slot of the queue for a requested track in
+    one vectorized pass, with the same cost model handle_request always
+    used: |ΔBPM| + camelot_distance to the tracks on either side.
+
+    Keeps BPM, key code and duration arrays of the queue plus a prefix
+    sum of durations, so time-until-play of any slot is O(1).
+    Call insert() whenever a track is added to the queue.
+    """
+
+    def __init__(self, tracks: List[Track]):
+        self.bpm = np.array([t.bpm for t in tracks], dtype=np.float64)
+        self.codes = np.array([t.key_code for t in tracks], dtype=np.intp)
+        self.durations = np.array([t.duration for t in tracks], dtype=np.float64)
+        self._update_prefix()
+
+    def __len__(self):
+        return len(self.bpm)
+
+    def _update_prefix(self):
+        # prefix[i] = total duration of tracks[:i]
+        self.prefix = np.concatenate(([0.0], np.cumsum(self.durations)))
+
+    def insert(self, index: int, track: Track):
+        self.bpm = np.insert(self.bpm, index, track.bpm)
+        self.codes = np.insert(self.codes, index, track.key_code)
+        self.durations = np.insert(self.durations, index, track.duration)
+        self._update_prefix()
+
+    def remove(self, index: int):
+        self.bpm = np.delete(self.bpm, index)
+        self.codes = np.delete(self.codes, index)
+        self.durations = np.delete(self.durations, index)
+        self._update_prefix()
+
+    def edge_costs(self, track: Track) -> np.ndarray:
+        """Cost of putting track next to each queued track."""
+        return (np.abs(track.bpm - self.bpm)
+                + DISTANCE_NP[track.key_code, self.codes])
+
+    def slot_costs(self, track: Track, curr: int) -> np.ndarray:
+        """Costs of slots curr+1 .. len(queue), in order."""
+        start = max(curr + 1, 0)
+        edge = self.edge_costs(track)
+        before = edge[start - 1:] if start > 0 else np.concatenate(([0.0], edge))
+        after = np.concatenate((edge[start:], [0.0]))
+        return before + after
+
+    def seconds_until(self, slot: int, curr: int) -> float:
+        """Queue time that plays after the current track and before slot."""
+        return float(self.prefix[slot] - self.prefix[max(curr + 1, 0)])
+
+    def best_slots(self, track: Track, curr: int, k: int = 1,
+                   within_songs: Optional[int] = None,
+                   within_secs: Optional[float] = None) -> List[Slot]:
+        """
+        The k cheapest slots after curr, cheapest first (ties go to the
+        earlier slot), optionally limited to slots with at most
+        within_songs queued songs before them (Slot.songs up to
+        within_songs + 1, the window handle_request always offered)
+        and/or at most within_secs of queue time before them
+        (Slot.seconds, which counts only the tracks before the slot).
+        """
+        start = max(curr + 1, 0)
+        costs = self.slot_costs(track, curr)
+        end = len(costs)
+        if within_songs is not None:
+            end = min(end, max(within_songs, 0) + 1)
+        if within_secs is not None:
+            # prefix is non-decreasing, so the time limit is a cut-off slot
+            last = np.searchsorted(self.prefix, self.prefix[start] + within_secs,
+                                   side="right") - 1
+            end = min(end, max(int(last) - start + 1, 1))
+        costs = costs[:end]
+
+        if k == 1:
+            picks = [int(costs.argmin())]
+        else:
+            picks = np.argsort(costs, kind="stable")[:k].tolist()
+        return [Slot(start + p, float(costs[p]), start + p - curr,
+                     self.seconds_until(start + p, curr)) for p in picks]
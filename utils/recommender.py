@@ -0,0 +1,126 @@
+# utils/recommender.py
+
+from typing import Container, Iterable, List, NamedTuple
+
+import numpy as np
+
+from utils.camelot import DISTANCE, N_CODES, RELATION
+from utils.track import Track
+
+# suggestions are tracks this close in key (camelot_distance)
+MAX_KEY_DISTANCE = 1
+# mixing a track at half or double its tempo costs as much as one key step
+HALF_TIME_COST = 1.0
+# (tempo ratio, extra cost): straight, double time, half time
+_RATIOS = ((1.0, 0.0), (2.0, HALF_TIME_COST), (0.5, HALF_TIME_COST))
+
+
+class Suggestion(NamedTuple):
+    track: Track
+    cost: float     # |ΔBPM| at the matched tempo + camelot_distance (+ HALF_TIME_COST)
+    ratio: float    # 1.0, or 2.0 / 0.5 when the track plays at double / half time
+    relation: str   # camelot RELATION from the current track
+
+
+class CompatibilityIndex:
+    """
+    "What mixes well out of this track", over the whole library.
+
+    Tracks with a known BPM are bucketed by Camelot code, each bucket a
+    BPM-sorted array, so a query only looks at the buckets of
+    key-compatible codes and, in each, the slices within the BPM window
+    around the current tempo and its double and half. Costs use the
+    sequencing model: |ΔBPM| + camelot_distance.
+    Call add() as tracks are ingested or re-analyzed; a known uid
+    replaces its track.
+    """
+
+    def __init__(self, tracks: Iterable[Track] = ()):
+        self.tracks: List[Track] = []
+        self.since = None           # TrackDB.get_tracks_changed watermark of what's indexed
+        self._by_uid = {}           # Track.uid -> position in self.tracks
+        self._bpm = [np.empty(0) for _ in range(N_CODES)]
+        self._pos = [np.empty(0, dtype=np.intp) for _ in range(N_CODES)]
+        self.add(tracks)
+
+    def __len__(self):
+        return len(self.tracks)
+
+    def add(self, tracks: Iterable[Track]):
+        """Index new tracks in one merge per bucket."""
+        new = {}                    # position -> track, last one wins
+        for t in tracks:
+            p = self._by_uid.get(t.uid)
+            if p is None:
+                p = self._by_uid[t.uid] = len(self.tracks)
+                self.tracks.append(t)
+            else:
+                self._drop(p)
+                self.tracks[p] = t
+            new[p] = t
+
+        by_code = {}
+        for p, t in new.items():
+            if t.bpm > 0:
+                by_code.setdefault(t.key_code, []).append(p)
+        for code, ps in by_code.items():
+            ps = np.array(ps, dtype=np.intp)
+            bpm = np.array([self.tracks[p].bpm for p in ps])
+            order = np.argsort(bpm, kind="stable")
+            bpm, ps = bpm[order], ps[order]
+            at = np.searchsorted(self._bpm[code], bpm, side="right")
+            self._bpm[code] = np.insert(self._bpm[code], at, bpm)
+            self._pos[code] = np.insert(self._pos[code], at, ps)
+
+    def _drop(self, p):
+        code = self.tracks[p].key_code
+        i = np.flatnonzero(self._pos[code] == p)
+        self._bpm[code] = np.delete(self._bpm[code], i)
+        self._pos[code] = np.delete(self._pos[code], i)
+
+    def suggest(self, track: Track, k: int = 10, bpm_range: float = 6.0,
+                exclude_ids: Container[int] = frozenset()) -> List[Suggestion]:
+        """
+        The k cheapest tracks to play after track, cheapest first: keys
+        within MAX_KEY_DISTANCE, tempo within ±bpm_range of track's (or of
+        its double or half, at HALF_TIME_COST). Leaves out track's own
+        library id and the ids in exclude_ids (a set). Needs track's BPM.
+        """
+        if track.bpm <= 0 or k <= 0:
+            return []
+        code = track.key_code
+        costs, positions, ratios = [], [], []
+        for c in range(N_CODES):
+            key_cost = DISTANCE[code][c]
+            if key_cost > MAX_KEY_DISTANCE or not len(self._bpm[c]):
+                continue
+            bpms = self._bpm[c]
+            for ratio, extra in _RATIOS:
+                target = track.bpm * ratio
+                lo = np.searchsorted(bpms, target - bpm_range * ratio, side="left")
+                hi = np.searchsorted(bpms, target + bpm_range * ratio, side="right")
+                if hi > lo:
+                    costs.append(np.abs(bpms[lo:hi] / ratio - track.bpm) + (key_cost + extra))
+                    positions.append(self._pos[c][lo:hi])
+                    ratios.append(np.full(hi - lo, ratio))
+        if not costs:
+            return []
+        cost = np.concatenate(costs)
+        pos = np.concatenate(positions)
+        ratio = np.concatenate(ratios)
+
+        # walk the candidates cheapest first, so exclusions cost nothing
+        # beyond the ones actually passed over; overlapping windows
+        # (3 * bpm_range >= BPM) can offer a track twice
+        out, seen = [], set()
+        for i in np.argsort(cost, kind="stable"):
+            p = int(pos[i])
+            t = self.tracks[p]
+            if p in seen or t.id in exclude_ids or (t.id is not None and t.id == track.id):
+                continue
+            seen.add(p)
+            out.append(Suggestion(t, float(cost[i]), float(ratio[i]),
+                                  RELATION[code][t.key_code]))
+            if len(out) == k:
+                break
+        return out
@@ -0,0 +1,191 @@
+# utils/request_batch.py
+
+import itertools
+import time
+from typing import List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+from utils.camelot import DISTANCE_NP
+from utils.insertion import InsertionScorer
+from utils.track import Track
+
+# Cost per second a request plays after its deadline; large enough that
+# a plan only misses a deadline when no order can meet it.
+LATE_COST_PER_SEC = 1000.0
+
+# Batches up to this size try every request order.
+EXACT_ORDER_MAX = 5
+
+
+class Placement(NamedTuple):
+    track: Track
+    index: int                  # position in the returned queue
+    seconds: float              # queue time after the current track before it plays
+    deadline: Optional[float]   # seconds, None if the request had none
+    late: bool                  # deadline could not be met
+
+
+def _pair_costs(tracks: List[Track]) -> np.ndarray:
+    # |ΔBPM| + camelot_distance between every pair, as in handle_request
+    bpm = np.array([t.bpm for t in tracks], dtype=np.float64)
+    codes = np.array([t.key_code for t in tracks], dtype=np.intp)
+    return (np.abs(bpm[:, None] - bpm[None, :])
+            + DISTANCE_NP[codes[:, None], codes[None, :]])
+
+
+class _Merge:
+    """
+    Places requests into the queue tail for one fixed request order,
+    exactly: a DP over (queue tracks used, requests used, which came
+    last), one vectorized row per request. The queue tail keeps its
+    order, so only the interleaving is chosen.
+    """
+
+    def __init__(self, anchor: Optional[Track], tail: List[Track],
+                 requests: List[Track], deadlines: Sequence[Optional[float]]):
+        # node 0 is the current track (cost 0 to anything if there is none),
+        # then the tail, then the requests
+        nodes = ([anchor] if anchor is not None else []) + tail + requests
+        cost = _pair_costs(nodes)
+        if anchor is None:
+            cost = np.pad(cost, ((1, 0), (1, 0)))
+        self.cost = cost
+        self.L = len(tail)
+        self.t = np.arange(self.L + 1)                 # t[0] = anchor
+        self.r = np.arange(len(requests)) + self.L + 1
+        self.dur = np.array([0.0] + [t.duration for t in tail + requests])
+        self.deadline = np.array([np.inf if d is None else d for d in deadlines])
+        # A[i] = cost of playing the tail t_1..t_i straight through
+        self.A = np.concatenate(([0.0], np.cumsum(cost[self.t[:-1], self.t[1:]])))
+        self.TP = np.concatenate(([0.0], np.cumsum(self.dur[1:self.L + 1])))
+
+    def solve(self, order: Sequence[int]) -> Tuple[float, List[int]]:
+        """Cheapest merge for requests in this order: (cost, node sequence)."""
+        c, t, A, L = self.cost, self.t, self.A, self.L
+        idx = np.arange(L)
+        T = A.copy()                    # T[i]: t_i played last
+        R = np.full(L + 1, np.inf)      # R[i]: request played last
+        from_T, T_src = [], []
+        elapsed = 0.0
+        prev_r = None
+        for q in order:
+            r = self.r[q]
+            # request r after i tail tracks
+            via_T = T + c[t, r]
+            via_R = R + (c[prev_r, r] if prev_r is not None else np.inf)
+            late = np.maximum(self.TP + elapsed - self.deadline[q], 0.0)
+            R = np.minimum(via_T, via_R) + LATE_COST_PER_SEC * late
+            from_T.append(via_T <= via_R)
+            # tail tracks after the latest request: a running min over
+            # where the tail resumed
+            v = R[:-1] + c[r, t[1:]] - A[1:]
+            run = np.minimum.accumulate(v)
+            src = np.maximum.accumulate(np.where(v <= run, idx, -1))
+            T = np.concatenate(([np.inf], A[1:] + run))
+            T_src.append(src)
+            elapsed += self.dur[r]
+            prev_r = r
+
+        # backtrack from whichever came last
+        i, j = L, len(order)
+        kind = "R" if j and R[L] < T[L] else "T"
+        total = float(min(T[L], R[L]) if j else T[L])
+        seq = []
+        while i > 0 or j > 0:
+            if kind == "R":
+                seq.append(self.r[order[j - 1]])
+                kind = "T" if from_T[j - 1][i] else "R"
+                j -= 1
+            else:
+                k = T_src[j - 1][i - 1] if j else 0
+                seq.extend(range(i, k, -1))
+                i, kind = k, "R"
+                if j == 0:
+                    break
+        return total, seq[::-1]
+
+
+def plan_requests(queue: List[Track], requests: List[Track], curr: int,
+                  deadlines: Optional[Sequence[Optional[float]]] = None,
+                  budget_ms: Optional[float] = 100
+                  ) -> Tuple[List[Track], List[Placement]]:
+    """
+    Place several requests into the queue after position curr at once.
+
+    Minimises the total transition cost of the resulting set under the
+    handle_request cost model (|ΔBPM| + camelot_distance), keeping the
+    queued tracks in their current order and each request within its
+    deadline: the most queue time, in seconds, that may play after the
+    current track before it starts (None for no limit), measured as
+    Slot.seconds is. For a given request order the placement is exact; small
+    batches try every order, larger ones start from each request's own
+    best slot and move requests within the order until nothing improves
+    or budget_ms runs out.
+
+    Returns the new queue and one Placement per request, in input order.
+    """
+    deadlines = list(deadlines) if deadlines is not None else [None] * len(requests)
+    if len(deadlines) != len(requests):
+        raise ValueError("need one deadline per request")
+    curr = min(curr, len(queue) - 1)
+    head, tail = queue[:curr + 1], list(queue[curr + 1:])
+    merge = _Merge(head[-1] if head else None, tail, list(requests), deadlines)
+    stop = time.perf_counter() + (budget_ms or 0) / 1000.0
+    n = len(requests)
+
+    if n <= EXACT_ORDER_MAX:
+        best = None
+        for order in itertools.permutations(range(n)):
+            cost, seq = merge.solve(order)
+            if best is None or cost < best[0] - 1e-9:
+                best = (cost, seq, order)
+    else:
+        # seed: each request's own best slot, ties broken by deadline
+        scorer = InsertionScorer(queue)
+        slot = [scorer.best_slots(r, curr, within_secs=d)[0].index
+                for r, d in zip(requests, deadlines)]
+        order = sorted(range(n), key=lambda q: (slot[q], merge.deadline[q]))
+        best = (*merge.solve(order), order)
+        improved = True
+        while improved and time.perf_counter() < stop:
+            improved = False
+            for order in _moves(best[2]):
+                cost, seq = merge.solve(order)
+                if cost < best[0] - 1e-9:
+                    best = (cost, seq, order)
+                    improved = True
+                    break
+                if time.perf_counter() >= stop:
+                    break
+    _, seq, _ = best
+
+    # node ids -> tracks; tail nodes are 1..L, requests follow
+    nodes = tail + list(requests)
+    out = head + [nodes[x - 1] for x in seq]
+    starts = np.concatenate(([0.0], np.cumsum(merge.dur[seq])))
+    pos = {x: p for p, x in enumerate(seq)}
+    placements = []
+    for q, r in enumerate(requests):
+        p = pos[merge.r[q]]
+        placements.append(Placement(
+            r, len(head) + p, float(starts[p]), deadlines[q],
+            bool(starts[p] > merge.deadline[q] + 1e-9),
+        ))
+    return out, placements
+
+
+def _moves(order: List[int]):
+    # every order reachable by moving one request to another position,
+    # adjacent swaps first
+    n = len(order)
+    for a in range(n - 1):
+        swapped = list(order)
+        swapped[a], swapped[a + 1] = swapped[a + 1], swapped[a]
+        yield swapped
+    for a in range(n):
+        for b in range(n):
+            if abs(a - b) > 1:
+                moved = order[:a] + order[a + 1:]
+                moved.insert(b, order[a])
+                yield moved
@@ -0,0 +1,176 @@
+# utils/sequencing.py
+
+import time
+from typing import List, Optional
+
+import numpy as np
+
+from utils.camelot import distance_matrix
+from utils.track import Track
+
+# BPM term for a transition where either side has no known BPM
+UNKNOWN_BPM_COST = 8.0
+
+
+def transition_cost_matrix(tracks: List[Track], bpm_weight: float = 1.0,
+                           key_weight: float = 1.0) -> np.ndarray:
+    """
+    N×N cost of playing track j right after track i:
+      bpm_weight * |ΔBPM| + key_weight * camelot_distance
+    (the same model handle_request uses to place requests).
+    """
+    bpm = np.array([t.bpm for t in tracks], dtype=np.float64)
+    cost = bpm_weight * np.abs(bpm[:, None] - bpm[None, :])
+    unknown = bpm <= 0
+    cost[unknown, :] = cost[:, unknown] = bpm_weight * UNKNOWN_BPM_COST
+
+    cost += key_weight * distance_matrix(key_codes(tracks))
+
+    np.fill_diagonal(cost, 0.0)
+    return cost
+
+
+def key_codes(tracks: List[Track]) -> np.ndarray:
+    """Camelot codes of tracks, as an array."""
+    return np.fromiter((t.key_code for t in tracks),
+                       dtype=np.intp, count=len(tracks))
+
+
+def path_cost(cost: np.ndarray, order) -> float:
+    """Total transition cost of playing tracks in `order`."""
+    order = np.asarray(order, dtype=np.intp)
+    if len(order) < 2:
+        return 0.0
+    return float(cost[order[:-1], order[1:]].sum())
+
+
+def nearest_neighbour(cost: np.ndarray, start: int) -> np.ndarray:
+    """Greedy seed: always step to the cheapest unplayed track."""
+    n = len(cost)
+    order = np.empty(n, dtype=np.intp)
+    visited = np.zeros(n, dtype=bool)
+    cur = start
+    for k in range(n):
+        order[k] = cur
+        visited[cur] = True
+        if k == n - 1:
+            break
+        row = np.where(visited, np.inf, cost[cur])
+        cur = int(row.argmin())
+    return order
+
+
+def _with_ends(cost: np.ndarray) -> np.ndarray:
+    # add a free "outside" node so the open path can be treated as a
+    # cycle with fixed ends: first and last transitions cost nothing
+    n = len(cost)
+    ext = np.zeros((n + 1, n + 1), dtype=cost.dtype)
+    ext[:n, :n] = cost
+    return ext
+
+
+def two_opt(cost: np.ndarray, order: np.ndarray, deadline: float) -> np.ndarray:
+    """Reverse segments while that lowers the cost, until deadline."""
+    n = len(order)
+    if n < 3:
+        return order
+    ext = _with_ends(cost)
+    p = np.concatenate(([n], order, [n]))
+    improved = True
+    while improved and time.perf_counter() < deadline:
+        improved = False
+        for i in range(1, n):
+            # reverse p[i..j] for every j > i at once
+            a, b = p[i - 1], p[i]
+            c, d = p[i + 1:n + 1], p[i + 2:n + 2]
+            delta = ext[a, c] + ext[b, d] - ext[a, b] - ext[c, d]
+            j = int(delta.argmin())
+            if delta[j] < -1e-9:
+                j += i + 1
+                p[i:j + 1] = p[i:j + 1][::-1]
+                improved = True
+            if time.perf_counter() >= deadline:
+                break
+    return p[1:-1]
+
+
+def or_opt(cost: np.ndarray, order: np.ndarray, deadline: float,
+           max_len: int = 3) -> np.ndarray:
+    """Move short runs (1..max_len tracks) to a cheaper spot, until deadline."""
+    n = len(order)
+    if n < 4:
+        return order
+    ext = _with_ends(cost)
+    p = np.concatenate(([n], order, [n]))
+    improved = True
+    while improved and time.perf_counter() < deadline:
+        improved = False
+        for seg_len in range(1, max_len + 1):
+            i = 1
+            while i + seg_len <= n and time.perf_counter() < deadline:
+                s0, s1 = p[i], p[i + seg_len - 1]
+                prev, nxt = p[i - 1], p[i + seg_len]
+                gain = ext[prev, s0] + ext[s1, nxt] - ext[prev, nxt]
+
+                rest = np.concatenate((p[:i], p[i + seg_len:]))
+                left, right = rest[:-1], rest[1:]
+                base = ext[left, right]
+                fwd = ext[left, s0] + ext[s1, right] - base
+                rev = ext[left, s1] + ext[s0, right] - base
+                k_f, k_r = int(fwd.argmin()), int(rev.argmin())
+                best, k, flip = (fwd[k_f], k_f, False) if fwd[k_f] <= rev[k_r] \
+                    else (rev[k_r], k_r, True)
+
+                if best - gain < -1e-9:
+                    seg = p[i:i + seg_len]
+                    seg = seg[::-1] if flip else seg
+                    p = np.concatenate((rest[:k + 1], seg, rest[k + 1:]))
+                    improved = True
+                else:
+                    i += 1
+    return p[1:-1]
+
+
+def order_tracks(tracks: List[Track], mode: str = "fast",
+                 budget_ms: Optional[float] = 200,
+                 bpm_weight: float = 1.0, key_weight: float = 1.0) -> List[Track]:
+    """
+    Order tracks to minimise total transition cost.
+
+      mode="fast": nearest-neighbour from the lowest-BPM track.
+      mode="best": the same seed, then 2-opt and Or-opt passes until
+                   nothing improves or budget_ms runs out.
+
+    The result is oriented so the set starts at its lower-BPM end.
+    """
+    if mode not in ("fast", "best"):
+        raise ValueError(f"unknown mode {mode!r}")
+    n = len(tracks)
+    if n < 2:
+        return list(tracks)
+
+    deadline = time.perf_counter() + (budget_ms or 0) / 1000.0
+    cost = transition_cost_matrix(tracks, bpm_weight, key_weight)
+    bpm = np.array([t.bpm for t in tracks], dtype=np.float64)
+    known = np.where(bpm > 0, bpm, np.inf)
+    start = int(known.argmin()) if np.isfinite(known).any() else 0
+    order = nearest_neighbour(cost, start)
+
+    if mode == "best":
+        while time.perf_counter() < deadline:
+            before = path_cost(cost, order)
+            order = two_opt(cost, order, deadline)
+            order = or_opt(cost, order, deadline)
+            if path_cost(cost, order) >= before - 1e-9:
+                break
+
+    if (bpm[order[0]] or np.inf) > (bpm[order[-1]] or np.inf):
+        order = order[::-1]
+    return [tracks[i] for i in order]
+
+
+def sequence_cost(tracks: List[Track], bpm_weight: float = 1.0,
+                  key_weight: float = 1.0) -> float:
+    """Total transition cost of a setlist in its current order."""
+    cost = transition_cost_matrix(tracks, bpm_weight, key_weight)
+    return path_cost(cost, range(len(tracks)))
@@ -0,0 +1,148 @@
+# utils/session.py
+"""
+Session snapshots, so a crashed or closed app can come back to the
+same set without the network: the ordered set (requests included), the
+current track, the notes for the set's transitions and the cover cache
+entries for its thumbnails.
+
+A snapshot is one small JSON document with the tracks stored column by
+column. SessionWriter encodes and writes snapshots on a background
+thread, latest one wins, skipping any that match what is already on
+disk. Writes go to a temporary file that then replaces the snapshot,
+so a crash mid-write leaves the previous one intact.
+"""
+
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from utils.track import Track
+from utils.track_db import DATA_DIR
+
+SESSION_PATH = DATA_DIR / "session.json"
+# bumped when the layout changes; older snapshots are ignored
+SESSION_VERSION = 2
+# Track attributes saved per track, in column order
+_COLUMNS = ("id", "uid", "url", "title", "artist", "bpm", "key", "duration", "thumbnail")
+
+
+class Session(NamedTuple):
+    playlist_url: str
+    tracks: List[Track]                     # the set, in play order
+    current_index: int
+    notes: Dict[Tuple[str, str], str]       # transition_key pair -> notes
+    covers: Dict[str, str]                  # thumbnail URL -> cover cache hash
+
+
+def encode(session: Session) -> bytes:
+    tracks = session.tracks
+    doc = {
+        "version": SESSION_VERSION,
+        "playlist_url": session.playlist_url,
+        "current_index": session.current_index,
+        "tracks": {c: [getattr(t, c) for t in tracks] for c in _COLUMNS},
+        "notes": [[a, b, text] for (a, b), text in session.notes.items() if text],
+        "covers": session.covers,
+    }
+    return json.dumps(doc, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def decode(data: bytes) -> Session:
+    doc = json.loads(data)
+    if doc.get("version") != SESSION_VERSION:
+        raise ValueError(f"unsupported session version {doc.get('version')!r}")
+    cols = doc["tracks"]
+    tracks = [Track(**dict(zip(_COLUMNS, row))) for row in zip(*(cols[c] for c in _COLUMNS))]
+    return Session(
+        playlist_url=doc["playlist_url"],
+        tracks=tracks,
+        current_index=max(0, min(doc["current_index"], len(tracks) - 1)),
+        notes={(a, b): text for a, b, text in doc["notes"]},
+        covers=doc["covers"],
+    )
+
+
+def _write_atomic(path, data):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def save_session(session: Session, path=SESSION_PATH):
+    _write_atomic(path, encode(session))
+
+
+def load_session(path=SESSION_PATH) -> Optional[Session]:
+    """The last snapshot, or None if there is none or it can't be read."""
+    try:
+        return decode(Path(path).read_bytes())
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        if not isinstance(e, FileNotFoundError):
+            print(f"Could not read session snapshot: {e}")
+        return None
+
+
+class SessionWriter:
+    """
+    Writes snapshots handed to submit() on a background thread. Only
+    the latest pending snapshot is written; one whose encoding matches
+    the last write is skipped.
+    """
+
+    def __init__(self, path=SESSION_PATH):
+        self.path = Path(path)
+        self.writes = 0             # snapshots written, for benchmarks
+        self._pending = None
+        self._last = None           # bytes of the last snapshot written
+        self._busy = False
+        self._closed = False
+        self._cond = threading.Condition()
+        self._thread = threading.Thread(target=self._run, name="session-writer",
+                                        daemon=True)
+        self._thread.start()
+
+    def submit(self, session: Session):
+        with self._cond:
+            self._pending = session
+            self._cond.notify()
+
+    def flush(self):
+        """Wait until the latest submitted snapshot is on disk."""
+        with self._cond:
+            while (self._pending is not None or self._busy) and self._thread.is_alive():
+                self._cond.wait(0.1)
+
+    def close(self):
+        self.flush()
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        self._thread.join()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while self._pending is None and not self._closed:
+                    self._cond.wait()
+                if self._pending is None:
+                    return
+                session, self._pending = self._pending, None
+                self._busy = True
+            try:
+                data = encode(session)
+                if data != self._last:
+                    _write_atomic(self.path, data)
+                    self._last = data
+                    self.writes += 1
+            except (OSError, TypeError, ValueError) as e:
+                print(f"Could not save session snapshot: {e}")
+            with self._cond:
+                self._busy = False
+                self._cond.notify_all()
@@ -0,0 +1,156 @@
+# utils/set_planner.py
+
+import time
+from typing import List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+from utils.sequencing import transition_cost_matrix
+from utils.track import Track
+
+# Arc shapes: (fraction of the set, energy 0..1) control points. Energy
+# is mapped onto the pool's own BPM range by arc_curve().
+ARCS = {
+    "Warm-up, peak, breather, close": (
+        (0.0, 0.1), (0.3, 0.6), (0.5, 1.0), (0.6, 0.45), (0.8, 1.0), (1.0, 0.3)),
+    "Steady build": ((0.0, 0.0), (1.0, 1.0)),
+    "Peak hour": ((0.0, 0.6), (0.15, 0.9), (0.85, 1.0), (1.0, 0.8)),
+}
+# BPM percentiles of the pool that energy 0 and 1 map to
+ARC_LOW, ARC_HIGH = 10, 90
+# used for tracks without a duration when the curve is per minute
+DEFAULT_DURATION = 240.0
+
+
+class Plan(NamedTuple):
+    order: List[Track]
+    targets: np.ndarray     # target BPM at each position of order
+    fit_error: float        # RMS |BPM - target| over tracks with a known BPM
+    cost: float             # total transition cost (sequencing model)
+    narrowed: bool          # the budget ran out and the search went greedy
+
+
+def arc_curve(arc: Sequence[Tuple[float, float]], tracks: Sequence[Track],
+              per: str = "position"):
+    """
+    (x, BPM) points: an ARCS shape scaled to the pool's BPM range, x the
+    fraction of the set or, per="minute", minutes over the pool's length.
+    """
+    bpm = np.array([t.bpm for t in tracks if t.bpm > 0])
+    lo, hi = (np.percentile(bpm, [ARC_LOW, ARC_HIGH]) if len(bpm)
+              else (120.0, 128.0))
+    span = _durations(tracks).sum() / 60.0 if per == "minute" and tracks else 1.0
+    return [(x * span, float(lo + e * (hi - lo))) for x, e in arc]
+
+
+def _durations(tracks):
+    d = np.array([t.duration for t in tracks], dtype=np.float64)
+    known = d[d > 0]
+    return np.where(d > 0, d, known.mean() if len(known) else DEFAULT_DURATION)
+
+
+def curve_targets(curve, tracks: Sequence[Track], per: str = "position",
+                  start_secs: float = 0.0) -> np.ndarray:
+    """
+    Target BPM for each track of a set in this order. curve is a list
+    of (x, BPM) points with x the fraction of the set (per="position")
+    or minutes from the start (per="minute").
+    """
+    xs, ys = np.array(curve, dtype=np.float64).T
+    n = len(tracks)
+    if per == "minute":
+        starts = start_secs + np.concatenate(([0.0], np.cumsum(_durations(tracks))[:-1]))
+        return np.interp(starts / 60.0, xs, ys)
+    return np.interp(np.arange(n) / max(n - 1, 1), xs, ys)
+
+
+def feasible_curve(targets: np.ndarray, bpm: np.ndarray):
+    """
+    Map target BPMs onto what the pool can play: a monotone remap that
+    sends the k-th lowest target to the k-th lowest track BPM. The arc
+    keeps its shape (peaks stay peaks) but no longer asks for more fast
+    or slow tracks than the pool has, which would otherwise make the
+    search spend them on the first peak and miss the second.
+    """
+    order = np.sort(targets)
+    quantiles = np.quantile(bpm, np.linspace(0, 1, len(order)))
+    return lambda t: np.interp(t, order, quantiles)
+
+
+def plan_set(tracks: Sequence[Track], curve, per: str = "position",
+             beam_width: int = 64, budget_ms: Optional[float] = 500,
+             start: Optional[Track] = None, fit_weight: float = 1.0,
+             bpm_weight: float = 1.0, key_weight: float = 1.0) -> Plan:
+    """
+    Order tracks to follow a target curve (see curve_targets) while
+    keeping transitions cheap.
+
+    Beam search: the set is built one position at a time, keeping the
+    beam_width cheapest partial sets, where a step costs
+    bpm_weight*|ΔBPM| + key_weight*camelot_distance (as in order_tracks)
+    plus fit_weight*|BPM - target|, targets taken through feasible_curve.
+    With per="minute" each partial set keeps its own clock, so targets
+    follow the real durations. Once budget_ms runs out the search
+    finishes greedily (Plan.narrowed). start, if given, is the track
+    playing before the planned ones; it costs a transition but the
+    curve's clock (x=0) still starts with the first planned track.
+
+    Tracks without a BPM can't follow a curve; they go last, which is
+    also where the cost model puts them (UNKNOWN_BPM_COST per edge).
+    """
+    all_tracks = list(tracks)
+    tracks = [t for t in all_tracks if t.bpm > 0]
+    rest = [t for t in all_tracks if t.bpm <= 0]
+    n = len(tracks)
+    deadline = time.perf_counter() + budget_ms / 1000.0 if budget_ms else None
+
+    # nodes: the tracks to plan, then rest, then the start track if any
+    nodes = tracks + rest + ([start] if start is not None else [])
+    cost = transition_cost_matrix(nodes, bpm_weight, key_weight)
+    s0 = len(nodes) - 1
+    bpm = np.array([t.bpm for t in tracks], dtype=np.float64)
+    durations = _durations(tracks)
+    xs, ys = np.array(curve, dtype=np.float64).T
+    feasible = feasible_curve(curve_targets(curve, tracks, per), bpm) if n else None
+
+    # beam state: rows of equal-length partial orders
+    paths = np.empty((1, 0), dtype=np.intp)
+    used = np.zeros((1, n), dtype=bool)
+    score = np.zeros(1)
+    clock = np.zeros(1)
+    width, narrowed = beam_width, False
+    for step in range(n):
+        if deadline is not None and width > 1 and time.perf_counter() > deadline:
+            width, narrowed = 1, True
+            keep = np.argsort(score)[:1]
+            paths, used, score, clock = paths[keep], used[keep], score[keep], clock[keep]
+        if per == "minute":
+            targets = feasible(np.interp(clock / 60.0, xs, ys))
+        else:
+            targets = np.full(len(score), feasible(np.interp(step / max(n - 1, 1), xs, ys)))
+        step_cost = fit_weight * np.abs(bpm[None, :] - targets[:, None])
+        if step:
+            step_cost += cost[paths[:, -1], :n]
+        elif start is not None:
+            step_cost += cost[s0, :n][None, :]
+        total = np.where(used, np.inf, score[:, None] + step_cost)
+
+        flat = total.ravel()
+        m = min(width, flat.size)
+        best = np.argpartition(flat, m - 1)[:m] if m < flat.size else np.arange(flat.size)
+        best = best[np.isfinite(flat[best])]
+        state, pick = np.divmod(best, n)
+        paths = np.concatenate((paths[state], pick[:, None]), axis=1)
+        used = used[state]
+        used[np.arange(len(pick)), pick] = True
+        score = flat[best]
+        clock = clock[state] + durations[pick]
+
+    order = paths[int(score.argmin())]
+    targets = curve_targets(curve, [tracks[i] for i in order], per)
+    fit_error = float(np.sqrt(np.mean((bpm[order] - targets) ** 2))) if n else 0.0
+    full = ([s0] if start is not None else []) + list(order) + list(range(n, n + len(rest)))
+    total_cost = float(cost[full[:-1], full[1:]].sum()) if len(full) > 1 else 0.0
+    planned = [tracks[i] for i in order] + rest
+    return Plan(planned, curve_targets(curve, planned, per), fit_error,
+                total_cost, narrowed)
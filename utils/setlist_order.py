@@ -1,36 +1,27 @@
 # utils/setlist_order.py
 
-from typing import List, Dict
+from typing import List
+
+from utils.camelot import DISTANCE, UNKNOWN, parse_key
+from utils.track import Track
 
 def camelot_distance(key1: str, key2: str) -> int:
     """
     Compute a simple “harmonic distance” on the Camelot wheel:
       - 0 if identical
       - 1 if same number different letter OR adjacent number same letter (with wrap 12⇄1)
-      - 2 otherwise
+      - 2 otherwise, including two different unparseable keys
+    Keys are parsed once (memoized) and looked up in a precomputed table;
+    see utils.camelot for the code-based API and finer-grained relations.
     """
-    if not key1 or not key2 or key1 == key2:
+    a, b = parse_key(key1), parse_key(key2)
+    if a == UNKNOWN and b == UNKNOWN:
+        # the table has one UNKNOWN code; tell unparseable keys apart here
         return 0 if key1 == key2 else 2
-
-    try:
-        num1, let1 = int(key1[:-1]), key1[-1]
-        num2, let2 = int(key2[:-1]), key2[-1]
-    except ValueError:
-        return 2
-
-    # same number, different letter
-    if num1 == num2 and let1 != let2:
-        return 1
-
-    # adjacent number, same letter
-    if let1 == let2:
-        if abs(num1 - num2) == 1 or {num1, num2} == {1, 12}:
-            return 1
-
-    return 2
+    return DISTANCE[a][b]
 
 
-def hybrid_order(tracks: List[Dict]) -> List[Dict]:
+def hybrid_order(tracks: List[Track]) -> List[Track]:
     """
     Greedy hybrid ordering:
      1. Sort by energy (BPM ascending).
@@ -38,8 +29,8 @@ def hybrid_order(tracks: List[Dict]) -> List[Dict]:
         that minimizes harmonic distance from the current key.
     """
     # 1) sort by BPM
-    pool = sorted(tracks, key=lambda t: t.get("bpm") or 0)
-    sequence: List[Dict] = []
+    pool = sorted(tracks, key=lambda t: t.bpm)
+    sequence: List[Track] = []
 
     if not pool:
         return sequence
@@ -50,13 +41,13 @@ def hybrid_order(tracks: List[Dict]) -> List[Dict]:
 
     # 3) greedily pick the next best harmonic fit among remaining
     while pool:
-        candidates = [t for t in pool if (t.get("bpm") or 0) >= (current.get("bpm") or 0)]
+        candidates = [t for t in pool if t.bpm >= current.bpm]
         if not candidates:
             candidates = pool
 
         best = min(
             candidates,
-            key=lambda t: camelot_distance(current.get("key", ""), t.get("key", ""))
+            key=lambda t: DISTANCE[current.key_code][t.key_code]
         )
         sequence.append(best)
         pool.remove(best)
@@ -1,24 +1,218 @@
-from yt_dlp import YoutubeDL
+import json
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from utils.track_db import DATA_DIR
 
 "fetch_sc_playlist_full imports and returns full track metadata"
 
-def fetch_sc_playlist_full(url):
+SC_CACHE_PATH = DATA_DIR / "sc_cache.db"
+TRACK_TTL = 7 * 24 * 3600      # per-track metadata rarely changes
+PLAYLIST_TTL = 3600            # the track list of a playlist might
+MAX_WORKERS = 8
+
+SC_CACHE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sc_tracks (
+    url     TEXT PRIMARY KEY,
+    fetched REAL NOT NULL,
+    data    TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS sc_playlists (
+    url     TEXT PRIMARY KEY,
+    fetched REAL NOT NULL,
+    data    TEXT NOT NULL
+);
+"""
+
+
+class SCCache:
+    """
+    SQLite cache of yt-dlp results: resolved track metadata by track URL
+    and flat entry lists by playlist URL, each with its own TTL.
+    Every resolved track is written as soon as it arrives, so an
+    interrupted import picks up where it stopped.
+    """
+
+    def __init__(self, path=SC_CACHE_PATH, track_ttl=TRACK_TTL,
+                 playlist_ttl=PLAYLIST_TTL):
+        self.track_ttl = track_ttl
+        self.playlist_ttl = playlist_ttl
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SC_CACHE_SCHEMA)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def _get(self, table, url, ttl):
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT fetched, data FROM {table} WHERE url = ?", (url,)
+            ).fetchone()
+        if row is None or time.time() - row[0] > ttl:
+            return None
+        return json.loads(row[1])
+
+    def _put(self, table, url, data):
+        with self._lock, self._conn:
+            self._conn.execute(
+                f"INSERT OR REPLACE INTO {table} (url, fetched, data) VALUES (?, ?, ?)",
+                (url, time.time(), json.dumps(data)),
+            )
+
+    def get_tracks(self, urls):
+        """Fresh cached metadata for the given track URLs, as {url: track}."""
+        found = {}
+        cutoff = time.time() - self.track_ttl
+        urls = list(urls)
+        with self._lock:
+            for i in range(0, len(urls), 500):
+                chunk = urls[i:i + 500]
+                rows = self._conn.execute(
+                    "SELECT url, data FROM sc_tracks WHERE fetched >= ? AND url IN (%s)"
+                    % ",".join("?" * len(chunk)), [cutoff, *chunk],
+                )
+                found.update((u, json.loads(d)) for u, d in rows)
+        return found
+
+    def put_track(self, url, track):
+        self._put("sc_tracks", url, track)
+
+    def get_playlist(self, url):
+        return self._get("sc_playlists", url, self.playlist_ttl)
+
+    def put_playlist(self, url, entries):
+        self._put("sc_playlists", url, entries)
+
+
+_cache = None
+
+
+def get_sc_cache():
+    """Shared cache at SC_CACHE_PATH."""
+    global _cache
+    if _cache is None:
+        _cache = SCCache()
+    return _cache
+
+
+def _default_ydl():
+    # yt-dlp takes a while to import; only pay for it when fetching
+    from yt_dlp import YoutubeDL
+    return YoutubeDL
+
+
+def _track_meta(entry):
+    return {
+        'title': entry.get('title'),
+        'artist': entry.get('uploader'),
+        'thumbnail': entry.get('thumbnail'),
+        'duration': entry.get('duration'),
+        'bpm': entry.get('bpm'),
+        'key': entry.get('key'),
+    }
+
+
+def _entry_url(entry):
+    return entry.get('webpage_url') or entry.get('url')
+
+
+def fetch_sc_playlist_entries(url, ydl_factory=None, cache=None):
+    """
+    Phase one: the playlist's flat entry list (url, title, ... as far as
+    the flat listing has them), without resolving each track.
+    """
+    cache = cache or get_sc_cache()
+    entries = cache.get_playlist(url)
+    if entries is not None:
+        return entries
+    ydl_factory = ydl_factory or _default_ydl()
     ydl_opts = {
-        'extract_flat': False,
+        'extract_flat': 'in_playlist',
         'skip_download': True,
         'quiet': True,
     }
-    with YoutubeDL(ydl_opts) as ydl:
+    with ydl_factory(ydl_opts) as ydl:
         info = ydl.extract_info(url, download=False)
+    entries = [
+        {'url': _entry_url(e), **_track_meta(e)}
+        for e in info.get('entries', []) if _entry_url(e)
+    ]
+    cache.put_playlist(url, entries)
+    return entries
+
+
+def iter_sc_playlist(url, max_workers=MAX_WORKERS, ydl_factory=None,
+                     cache=None, entries=None):
+    """
+    Yield (index, track) for every playlist entry as soon as its full
+    metadata (plus its 'url') is known: cached tracks first, then tracks
+    resolved on a pool of max_workers threads, in completion order.
+    A track that fails to resolve is yielded with what the flat listing
+    had. Pass entries if fetch_sc_playlist_entries was already called.
+    """
+    cache = cache or get_sc_cache()
+    if entries is None:
+        entries = fetch_sc_playlist_entries(url, ydl_factory, cache)
+    cached = cache.get_tracks(e['url'] for e in entries)
+
+    todo = []
+    for i, e in enumerate(entries):
+        if e['url'] in cached:
+            yield i, cached[e['url']]
+        else:
+            todo.append(i)
+    if not todo:
+        return
+    ydl_factory = ydl_factory or _default_ydl()
+
+    # one YoutubeDL per worker thread; instances are not thread-safe
+    local = threading.local()
+    opened = []
+    ydl_opts = {'skip_download': True, 'quiet': True}
+
+    def resolve(track_url):
+        ydl = getattr(local, 'ydl', None)
+        if ydl is None:
+            ydl = local.ydl = ydl_factory(ydl_opts).__enter__()
+            opened.append(ydl)
+        info = ydl.extract_info(track_url, download=False)
+        return {'url': track_url, **_track_meta(info)}
+
+    pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="sc-import")
+    futures = {pool.submit(resolve, entries[i]['url']): i for i in todo}
+    finished = False
+    try:
+        for fut in as_completed(futures):
+            i = futures[fut]
+            entry = entries[i]
+            try:
+                track = fut.result()
+            except Exception:
+                yield i, entry
+                continue
+            cache.put_track(entry['url'], track)
+            yield i, track
+        finished = True
+    finally:
+        # also reached when the caller stops iterating early (e.g. the app
+        # closing); then requests in flight are not waited for, and their
+        # YoutubeDLs, possibly still in use, are left to be collected
+        pool.shutdown(wait=finished, cancel_futures=True)
+        if finished:
+            for ydl in opened:
+                ydl.__exit__(None, None, None)
+
 
-    tracks = []
-    for entry in info.get('entries', []):
-        tracks.append({
-            'title': entry.get('title'),
-            'artist': entry.get('uploader'),
-            'thumbnail': entry.get('thumbnail'),
-            'duration': entry.get('duration'),
-            'bpm': entry.get('bpm'),
-            'key': entry.get('key'),
-        })
-    return tracks
\ No newline at end of file
+def fetch_sc_playlist_full(url, max_workers=MAX_WORKERS, ydl_factory=None,
+                           cache=None):
+    """All tracks of the playlist with full metadata, in playlist order."""
+    tracks = {}
+    for i, track in iter_sc_playlist(url, max_workers, ydl_factory, cache):
+        tracks[i] = track
+    return [tracks[i] for i in sorted(tracks)]
@@ -0,0 +1,132 @@
+# utils/startup_profile.py
+"""
+Startup profiling for `main.py --profile-startup`: per-module import
+times (like python -X importtime) and named phases marked along the
+way. mark() is a no-op unless a profile has been started.
+"""
+
+import importlib.abc
+import sys
+import threading
+import time
+
+_active = None
+
+
+class _TimingLoader(importlib.abc.Loader):
+    """Wraps a module's loader to time create_module and exec_module."""
+
+    def __init__(self, loader, profile):
+        self.loader = loader
+        self.profile = profile
+
+    def create_module(self, spec):
+        # extension modules do their loading here
+        self.profile._enter(spec.name)
+        try:
+            return self.loader.create_module(spec)
+        finally:
+            self.profile._leave()
+
+    def exec_module(self, module):
+        self.profile._enter(module.__name__)
+        try:
+            self.loader.exec_module(module)
+        finally:
+            self.profile._leave()
+
+    def __getattr__(self, name):
+        return getattr(self.loader, name)
+
+
+class _TimingFinder(importlib.abc.MetaPathFinder):
+    def __init__(self, profile):
+        self.profile = profile
+
+    def find_spec(self, name, path, target=None):
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+            spec = finder.find_spec(name, path, target)
+            if spec is not None:
+                if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+                    spec.loader = _TimingLoader(spec.loader, self.profile)
+                return spec
+        return None
+
+
+class StartupProfile:
+    def __init__(self):
+        self.t0 = time.perf_counter()
+        self.last = self.t0
+        self.phases = []        # (label, seconds since previous mark, seconds since start)
+        self.imports = {}       # module -> [self seconds, cumulative seconds]
+        # per thread: imports on the loader thread nest apart from the UI's
+        self._local = threading.local()     # .stack: [name, start, child seconds]
+        self._lock = threading.Lock()       # guards imports
+        self._finder = _TimingFinder(self)
+
+    def start(self):
+        global _active
+        _active = self
+        sys.meta_path.insert(0, self._finder)
+        return self
+
+    def stop(self):
+        global _active
+        if self._finder in sys.meta_path:
+            sys.meta_path.remove(self._finder)
+        if _active is self:
+            _active = None
+
+    def mark(self, label):
+        # may be called from the loader thread; list.append is atomic
+        now = time.perf_counter()
+        self.phases.append((label, now - self.last, now - self.t0))
+        self.last = now
+
+    def _stack(self):
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def _enter(self, name):
+        self._stack().append([name, time.perf_counter(), 0.0])
+
+    def _leave(self):
+        stack = self._stack()
+        name, start, children = stack.pop()
+        total = time.perf_counter() - start
+        with self._lock:
+            times = self.imports.setdefault(name, [0.0, 0.0])
+            times[0] += total - children
+            times[1] += total
+        if stack:
+            stack[-1][2] += total
+
+    def report(self, top=15):
+        """Top-level packages by cumulative import time, then the phases."""
+        packages = {}
+        for name, (own, _) in self.imports.items():
+            root = name.split(".")[0]
+            packages[root] = packages.get(root, 0.0) + own
+        lines = [f"{'import':<32} {'ms':>8}"]
+        for root, secs in sorted(packages.items(), key=lambda kv: -kv[1])[:top]:
+            lines.append(f"  {root:<30} {secs * 1000:8.1f}")
+        lines.append(f"  {'(all imports)':<30} {sum(packages.values()) * 1000:8.1f}")
+        lines.append(f"{'phase':<32} {'ms':>8} {'at ms':>8}")
+        for label, secs, at in self.phases:
+            lines.append(f"  {label:<30} {secs * 1000:8.1f} {at * 1000:8.1f}")
+        return "\n".join(lines)
+
+
+def start():
+    """Begin profiling; call before the application's imports."""
+    return StartupProfile().start()
+
+
+def mark(label):
+    """Record the time since the previous mark under label."""
+    if _active is not None:
+        _active.mark(label)
@@ -0,0 +1,88 @@
+# utils/track.py
+
+from utils.camelot import parse_key
+from utils.track_index import normalize, title_keys
+
+
+def library_uid(title, artist):
+    """Track.uid of the library row with this title and artist."""
+    return f"tt:{(title or '').lower()}|{(artist or '').lower()}"
+
+
+class Track:
+    """
+    One track as it moves through the app: library rows, search hits,
+    playlist items and requests alike.
+
+    BPM and duration (seconds) are floats, 0.0 when unknown; key_code is
+    the parsed Camelot code (utils.camelot). __slots__ keeps a 100k-track
+    library far smaller than the dicts it replaces; the normalized
+    search keys are computed on first use and shared with TrackIndex.
+    """
+    __slots__ = ("id", "url", "title", "artist", "bpm", "key", "key_code",
+                 "duration", "thumbnail", "_title_keys", "_artist_norm", "_uid")
+
+    def __init__(self, title="", artist="", bpm=0.0, key="", duration=0.0,
+                 thumbnail=None, id=None, url=None, key_code=None, uid=None):
+        self.id = id                # track_info row id, if in the library
+        self.url = url              # SoundCloud URL, if from a playlist
+        self.title = title or ""
+        self.artist = artist or ""
+        # float() of a float is the same object; 0.0 is a shared constant
+        self.bpm = float(bpm) if bpm else 0.0
+        self.key = key or ""
+        self.key_code = parse_key(self.key) if key_code is None else key_code
+        self.duration = float(duration) if duration else 0.0
+        self.thumbnail = thumbnail
+        self._title_keys = None
+        self._artist_norm = None
+        self._uid = uid
+
+    @classmethod
+    def from_sc(cls, meta, rec=None):
+        """
+        A SoundCloud track (soundcloud_import metadata) as a playlist
+        item, with id, BPM and key from its library record rec, if any.
+        """
+        return cls(
+            title=meta.get("title"),
+            artist=meta.get("artist"),
+            bpm=rec.bpm if rec else 0.0,
+            key=rec.key if rec else "",
+            key_code=rec.key_code if rec else None,
+            duration=(meta.get("duration") or 0)/1000.0,
+            thumbnail=meta.get("thumbnail"),
+            id=rec.id if rec else None,
+            url=meta.get("url"),
+            uid=rec.uid if rec else None,
+        )
+
+    @property
+    def title_keys(self):
+        """Normalized title keys (see track_index.title_keys)."""
+        if self._title_keys is None:
+            self._title_keys = tuple(title_keys(self.title))
+        return self._title_keys
+
+    @property
+    def artist_norm(self):
+        if self._artist_norm is None:
+            self._artist_norm = normalize(self.artist)
+        return self._artist_norm
+
+    @property
+    def uid(self):
+        """
+        Stable id: the library's natural key (case-folded title and
+        artist, unique in track_info), else the SoundCloud URL. Row ids
+        are not used; a rebuild reassigns them. A playlist item matched
+        to the library shares its library track's uid.
+        """
+        if self._uid is not None:
+            return self._uid
+        if self.id is None and self.url:
+            return f"sc:{self.url}"
+        return library_uid(self.title, self.artist)
+
+    def __repr__(self):
+        return f"Track({self.title!r}, {self.artist!r}, bpm={self.bpm}, key={self.key!r})"
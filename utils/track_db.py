@@ -3,118 +3,775 @@
 import sqlite3
 import glob
 import csv
+import hashlib
 import os
+import re
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
+from utils.track import Track, library_uid
+
 # Paths
 BASE_DIR = Path(__file__).parent.parent
 DB_PATH   = BASE_DIR / "data" / "track_info.db"
 DATA_DIR  = BASE_DIR / "data"
 
-def create_track_db(db_path=DB_PATH, data_dir=DATA_DIR):
-    """Read all .txt files, dedupe in Python, then populate SQLite."""
+SCHEMA = '''
+  CREATE TABLE IF NOT EXISTS track_info (
+    id INTEGER PRIMARY KEY,
+    track_title TEXT,
+    artist TEXT,
+    bpm REAL,
+    key TEXT,
+    album TEXT,
+    genre TEXT,
+    rating TEXT,
+    time TEXT,
+    date_added TEXT,
+    analysis_version INTEGER,
+    bpm_analyzed INTEGER NOT NULL DEFAULT 0,
+    key_analyzed INTEGER NOT NULL DEFAULT 0,
+    updated_at REAL,
+    source TEXT,
+    UNIQUE(track_title, artist)
+  );
+  CREATE INDEX IF NOT EXISTS idx_track_info_title ON track_info(track_title);
+  CREATE INDEX IF NOT EXISTS idx_track_info_title_nocase
+    ON track_info(track_title COLLATE NOCASE);
+  CREATE TABLE IF NOT EXISTS transition_notes (
+    from_uid TEXT,
+    to_uid TEXT,
+    notes TEXT,
+    updated_at REAL,
+    PRIMARY KEY(from_uid, to_uid)
+  );
+'''
+
+# track_info columns added after the first release, in order; bpm_analyzed
+# and key_analyzed are 1 where analysis, not an export, set the value;
+# updated_at is when ingest or analysis last wrote the row (_NOW);
+# source is the export (ingest_manifest path) the row's values came from
+_ADDED_COLUMNS = (
+    ("analysis_version", "INTEGER"),
+    ("bpm_analyzed", "INTEGER NOT NULL DEFAULT 0"),
+    ("key_analyzed", "INTEGER NOT NULL DEFAULT 0"),
+    ("updated_at", "REAL"),
+    ("source", "TEXT"),
+)
+
+# Unix time in SQL, for track_info.updated_at
+_NOW = "(julianday('now') - 2440587.5) * 86400.0"
+
+def _columns(conn):
+    return {r[1] for r in conn.execute("PRAGMA table_info(track_info)")}
+
+def _ensure_columns(conn):
+    """
+    Add the columns in _ADDED_COLUMNS to DBs created before they existed.
+    Safe to race with another process doing the same: the check is
+    repeated under the write lock.
+    """
+    if all(c in _columns(conn) for c, _ in _ADDED_COLUMNS):
+        return
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        cols = _columns(conn)
+        for col, decl in _ADDED_COLUMNS:
+            if col not in cols:
+                conn.execute(f"ALTER TABLE track_info ADD COLUMN {col} {decl}")
+        if "analysis_version" in cols and "bpm_analyzed" not in cols:
+            # rows only analysis ever wrote (no export lists them) are its own
+            conn.execute(
+                "UPDATE track_info SET bpm_analyzed = 1, key_analyzed = 1 "
+                "WHERE analysis_version IS NOT NULL AND date_added IS NULL"
+            )
+        if "source" not in cols and conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE name = 'ingest_manifest'").fetchone():
+            # re-read every export on the next ingest, recording sources
+            conn.execute("DELETE FROM ingest_manifest")
+    except BaseException:
+        conn.rollback()
+        raise
+    conn.commit()
+
+def _rekey_notes(conn):
+    """
+    Rewrite transition notes saved under row-id uids ("db:<id>") to the
+    natural keys Track.uid uses now.
+    """
+    old = conn.execute(
+        "SELECT from_uid, to_uid FROM transition_notes "
+        "WHERE from_uid LIKE 'db:%' OR to_uid LIKE 'db:%'"
+    ).fetchall()
+    if not old:
+        return
+    uids = {f"db:{i}": library_uid(t, a) for i, t, a in
+            conn.execute('SELECT id, track_title, artist FROM track_info')}
+    with conn:
+        conn.executemany(
+            'UPDATE OR REPLACE transition_notes SET from_uid = ?, to_uid = ? '
+            'WHERE from_uid = ? AND to_uid = ?',
+            [(uids.get(a, a), uids.get(b, b), a, b) for a, b in old]
+        )
+
+# SQLite's historical limit on host parameters per statement
+_MAX_PARAMS = 999
+
+# ingesting more changed exports than this rebuilds the search index
+# once at the end instead of updating it row by row
+_BULK_FILES = 16
+
+# Full-text search over track_info, kept in sync by triggers.
+# track_fts does ranked token-prefix search; track_fts_tri (trigram
+# tokenizer, SQLite >= 3.34) adds substring matches.
+_FTS_COLUMNS = "track_title, artist, album, genre"
+_FTS_TABLES = {
+    "track_fts": "tokenize='unicode61 remove_diacritics 2', prefix='1 2 3'",
+    "track_fts_tri": "tokenize='trigram'",
+}
+
+def _ensure_search_index(conn):
+    """
+    Create missing FTS tables/triggers; return the names usable for
+    search. Each table is created, wired up and filled in one
+    transaction, under the write lock, so racing processes build it once.
+    """
+    if len(_search_tables(conn)) == len(_FTS_TABLES):
+        return list(_FTS_TABLES)
+    new = ", ".join(f"new.{c}" for c in _FTS_COLUMNS.split(", "))
+    old = ", ".join(f"old.{c}" for c in _FTS_COLUMNS.split(", "))
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        have = _search_tables(conn)
+        usable = []
+        for table, options in _FTS_TABLES.items():
+            if table not in have:
+                try:
+                    conn.execute(
+                        f"CREATE VIRTUAL TABLE {table} USING fts5({_FTS_COLUMNS}, "
+                        f"content='track_info', content_rowid='id', {options})"
+                    )
+                except sqlite3.OperationalError:
+                    continue  # FTS5 or this tokenizer not compiled in
+                conn.execute(f'''
+                  CREATE TRIGGER {table}_ai AFTER INSERT ON track_info BEGIN
+                    INSERT INTO {table}(rowid, {_FTS_COLUMNS}) VALUES (new.id, {new});
+                  END''')
+                conn.execute(f'''
+                  CREATE TRIGGER {table}_ad AFTER DELETE ON track_info BEGIN
+                    INSERT INTO {table}({table}, rowid, {_FTS_COLUMNS})
+                      VALUES ('delete', old.id, {old});
+                  END''')
+                conn.execute(f'''
+                  CREATE TRIGGER {table}_au AFTER UPDATE ON track_info BEGIN
+                    INSERT INTO {table}({table}, rowid, {_FTS_COLUMNS})
+                      VALUES ('delete', old.id, {old});
+                    INSERT INTO {table}(rowid, {_FTS_COLUMNS}) VALUES (new.id, {new});
+                  END''')
+                conn.execute(f"INSERT INTO {table}({table}) VALUES ('rebuild')")
+            usable.append(table)
+    except BaseException:
+        conn.rollback()
+        raise
+    conn.commit()
+    return usable
+
+# shorter queries match most of the library; search() returns nothing
+# for them rather than ranking every row
+MIN_QUERY = 2
+
+# bm25 costs a few microseconds per scored row, and a short prefix
+# matches tens of thousands of them: search() only ranks the newest
+# this many prefix matches, after the titles that start with the query
+RANK_CANDIDATES = 200
+
+def _search_tables(conn):
+    """The FTS tables a migrated DB has, without creating any."""
+    have = {r[0] for r in conn.execute(
+        "SELECT name FROM sqlite_master WHERE name LIKE 'track_fts%'"
+    )}
+    return [t for t in _FTS_TABLES if t in have]
+
+def migrate(conn):
+    """
+    Bring a track DB up to the current schema (tables, added columns,
+    search index) and switch it to WAL. Run once, from create_track_db
+    or TrackDB.migrate() at start-up; plain reads never change the file.
+    Returns the FTS tables usable for search.
+    """
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.executescript(SCHEMA)
+    _ensure_columns(conn)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_track_info_updated ON track_info(updated_at)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_track_info_source ON track_info(source)")
+    _rekey_notes(conn)
+    return _ensure_search_index(conn)
+
+def _drop_search_index(conn):
+    for table in _FTS_TABLES:
+        conn.executescript(f'''
+          DROP TRIGGER IF EXISTS {table}_ai;
+          DROP TRIGGER IF EXISTS {table}_ad;
+          DROP TRIGGER IF EXISTS {table}_au;
+          DROP TABLE IF EXISTS {table};
+        ''')
+
+def _fts_phrase(text):
+    return '"' + text.replace('"', '""') + '"'
+
+INGEST_SCHEMA = '''
+  CREATE TABLE IF NOT EXISTS ingest_manifest (
+    path TEXT PRIMARY KEY,
+    mtime REAL,
+    size INTEGER,
+    sha1 TEXT
+  );
+  CREATE UNIQUE INDEX IF NOT EXISTS idx_track_info_nocase
+    ON track_info(track_title COLLATE NOCASE, artist COLLATE NOCASE);
+'''
+
+def _drop_case_duplicates(conn):
+    """
+    Delete the case-variant duplicates a legacy DB may hold, keeping the
+    newest row (highest id) of each title+artist, as later exports win.
+    Returns the deleted (title, artist) pairs.
+    """
+    dupes = conn.execute(
+        'SELECT id, track_title, artist FROM track_info '
+        'WHERE track_title IS NOT NULL AND artist IS NOT NULL AND id NOT IN ('
+        '  SELECT max(id) FROM track_info '
+        '  GROUP BY track_title COLLATE NOCASE, artist COLLATE NOCASE)'
+    ).fetchall()
+    with conn:
+        conn.executemany('DELETE FROM track_info WHERE id = ?', [(i,) for i, _, _ in dupes])
+    return [(t, a) for _, t, a in dupes]
+
+UPSERT_SQL = f'''
+  INSERT INTO track_info
+    (track_title, artist, bpm, key, album, genre, rating, time, date_added, source,
+     updated_at)
+  VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, {_NOW})
+  ON CONFLICT(track_title COLLATE NOCASE, artist COLLATE NOCASE) DO UPDATE SET
+    bpm=CASE WHEN bpm_analyzed AND NOT coalesce(excluded.bpm, 0) > 0
+             THEN bpm ELSE excluded.bpm END,
+    key=CASE WHEN key_analyzed AND coalesce(excluded.key, '') = ''
+             THEN key ELSE excluded.key END,
+    bpm_analyzed=bpm_analyzed AND NOT coalesce(excluded.bpm, 0) > 0,
+    key_analyzed=key_analyzed AND coalesce(excluded.key, '') = '',
+    analysis_version=CASE
+      WHEN (bpm_analyzed AND NOT coalesce(excluded.bpm, 0) > 0)
+        OR (key_analyzed AND coalesce(excluded.key, '') = '')
+      THEN analysis_version END,
+    album=excluded.album, genre=excluded.genre, rating=excluded.rating,
+    time=excluded.time, date_added=excluded.date_added, source=excluded.source,
+    updated_at=excluded.updated_at
+  WHERE track_info.source IS NULL OR excluded.source >= track_info.source
+'''
+
+def _file_sha1(path):
+    h = hashlib.sha1()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 16), b""):
+            h.update(block)
+    return h.hexdigest()
+
+def _parse_export(path):
+    """Yield compact track_info row tuples from one Rekordbox UTF-16 TSV export."""
+    # adjust encoding if needed
+    with open(path, newline="", encoding="utf-16") as f:
+        reader = csv.reader(f, delimiter="\t")
+        header = next(reader, [])
+        col = {name: i for i, name in enumerate(header)}
+        fields = [col.get(name) for name in (
+            "Track Title", "Artist", "BPM", "Key", "Album",
+            "Genre", "Rating", "Time", "Date Added",
+        )]
+        for row in reader:
+            vals = [row[i].strip() if i is not None and i < len(row) else ""
+                    for i in fields]
+            if not vals[0] or not vals[1]:
+                continue
+            vals[2] = float(vals[2]) if vals[2] else None
+            yield tuple(vals)
+
+def _seconds(time_str):
+    """'04:38' (or '1:02:05') as seconds, 0.0 if blank or malformed."""
+    try:
+        secs = 0.0
+        for part in time_str.split(":"):
+            secs = secs * 60 + float(part)
+        return secs
+    except ValueError:
+        return 0.0
+
+def read_export(path):
+    """One Rekordbox export as Tracks, in export order (no library ids)."""
+    return [Track(t, a, b, k, duration=_seconds(tm))
+            for t, a, b, k, _, _, _, tm, _ in _parse_export(path)]
+
+def _ingest_file(path, known_sha1=None):
+    """
+    Worker: hash one export and, unless the hash is already known,
+    parse it. Returns (path, sha1, rows or None).
+    """
+    digest = _file_sha1(path)
+    if digest == known_sha1:
+        return path, digest, None
+    return path, digest, list(_parse_export(path))
+
+def _ingest_results(jobs, workers):
+    """Run _ingest_file over jobs, yielding results in job order."""
+    if workers <= 1 or len(jobs) < 2:
+        for job in jobs:
+            yield _ingest_file(*job)
+        return
+    # keep a bounded number of files in flight so memory doesn't grow
+    # with the size of the library
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        todo = iter(jobs)
+        for job in todo:
+            pending.append(pool.submit(_ingest_file, *job))
+            if len(pending) >= 2*workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+def _orphaned_rows(conn, parsed, gone):
+    """
+    {(title, artist) lower-cased: id} of rows whose source export was
+    deleted (gone) or was re-read (parsed: name -> keys) without them.
+    """
+    orphans = {}
+    for name in [*parsed, *gone]:
+        keys = parsed.get(name, ())
+        for i, t, a in conn.execute(
+                'SELECT id, track_title, artist FROM track_info WHERE source = ?', (name,)):
+            key = (t.lower(), a.lower())
+            if key not in keys:
+                orphans[key] = i
+    return orphans
+
+def _resupply_orphans(conn, data_dir, parsed, gone, workers):
+    """
+    Give each orphaned row (see _orphaned_rows) the values of the last
+    export that still lists it, and delete the ones no export lists any
+    more, as a rebuild would. Returns (rows updated, rows deleted).
+    """
+    orphans = _orphaned_rows(conn, parsed, gone)
+    if not orphans:
+        return 0, 0
+    conn.executemany('UPDATE track_info SET source = NULL WHERE id = ?',
+                     [(i,) for i in orphans.values()])
+    jobs = [(p, None) for p in sorted(glob.glob(str(data_dir / "*.txt")))]
+    found = {}
+    for txt_file, _, rows in _ingest_results(jobs, workers):
+        name = os.path.relpath(txt_file, data_dir)
+        for row in rows:
+            key = (row[0].lower(), row[1].lower())
+            if key in orphans:
+                found[key] = (*row, name)
+    updated = conn.executemany(UPSERT_SQL, found.values()).rowcount
+    dropped = [(i,) for key, i in orphans.items() if key not in found]
+    conn.executemany('DELETE FROM track_info WHERE id = ?', dropped)
+    return updated, len(dropped)
+
+def create_track_db(db_path=DB_PATH, data_dir=DATA_DIR, rebuild=False,
+                    workers=None, batch_size=5000):
+    """
+    Ingest the .txt exports in data_dir into SQLite.
+
+    Each export's mtime/size/hash is recorded in ingest_manifest, so only
+    new or changed files are parsed. Parsing fans out over a process pool
+    (`workers`, default one per core); rows are deduped case-insensitively
+    on title+artist and upserted in batches of `batch_size` inside a
+    single transaction. When exports disagree about a track, the last
+    one in file-name order wins, incremental runs included: each row
+    records its source export and is only replaced from that export or
+    a later one. A track its export no longer lists (edited or deleted)
+    falls back to the last export still listing it, or is deleted if
+    none does, so an incremental run ends where rebuild=True would.
+    A legacy DB holding case-variant duplicates keeps only its newest
+    row of each, and the dropped rows are listed. rebuild=True clears
+    the table and manifest and re-reads everything.
+    """
+    db_path, data_dir = Path(db_path), Path(data_dir)
+    if workers is None:
+        workers = os.cpu_count() or 1
     os.makedirs(db_path.parent, exist_ok=True)
     conn = sqlite3.connect(db_path)
-    c = conn.cursor()
-    c.execute('''
-      CREATE TABLE IF NOT EXISTS track_info (
-        id INTEGER PRIMARY KEY,
-        track_title TEXT,
-        artist TEXT,
-        bpm REAL,
-        key TEXT,
-        album TEXT,
-        genre TEXT,
-        rating TEXT,
-        time TEXT,
-        date_added TEXT,
-        UNIQUE(track_title, artist)
-      );
-    ''')
-    c.execute('DELETE FROM track_info;')
-
-    unique = {}
-    for txt_file in glob.glob(str(data_dir / "*.txt")):
-        # adjust encoding if needed
-        with open(txt_file, newline="", encoding="utf-16") as f:
-            reader = csv.DictReader(f, delimiter="\t")
-            for row in reader:
-                title  = row.get("Track Title", "").strip()
-                artist = row.get("Artist", "").strip()
-                if not title or not artist:
-                    continue
-                key_ = (title.lower(), artist.lower())
-                if key_ in unique:
-                    continue
-                unique[key_] = {
-                    "track_title": title,
-                    "artist":      artist,
-                    "bpm":         float(row["BPM"]) if row.get("BPM") else None,
-                    "key":         row.get("Key","").strip(),
-                    "album":       row.get("Album","").strip(),
-                    "genre":       row.get("Genre","").strip(),
-                    "rating":      row.get("Rating","").strip(),
-                    "time":        row.get("Time","").strip(),
-                    "date_added":  row.get("Date Added","").strip()
-                }
-
-    inserted = 0
-    for entry in unique.values():
-        c.execute('''
-          INSERT OR IGNORE INTO track_info
-            (track_title, artist, bpm, key, album, genre, rating, time, date_added)
-          VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-        ''', (
-          entry["track_title"],
-          entry["artist"],
-          entry["bpm"],
-          entry["key"],
-          entry["album"],
-          entry["genre"],
-          entry["rating"],
-          entry["time"],
-          entry["date_added"]
-        ))
-        inserted += c.rowcount
+    migrate(conn)
+    if rebuild:
+        _drop_search_index(conn)
+        conn.executescript('DELETE FROM track_info; DROP TABLE IF EXISTS ingest_manifest;')
+    try:
+        conn.executescript(INGEST_SCHEMA)
+    except sqlite3.IntegrityError:
+        # legacy DB with case-variant duplicates
+        dropped = _drop_case_duplicates(conn)
+        print(f"Removed {len(dropped)} case-variant duplicate tracks from {db_path}:")
+        for title, artist in dropped:
+            print(f"  {artist} - {title}")
+        conn.executescript(INGEST_SCHEMA)
 
-    conn.commit()
+    manifest = {
+        p: (m, sz, h) for p, m, sz, h in
+        conn.execute('SELECT path, mtime, size, sha1 FROM ingest_manifest')
+    }
+
+    seen = set()
+    stats = {}
+    jobs = []
+    for txt_file in sorted(glob.glob(str(data_dir / "*.txt"))):
+        name = os.path.relpath(txt_file, data_dir)
+        seen.add(name)
+        st = os.stat(txt_file)
+        prev = manifest.get(name)
+        if prev and prev[0] == st.st_mtime and prev[1] == st.st_size:
+            continue
+        stats[txt_file] = (name, st.st_mtime, st.st_size)
+        jobs.append((txt_file, prev[2] if prev else None))
+
+    if len(jobs) > _BULK_FILES:
+        # cheaper to rebuild the search index once than to keep it in
+        # sync row by row through the triggers
+        _drop_search_index(conn)
+
+    upserted = 0
+    parsed = {}     # export re-read this run -> the keys it lists
+    with conn:
+        batch = {}
+        for txt_file, digest, rows in _ingest_results(jobs, workers):
+            name, mtime, size = stats[txt_file]
+            conn.execute(
+                'INSERT OR REPLACE INTO ingest_manifest (path, mtime, size, sha1) '
+                'VALUES (?, ?, ?, ?)', (name, mtime, size, digest)
+            )
+            if rows is None:
+                continue    # touched, same content
+            keys = parsed[name] = set()
+            for row in rows:
+                key = (row[0].lower(), row[1].lower())
+                keys.add(key)
+                batch[key] = (*row, name)
+                if len(batch) >= batch_size:
+                    upserted += conn.executemany(UPSERT_SQL, batch.values()).rowcount
+                    batch.clear()
+        upserted += conn.executemany(UPSERT_SQL, batch.values()).rowcount
+        gone = [p for p in manifest if p not in seen]
+        conn.executemany('DELETE FROM ingest_manifest WHERE path = ?', [(p,) for p in gone])
+        if not rebuild:
+            resupplied, dropped = _resupply_orphans(conn, data_dir, parsed, gone, workers)
+            upserted += resupplied
+            if dropped:
+                print(f"Removed {dropped} tracks no export lists any more")
+    _ensure_search_index(conn)
     conn.close()
-    print(f"Inserted {inserted} unique records into {db_path}")
+    print(f"Ingested {len(jobs)} new/changed exports, "
+          f"upserted {upserted} records into {db_path}")
+    return upserted
+
+class TrackDB:
+    """
+    Long-lived access to the track database.
+
+    sqlite3 connections can't be shared between threads, so each thread
+    gets its own connection, opened on first use and then kept. Opening
+    a connection never changes the file: call migrate() once at start-up
+    (the app and the CLIs do) to create missing tables and switch the DB
+    to WAL, so worker-thread reads don't block the UI thread.
+    readonly=True opens every connection with mode=ro.
+    Queries are fixed SQL strings, which the per-connection statement
+    cache keeps prepared.
+    """
+
+    def __init__(self, db_path=DB_PATH, readonly=False):
+        self.db_path = Path(db_path)
+        self.readonly = readonly
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._conns = []
+        self._fts = None
+
+    def connection(self):
+        """This thread's connection."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            if self.readonly:
+                conn = sqlite3.connect(self.db_path.resolve().as_uri() + "?mode=ro",
+                                       uri=True, check_same_thread=False,
+                                       cached_statements=256)
+            else:
+                conn = sqlite3.connect(self.db_path, check_same_thread=False,
+                                       cached_statements=256)
+                conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            with self._lock:
+                self._conns.append(conn)
+        return conn
+
+    def close(self):
+        """Close every connection this instance has opened."""
+        with self._lock:
+            conns, self._conns = self._conns, []
+        for conn in conns:
+            conn.close()
+        self._local = threading.local()
+
+    def migrate(self):
+        """Run migrate() on this DB (see there)."""
+        self._fts = migrate(self.connection())
+
+    def search_tables(self):
+        if self._fts is None:
+            self._fts = _search_tables(self.connection())
+        return self._fts
+
+    def get_track_info(self, title):
+        """Return (bpm, key) for a given track title, or (None, None)."""
+        row = self.connection().execute(
+            'SELECT bpm, key FROM track_info WHERE track_title = ?', (title,)
+        ).fetchone()
+        return row if row else (None, None)
+
+    def get_track_info_many(self, titles):
+        """Return {title: (bpm, key)} for every title found, in a few queries."""
+        titles = list(dict.fromkeys(titles))
+        conn = self.connection()
+        found = {}
+        for i in range(0, len(titles), _MAX_PARAMS):
+            chunk = titles[i:i+_MAX_PARAMS]
+            marks = ",".join("?" * len(chunk))
+            rows = conn.execute(
+                f'SELECT track_title, bpm, key FROM track_info '
+                f'WHERE track_title IN ({marks})', chunk
+            )
+            for t, b, k in rows:
+                found.setdefault(t, (b, k))
+        return found
+
+    def search(self, query, limit=20):
+        """
+        Ranked search over title, artist, album and genre.
+        Titles starting with the query come first, in title order; then
+        tracks where every word of the query prefix-matches a word,
+        bm25-ranked among the newest RANK_CANDIDATES of them; then, if
+        still short of `limit`, substring matches of the whole query.
+        Queries under MIN_QUERY characters return [].
+        Returns Tracks (utils.track) with id, title, artist, bpm and key set.
+        """
+        q = query.strip()
+        words = re.findall(r"\w+", q.lower())
+        if not words or len(q) < MIN_QUERY:
+            return []
+        conn = self.connection()
+        fts = self.search_tables()
+        hits, seen = [], set()
+
+        def add(rows):
+            for i, t, a, b, k in rows:
+                if i not in seen:
+                    seen.add(i)
+                    hits.append(Track(t, a, b, k, id=i))
+
+        def run(table, match, n, weights=None):
+            if weights:
+                # only matches at or above the RANK_CANDIDATES-th newest
+                # rowid are scored; only the best n are joined
+                source = (f'(SELECT rowid, bm25({table}, {weights}) AS score '
+                          f'FROM {table} WHERE {table} MATCH :q AND rowid >= '
+                          f'(SELECT min(rowid) FROM (SELECT rowid FROM {table} '
+                          f'WHERE {table} MATCH :q ORDER BY rowid DESC LIMIT :k)) '
+                          f'ORDER BY score LIMIT :n)')
+                order = 'ORDER BY f.score'
+            else:
+                source = f'(SELECT rowid FROM {table} WHERE {table} MATCH :q LIMIT :n)'
+                order = ''
+            add(conn.execute(
+                f'SELECT t.id, t.track_title, t.artist, t.bpm, t.key '
+                f'FROM {source} AS f JOIN track_info t ON t.id = f.rowid '
+                f'{order}', {"q": match, "n": n, "k": RANK_CANDIDATES}
+            ))
+
+        if "track_fts" in fts:
+            # a walk of idx_track_info_title_nocase; the title equal to
+            # the query sorts before every longer one
+            add(conn.execute(
+                'SELECT id, track_title, artist, bpm, key FROM track_info '
+                'WHERE track_title >= ? COLLATE NOCASE AND track_title < ? COLLATE NOCASE '
+                'ORDER BY track_title COLLATE NOCASE LIMIT ?',
+                (q, q + "\U0010ffff", limit)
+            ))
+        if len(hits) < limit and "track_fts" in fts:
+            run("track_fts", " ".join(_fts_phrase(w) + "*" for w in words),
+                limit, "10.0, 4.0, 1.0, 1.0")
+        if len(hits) < limit and len(q) >= 3 and "track_fts_tri" in fts:
+            # substring hits come unranked, after the ranked prefix hits
+            run("track_fts_tri", _fts_phrase(q), limit + len(hits))
+        if not fts:
+            like = f"%{q.lower()}%"
+            rows = conn.execute(
+                'SELECT id, track_title, artist, bpm, key FROM track_info '
+                'WHERE lower(track_title) LIKE ? OR lower(artist) LIKE ? LIMIT ?',
+                (like, like, limit)
+            )
+            hits = [Track(t, a, b, k, id=i) for i, t, a, b, k in rows]
+        return hits[:limit]
+
+    def get_transition_notes(self, pairs):
+        """
+        Return {(from_uid, to_uid): notes} for every pair that has notes.
+        uids are Track.uid strings (utils.track).
+        """
+        pairs = list(dict.fromkeys(pairs))
+        conn = self.connection()
+        found = {}
+        # two parameters per pair
+        step = _MAX_PARAMS // 2
+        for i in range(0, len(pairs), step):
+            chunk = pairs[i:i+step]
+            marks = ",".join("(?,?)" for _ in chunk)
+            rows = conn.execute(
+                f'SELECT from_uid, to_uid, notes FROM transition_notes '
+                f'WHERE (from_uid, to_uid) IN (VALUES {marks})',
+                [uid for pair in chunk for uid in pair]
+            )
+            for a, b, notes in rows:
+                found[(a, b)] = notes
+        return found
+
+    def put_transition_notes(self, notes):
+        """
+        Save {(from_uid, to_uid): text} in one transaction;
+        empty text deletes the pair's notes.
+        """
+        conn = self.connection()
+        now = time.time()
+        with conn:
+            conn.executemany(
+                'INSERT INTO transition_notes (from_uid, to_uid, notes, updated_at) '
+                'VALUES (?, ?, ?, ?) ON CONFLICT(from_uid, to_uid) DO UPDATE SET '
+                'notes=excluded.notes, updated_at=excluded.updated_at',
+                [(a, b, t, now) for (a, b), t in notes.items() if t]
+            )
+            conn.executemany(
+                'DELETE FROM transition_notes WHERE from_uid = ? AND to_uid = ?',
+                [pair for pair, t in notes.items() if not t]
+            )
+
+    def get_analysis_state(self, tracks):
+        """
+        Return {(title, artist): (bpm, key, analysis_version)} for every
+        (title, artist) pair already in track_info, matched case-insensitively.
+        """
+        conn = self.connection()
+        found = {}
+        for title, artist in dict.fromkeys(tracks):
+            row = conn.execute(
+                'SELECT bpm, key, analysis_version FROM track_info '
+                'WHERE track_title = ? COLLATE NOCASE AND artist = ? COLLATE NOCASE',
+                (title, artist)
+            ).fetchone()
+            if row:
+                found[(title, artist)] = row
+        return found
+
+    def put_analysis(self, results, version):
+        """
+        Save [(title, artist, bpm, key)] from utils.audio_analysis in one
+        transaction, adding tracks that aren't in track_info yet. A BPM
+        or key a Rekordbox export set is kept, each on its own; values
+        from earlier analysis are replaced.
+        """
+        conn = self.connection()
+        with conn:
+            for title, artist, bpm, key in results:
+                cur = conn.execute(
+                    'UPDATE track_info SET '
+                    'bpm = CASE WHEN coalesce(bpm, 0) > 0 AND NOT bpm_analyzed '
+                    '      THEN bpm ELSE ? END, '
+                    "key = CASE WHEN coalesce(key, '') <> '' AND NOT key_analyzed "
+                    '      THEN key ELSE ? END, '
+                    'bpm_analyzed = NOT (coalesce(bpm, 0) > 0 AND NOT bpm_analyzed), '
+                    "key_analyzed = NOT (coalesce(key, '') <> '' AND NOT key_analyzed), "
+                    f'analysis_version = ?, updated_at = {_NOW} '
+                    'WHERE track_title = ? COLLATE NOCASE AND artist = ? COLLATE NOCASE',
+                    (bpm, key, version, title, artist)
+                )
+                if not cur.rowcount:
+                    conn.execute(
+                        'INSERT INTO track_info (track_title, artist, bpm, key, '
+                        'analysis_version, bpm_analyzed, key_analyzed, updated_at) '
+                        f'VALUES (?, ?, ?, ?, ?, 1, 1, {_NOW})',
+                        (title, artist, bpm, key, version)
+                    )
+
+    def get_all_track_titles(self):
+        """Return a list of all track titles in the DB (for autocomplete)."""
+        rows = self.connection().execute('SELECT DISTINCT track_title FROM track_info')
+        return [r[0] for r in rows]
+
+    def get_all_tracks(self):
+        """
+        Return a Track (utils.track) for every track in track_info,
+        with id, title, artist, bpm and key set.
+        """
+        rows = self.connection().execute(
+            'SELECT id, track_title, artist, bpm, key FROM track_info'
+        )
+        return [Track(t, a, b, k, id=i) for (i, t, a, b, k) in rows]
+
+    def get_tracks_changed(self, since=None):
+        """
+        Tracks that ingest or analysis added or updated after the
+        watermark `since` (all tracks if None), like get_all_tracks(),
+        and the watermark to pass next time: the (updated_at, id) of the
+        newest row, so rows stamped in the same instant are told apart.
+        A track updated again comes back again; callers dedupe by uid.
+        """
+        conn = self.connection()
+        # read the watermark first, so a row written meanwhile comes back next time
+        mark = conn.execute(
+            'SELECT updated_at, id FROM track_info WHERE updated_at IS NOT NULL '
+            'ORDER BY updated_at DESC, id DESC LIMIT 1'
+        ).fetchone() or (0.0, 0)
+        if since is None:
+            return self.get_all_tracks(), mark
+        rows = conn.execute(
+            'SELECT id, track_title, artist, bpm, key FROM track_info '
+            'WHERE (updated_at, id) > (?, ?)', tuple(since)
+        )
+        return [Track(t, a, b, k, id=i) for (i, t, a, b, k) in rows], mark
+
+_dbs = {}
+_dbs_lock = threading.Lock()
+
+def get_db(db_path=DB_PATH):
+    """Shared TrackDB for db_path."""
+    path = Path(db_path).resolve()
+    with _dbs_lock:
+        db = _dbs.get(path)
+        if db is None:
+            db = _dbs[path] = TrackDB(path)
+        return db
 
 def get_track_info(title, db_path=DB_PATH):
     """Return (bpm, key) for a given track title, or (None, None)."""
-    conn = sqlite3.connect(db_path)
-    c = conn.cursor()
-    c.execute('SELECT bpm, key FROM track_info WHERE track_title = ?', (title,))
-    row = c.fetchone()
-    conn.close()
-    if row:
-        return row
-    return (None, None)
+    return get_db(db_path).get_track_info(title)
 
 def get_all_track_titles(db_path=DB_PATH):
     """Return a list of all track titles in the DB (for autocomplete)."""
-    conn = sqlite3.connect(db_path)
-    c = conn.cursor()
-    c.execute('SELECT DISTINCT track_title FROM track_info')
-    rows = c.fetchall()
-    conn.close()
-    return [r[0] for r in rows]
+    return get_db(db_path).get_all_track_titles()
 
 def get_all_tracks(db_path=DB_PATH):
     """
-    Return a list of dicts for every track in track_info,
-    with keys: title, artist, bpm, key.
+    Return a Track (utils.track) for every track in track_info,
+    with id, title, artist, bpm and key set.
     """
-    conn = sqlite3.connect(db_path)
-    c = conn.cursor()
-    c.execute('SELECT track_title, artist, bpm, key FROM track_info')
-    rows = c.fetchall()
-    conn.close()
-    return [
-        {"title": t, "artist": a, "bpm": b or 0, "key": k or ""}
-        for (t, a, b, k) in rows
-    ]
+    return get_db(db_path).get_all_tracks()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,135 @@
+# utils/track_index.py
+
+import re
+import unicodedata
+from collections import defaultdict
+from typing import TYPE_CHECKING, List, Optional
+
+if TYPE_CHECKING:
+    from utils.track import Track
+
+# "(Extended Mix)", "[Original Mix]", "- Radio Edit", "(Clean)" ...
+_VERSION_WORDS = r"(?:extended|original|radio|club|short|clean|dirty|explicit)"
+_VERSION = re.compile(
+    rf"\s*(?:[\(\[]\s*{_VERSION_WORDS}(?:\s+(?:mix|edit|version))?\s*[\)\]]"
+    rf"|\s-\s*{_VERSION_WORDS}(?:\s+(?:mix|edit|version))?\s*$)",
+    re.IGNORECASE,
+)
+_APOSTROPHE = re.compile(r"['’`]")
+_NON_WORD = re.compile(r"[^\w]+")
+
+
+def normalize(text: str) -> str:
+    """
+    Lower-case, strip accents, version suffixes ("Extended Mix" etc.)
+    and punctuation, so spelling variants of a title compare equal.
+    """
+    if not text:
+        return ""
+    text = _VERSION.sub("", text)
+    if not text.isascii():
+        text = unicodedata.normalize("NFKD", text)
+        text = "".join(ch for ch in text if not unicodedata.combining(ch))
+    text = _APOSTROPHE.sub("", text.lower()).replace("&", " and ")
+    return " ".join(_NON_WORD.sub(" ", text).split())
+
+
+def title_keys(title: str) -> List[str]:
+    """
+    Normalized keys for a title: the whole title and, for
+    "Artist - Title" style names, the part after the artist.
+    """
+    keys = [normalize(title)]
+    if " - " in (title or ""):
+        bare = normalize(title.split(" - ", 1)[1])
+        if bare and bare != keys[0]:
+            keys.append(bare)
+    return [k for k in keys if k]
+
+
+class TrackIndex:
+    """
+    Lookup index over the library, built once from get_all_tracks().
+
+    Lookups try the literal (title, artist) first, then hash maps on
+    normalized (title, artist) and normalized title; anything else falls
+    back to a token index scored by token overlap.
+    """
+
+    def __init__(self, tracks: List["Track"], min_score: float = 0.6):
+        self.tracks = tracks
+        self.min_score = min_score
+        self._exact = {}
+        self._by_title_artist = {}
+        self._by_title = defaultdict(list)
+        self._postings = defaultdict(list)
+        self._tokens = []
+        self._artist_tokens = []
+
+        for i, t in enumerate(tracks):
+            self._exact.setdefault((t.title.lower(), t.artist.lower()), i)
+            # the Track keeps its normalized keys, so they aren't
+            # computed (or stored) twice
+            artist = t.artist_norm
+            keys = t.title_keys
+            for k in keys:
+                self._by_title_artist.setdefault((k, artist), i)
+                self._by_title[k].append(i)
+            toks = frozenset(" ".join(keys).split())
+            self._tokens.append(toks)
+            self._artist_tokens.append(frozenset(artist.split()))
+            for tok in toks:
+                self._postings[tok].append(i)
+
+    def __len__(self):
+        return len(self.tracks)
+
+    def match(self, title: str, artist: str = "") -> Optional["Track"]:
+        """Best library track for a (title, artist) pair, or None."""
+        i = self.match_index(title, artist)
+        return None if i is None else self.tracks[i]
+
+    def match_index(self, title: str, artist: str = "") -> Optional[int]:
+        i = self._exact.get(((title or "").lower(), (artist or "").lower()))
+        if i is not None:
+            return i
+        keys = title_keys(title)
+        if not keys:
+            return None
+        artist_n = normalize(artist)
+
+        for k in keys:
+            i = self._by_title_artist.get((k, artist_n))
+            if i is not None:
+                return i
+
+        artist_toks = set(artist_n.split())
+        for k in keys:
+            hits = self._by_title.get(k)
+            if hits:
+                return self._prefer_artist(hits, artist_toks)
+
+        return self._fuzzy(set(" ".join(keys).split()), artist_toks)
+
+    def _prefer_artist(self, hits, artist_toks):
+        if len(hits) == 1 or not artist_toks:
+            return hits[0]
+        return max(hits, key=lambda i: len(artist_toks & self._artist_tokens[i]))
+
+    def _fuzzy(self, toks, artist_toks):
+        # candidates share at least one of the query's two rarest tokens
+        known = sorted((t for t in toks if t in self._postings),
+                       key=lambda t: len(self._postings[t]))
+        if not known:
+            return None
+        cands = set(self._postings[known[0]])
+        if len(known) > 1:
+            cands.update(self._postings[known[1]])
+
+        def score(i):
+            lib = self._tokens[i]
+            return (len(toks & lib) / len(toks | lib),
+                    len(artist_toks & self._artist_tokens[i]))
+
+        best = max(cands, key=score)
+        return best if score(best)[0] >= self.min_score else None
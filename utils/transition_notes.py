@@ -0,0 +1,163 @@
+# utils/transition_notes.py
+"""
+Transition notes, persisted in the track DB's transition_notes table.
+
+NotesStore answers reads from memory and hands writes to a background
+thread, which waits for typing to pause (or DEBOUNCE_MAX to pass) and
+then saves everything pending in one transaction, so repeated edits of
+the same note collapse into one write.
+"""
+
+import sqlite3
+import threading
+import time
+
+# a pause in typing this long triggers a write...
+DEBOUNCE = 0.5
+# ...and notes are never left unsaved for longer than this
+DEBOUNCE_MAX = 3.0
+
+
+def transition_key(a, b):
+    """The notes key for going from Track a to Track b."""
+    return a.uid, b.uid
+
+
+class NotesStore:
+    """
+    Notes per (from_uid, to_uid) pair for a TrackDB. get/set/prefetch
+    are meant for the UI thread; only get() misses and the writer
+    thread touch the DB.
+    """
+
+    def __init__(self, db, debounce=DEBOUNCE, debounce_max=DEBOUNCE_MAX):
+        self.db = db
+        self.debounce = debounce
+        self.debounce_max = debounce_max
+        self.writes = 0             # transactions committed, for benchmarks
+        self._notes = {}            # pair -> text, everything loaded or typed
+        self._pending = {}          # pair -> text not yet written
+        self._to_load = []          # pairs to prefetch
+        self._first_dirty = None    # when _pending became non-empty
+        self._last_set = 0.0
+        self._flushing = False
+        self._closed = False
+        self._cond = threading.Condition()
+        self._thread = threading.Thread(target=self._run, name="notes-writer",
+                                        daemon=True)
+        self._thread.start()
+
+    def get(self, pair):
+        """Notes for pair ("" if none); read through if not prefetched."""
+        with self._cond:
+            if pair in self._notes:
+                return self._notes[pair]
+        text = self.db.get_transition_notes([pair]).get(pair, "")
+        with self._cond:
+            return self._notes.setdefault(pair, text)
+
+    def set(self, pair, text):
+        """Record notes for pair; written once typing pauses."""
+        with self._cond:
+            if self._notes.get(pair) == text:
+                return
+            self._notes[pair] = text
+            self._pending[pair] = text
+            self._last_set = time.monotonic()
+            if self._first_dirty is None:
+                # later keystrokes don't wake the writer: it re-checks
+                # _last_set when its debounce wait runs out
+                self._first_dirty = self._last_set
+                self._cond.notify()
+
+    def preload(self, notes):
+        """Take notes known from elsewhere (a session snapshot) as loaded."""
+        with self._cond:
+            for pair, text in notes.items():
+                self._notes.setdefault(pair, text)
+
+    def cached(self, pairs):
+        """Notes for pairs that are in memory, without touching the DB."""
+        with self._cond:
+            return {p: self._notes[p] for p in pairs if self._notes.get(p)}
+
+    def prefetch(self, pairs):
+        """Load notes for pairs on the writer thread, ahead of get()."""
+        with self._cond:
+            todo = [p for p in pairs if p not in self._notes]
+            if todo:
+                self._to_load.extend(todo)
+                self._cond.notify()
+
+    def flush(self):
+        """Write everything pending now and wait until it is saved."""
+        with self._cond:
+            self._flushing = True
+            self._cond.notify()
+            while self._flushing and self._thread.is_alive():
+                self._cond.wait(0.1)
+
+    def close(self):
+        self.flush()
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        self._thread.join()
+
+    # --- Writer thread ---
+
+    def _due(self, now):
+        if self._flushing or self._closed:
+            return True
+        return (now - self._last_set >= self.debounce
+                or now - self._first_dirty >= self.debounce_max)
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while True:
+                    if self._to_load:
+                        break
+                    if self._pending and self._due(time.monotonic()):
+                        break
+                    if self._flushing and not self._pending:
+                        self._flushing = False
+                        self._cond.notify_all()
+                        continue
+                    if self._closed:
+                        return
+                    if self._pending:
+                        now = time.monotonic()
+                        self._cond.wait(min(self._last_set + self.debounce,
+                                            self._first_dirty + self.debounce_max) - now)
+                    else:
+                        self._cond.wait()
+                to_load, self._to_load = self._to_load, []
+                pending = {}
+                if self._pending and self._due(time.monotonic()):
+                    pending, self._pending = self._pending, {}
+                    self._first_dirty = None
+
+            if to_load:
+                loaded = self.db.get_transition_notes(to_load)
+                with self._cond:
+                    for pair in to_load:
+                        # anything typed meanwhile wins over the DB copy
+                        self._notes.setdefault(pair, loaded.get(pair, ""))
+            if pending:
+                try:
+                    self.db.put_transition_notes(pending)
+                except sqlite3.Error as e:
+                    print(f"Could not save transition notes: {e}")
+                    with self._cond:
+                        # retry later; anything typed since is newer
+                        self._pending = {**pending, **self._pending}
+                        self._first_dirty = self._last_set = time.monotonic()
+                        self._flushing = False
+                        self._cond.notify_all()
+                        if self._closed:
+                            return
+                    continue
+                with self._cond:
+                    self.writes += 1
+                    self._cond.notify_all()
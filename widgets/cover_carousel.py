@@ -5,18 +5,30 @@ from PySide6.QtWidgets import (
     QSizePolicy, QScrollArea
 )
 from PySide6.QtCore import Qt, QPropertyAnimation, Signal
-from PySide6.QtGui import QPixmap, QFont
-import requests
+from PySide6.QtGui import QFont
+
+from widgets.thumbnail_loader import ThumbnailLoader, scale_pixmap
 
 NEON_GREEN = "#39FF14"
+COVER_SMALL = 160
+COVER_LARGE = 240
+ITEM_WIDTH = 200
 
 class CarouselItem(QWidget):
     """
     A cover + metadata widget for a single track.
-    If no thumbnail URL is provided, shows a neon-green placeholder.
+    Shows a neon-green placeholder until the cover has been loaded
+    (or for good, if no thumbnail URL is provided).
     """
-    def __init__(self, data, parent=None):
+    def __init__(self, data, loader=None, parent=None):
         super().__init__(parent)
+        self.loader = loader
+        self.data = None
+        self.thumb = None
+        self.pixmap = None
+        self.cover_size = COVER_SMALL
+        self._scaled = {}   # size -> scaled copy of self.pixmap
+
         layout = QVBoxLayout(self)
         layout.setContentsMargins(5,5,5,5)
         layout.setSpacing(8)
@@ -28,64 +40,129 @@ class CarouselItem(QWidget):
         # --- Cover or placeholder ---
         self.label_img = QLabel()
         self.label_img.setAlignment(Qt.AlignCenter)
-        thumb = data.get("thumbnail")
-        if thumb:
-            self.pixmap = QPixmap()
-            try:
-                resp = requests.get(thumb, timeout=5)
-                self.pixmap.loadFromData(resp.content)
-            except Exception:
-                self.pixmap = QPixmap()
-            self.label_img.setPixmap(
-                self.pixmap.scaled(160,160, Qt.KeepAspectRatio, Qt.SmoothTransformation)
-            )
-            self.label_img.setFixedSize(160,160)
-            self.label_img.setStyleSheet("background: transparent;")
-        else:
-            self.pixmap = None
-            self.label_img.setFixedSize(160,160)
-            self.label_img.setStyleSheet(
-                f"background-color: {NEON_GREEN}; border-radius: 8px;"
-            )
+        self.label_img.setFixedSize(160,160)
+        self.label_img.setStyleSheet(
+            f"background-color: {NEON_GREEN}; border-radius: 8px;"
+        )
         layout.addWidget(self.label_img, alignment=Qt.AlignHCenter)
 
         # --- Title ---
-        lbl = QLabel(data.get("title",""))
-        lbl.setFont(QFont("Arial",16, QFont.Bold))
-        lbl.setWordWrap(True)
-        lbl.setAlignment(Qt.AlignCenter)
-        lbl.setMaximumWidth(200)
-        layout.addWidget(lbl)
+        self.lbl_title = QLabel()
+        self.lbl_title.setFont(QFont("Arial",16, QFont.Bold))
+        self.lbl_title.setWordWrap(True)
+        self.lbl_title.setAlignment(Qt.AlignCenter)
+        self.lbl_title.setMaximumWidth(200)
+        layout.addWidget(self.lbl_title)
 
         # --- Artist ---
-        lbl2 = QLabel(data.get("artist",""))
-        lbl2.setFont(QFont("Arial",14))
-        lbl2.setWordWrap(True)
-        lbl2.setAlignment(Qt.AlignCenter)
-        lbl2.setMaximumWidth(200)
-        layout.addWidget(lbl2)
+        self.lbl_artist = QLabel()
+        self.lbl_artist.setFont(QFont("Arial",14))
+        self.lbl_artist.setWordWrap(True)
+        self.lbl_artist.setAlignment(Qt.AlignCenter)
+        self.lbl_artist.setMaximumWidth(200)
+        layout.addWidget(self.lbl_artist)
 
         # --- BPM & Key ---
-        meta = QLabel(f"{data.get('bpm')} BPM | {data.get('key')}")
-        meta.setFont(QFont("Arial",14, QFont.Bold))
-        meta.setWordWrap(True)
-        meta.setAlignment(Qt.AlignCenter)
-        meta.setMaximumWidth(200)
-        layout.addWidget(meta)
+        self.lbl_meta = QLabel()
+        self.lbl_meta.setFont(QFont("Arial",14, QFont.Bold))
+        self.lbl_meta.setWordWrap(True)
+        self.lbl_meta.setAlignment(Qt.AlignCenter)
+        self.lbl_meta.setMaximumWidth(200)
+        layout.addWidget(self.lbl_meta)
+
+        self.set_data(data)
+
+    def set_data(self, data):
+        """Bind this widget to a track, reusing the cover if it is unchanged."""
+        self.data = data
+        self.lbl_title.setText(data.title)
+        self.lbl_artist.setText(data.artist)
+        self.lbl_meta.setText(f"{data.bpm} BPM | {data.key}")
+
+        thumb = data.thumbnail
+        if thumb == self.thumb:
+            return
+        loader = self.loader or ThumbnailLoader.instance()
+        if self.thumb:
+            loader.cancel(self.thumb, self.set_cover)
+        self.thumb = thumb
+        self.pixmap = None
+        self._scaled = {}
+        self.label_img.clear()
+        self.label_img.setStyleSheet(
+            f"background-color: {NEON_GREEN}; border-radius: 8px;"
+        )
+        # cover arrives asynchronously; placeholder shows until then
+        if thumb:
+            pm = loader.get(thumb, self.set_cover)
+            if pm is not None:
+                self.set_cover(pm)
+
+    def set_cover(self, pixmap):
+        """Swap the placeholder for a loaded cover."""
+        if pixmap.isNull():
+            return
+        self.pixmap = pixmap
+        self._scaled = {}
+        self.label_img.setPixmap(self._scaled_to(self.cover_size))
+        self.label_img.setStyleSheet("background: transparent;")
+
+    def set_size(self, size):
+        """Resize the cover square (COVER_SMALL or COVER_LARGE)."""
+        if size == self.cover_size:
+            return
+        self.cover_size = size
+        if self.pixmap is not None:
+            self.label_img.setPixmap(self._scaled_to(size))
+        self.label_img.setFixedSize(size, size)
+
+    def _scaled_to(self, size):
+        pm = self._scaled.get(size)
+        if pm is None:
+            loader = self.loader or ThumbnailLoader.instance()
+            pm = loader.scaled(self.thumb, size)
+            if pm is None:
+                pm = scale_pixmap(self.pixmap, size)
+            self._scaled[size] = pm
+        return pm
+
+
+def track_identity(data):
+    """Key used to match carousel widgets to tracks across updates."""
+    return (data.title, data.artist)
 
 
 class CoverCarousel(QWidget):
     """
     Horizontal carousel that highlights current+next tracks.
     Emits indexChanged(int) whenever current track moves.
+
+    With virtual=True only a window of widgets around the current track
+    exists (the visible covers plus `buffer` on each side). Widgets are
+    recycled as focus moves and fixed-width spacers stand in for the
+    rest of the set, so the cost of Next/Previous does not grow with
+    the number of tracks.
     """
     indexChanged = Signal(int)
 
-    def __init__(self, items, parent=None):
+    def __init__(self, items, loader=None, virtual=False, visible=6,
+                 buffer=2, parent=None):
         super().__init__(parent)
-        self.items = items
+        # own copy, so callers can mutate their list and then
+        # report the change through insert_item/remove_item/move_item
+        self.items = list(items)
+        self.loader = loader
+        self.virtual = virtual
         self.current_index = 0
 
+        # window of items that currently have widgets: [_lo, _hi)
+        self._half = visible//2 + buffer
+        self._lo = 0
+        self._hi = 0
+        self._dirty = True
+        # widgets currently drawn at COVER_LARGE
+        self._focused = []
+
         # transparent background
         self.setStyleSheet("background: transparent;")
 
@@ -103,10 +180,7 @@ class CoverCarousel(QWidget):
         self.h_layout.setContentsMargins(20,20,20,20)
         self.h_layout.setSpacing(40)
 
-        # populate
-        for d in items:
-            self.h_layout.addWidget(CarouselItem(d))
-
+        self._populate()
         self.scroll.setWidget(self.container)
 
         # main layout
@@ -122,19 +196,136 @@ class CoverCarousel(QWidget):
         # initial focus
         self.update_focus()
 
+    def _populate(self):
+        if self.virtual:
+            self._lead = QWidget()
+            self._trail = QWidget()
+            self.h_layout.addWidget(self._lead)
+            self.h_layout.addWidget(self._trail)
+        else:
+            for d in self.items:
+                self.h_layout.addWidget(CarouselItem(d, self.loader))
+            self._hi = len(self.items)
+
+    def set_virtual(self, virtual):
+        """
+        Switch between one widget per track and the recycled window,
+        e.g. once a playlist that started out empty turns out to be long.
+        """
+        if virtual == self.virtual:
+            return
+        while self.h_layout.count():
+            self._discard(self.h_layout.takeAt(0).widget())
+        self._focused = []
+        self.virtual = virtual
+        self._lo = self._hi = 0
+        self._dirty = True
+        self._populate()
+        self.update_focus()
+
+    def widget_at(self, index):
+        """The CarouselItem showing items[index], or None if it has none."""
+        if not self._lo <= index < self._hi:
+            return None
+        offset = 1 if self.virtual else 0
+        return self.h_layout.itemAt(index - self._lo + offset).widget()
+
     def set_items(self, items):
-        """Replace carousel contents and re-focus."""
-        self.items = items
-        # clear
-        for i in reversed(range(self.h_layout.count())):
-            w = self.h_layout.takeAt(i).widget()
-            if w:
-                w.setParent(None)
-        # add new
+        """
+        Replace carousel contents and re-focus.
+        Widgets are reused for tracks that are still present, so only
+        genuinely new tracks cost a construction.
+        """
+        if self.virtual:
+            self.items = list(items)
+            self._dirty = True
+            self.current_index = max(0, min(self.current_index, len(items)-1))
+            self.update_focus()
+            return
+
+        spare = {}
+        for i in range(self.h_layout.count()):
+            w = self.h_layout.itemAt(i).widget()
+            spare.setdefault(track_identity(w.data), []).append(w)
+
+        widgets = []
         for d in items:
-            self.h_layout.addWidget(CarouselItem(d))
+            reuse = spare.get(track_identity(d))
+            if reuse:
+                w = reuse.pop(0)
+                if w.data is not d:
+                    w.set_data(d)
+            else:
+                w = CarouselItem(d, self.loader)
+            widgets.append(w)
+
+        # re-lay out in the new order, dropping leftovers
+        while self.h_layout.count():
+            self.h_layout.takeAt(0)
+        for leftover in spare.values():
+            for w in leftover:
+                self._discard(w)
+        for w in widgets:
+            self.h_layout.addWidget(w)
+
+        self.items = list(items)
+        self._hi = len(self.items)
         # clamp index
-        self.current_index = min(self.current_index, len(items)-1)
+        self.current_index = max(0, min(self.current_index, len(items)-1))
+        self.update_focus()
+
+    def insert_item(self, index, data):
+        """Insert one track at index; the current track stays current."""
+        self.items.insert(index, data)
+        if self.virtual:
+            self._dirty = True
+        else:
+            self.h_layout.insertWidget(index, CarouselItem(data, self.loader))
+            self._hi += 1
+        if index <= self.current_index and len(self.items) > 1:
+            self.current_index += 1
+            self.indexChanged.emit(self.current_index)
+        self.update_focus()
+
+    def remove_item(self, index):
+        """Remove the track at index."""
+        del self.items[index]
+        if self.virtual:
+            self._dirty = True
+        else:
+            self._discard(self.h_layout.takeAt(index).widget())
+            self._hi -= 1
+        old = self.current_index
+        if index < old:
+            self.current_index -= 1
+        elif old >= len(self.items) > 0:
+            self.current_index = len(self.items)-1
+        # the current track changed if it shifted or was the one removed
+        if index <= old and self.items:
+            self.indexChanged.emit(self.current_index)
+        self.update_focus()
+
+    def move_item(self, src, dst):
+        """Move the track at src to dst, following the current track."""
+        if src == dst:
+            return
+        self.items.insert(dst, self.items.pop(src))
+        if self.virtual:
+            self._dirty = True
+        else:
+            w = self.h_layout.takeAt(src).widget()
+            self.h_layout.insertWidget(dst, w)
+
+        curr = self.current_index
+        if curr == src:
+            curr = dst
+        elif src < curr <= dst:
+            curr -= 1
+        elif dst <= curr < src:
+            curr += 1
+        if curr != self.current_index:
+            self.current_index = curr
+            self.indexChanged.emit(curr)
         self.update_focus()
 
     def next(self):
@@ -149,25 +340,89 @@ class CoverCarousel(QWidget):
             self.update_focus()
             self.indexChanged.emit(self.current_index)
 
+    def _discard(self, w):
+        if w in self._focused:
+            self._focused.remove(w)
+        w.setParent(None)
+        w.deleteLater()
+
+    def _sync_window(self):
+        """Slide the widget window so it surrounds current_index."""
+        n = len(self.items)
+        size = min(n, 2*self._half + 2)
+        lo = max(0, min(self.current_index - self._half, n - size))
+        hi = lo + size
+        shift = lo - self._lo
+
+        if not self._dirty and shift == 0 and hi == self._hi:
+            return
+
+        if not self._dirty and 0 < abs(shift) < size and hi - lo == self._hi - self._lo:
+            # recycle the widgets that scrolled out on the far side
+            for _ in range(abs(shift)):
+                if shift > 0:
+                    w = self.h_layout.takeAt(1).widget()
+                    self.h_layout.insertWidget(self.h_layout.count()-1, w)
+                    w.set_data(self.items[self._hi])
+                    self._lo += 1
+                    self._hi += 1
+                else:
+                    w = self.h_layout.takeAt(self.h_layout.count()-2).widget()
+                    self.h_layout.insertWidget(1, w)
+                    self._lo -= 1
+                    self._hi -= 1
+                    w.set_data(self.items[self._lo])
+        else:
+            # resize the pool, then rebind every widget
+            count = self.h_layout.count() - 2
+            while count < size:
+                w = CarouselItem(self.items[lo + count], self.loader)
+                w.setFixedWidth(ITEM_WIDTH)
+                self.h_layout.insertWidget(count + 1, w)
+                count += 1
+            while count > size:
+                self._discard(self.h_layout.takeAt(count).widget())
+                count -= 1
+            self._lo, self._hi = lo, hi
+            for i in range(lo, hi):
+                w = self.widget_at(i)
+                if w.data is not self.items[i]:
+                    w.set_data(self.items[i])
+            self._dirty = False
+
+        # spacers keep the scroll geometry of the full set
+        slot = ITEM_WIDTH + self.h_layout.spacing()
+        for spacer, n_off in ((self._lead, lo), (self._trail, n - hi)):
+            spacer.setVisible(n_off > 0)
+            spacer.setFixedWidth(max(0, n_off*slot - self.h_layout.spacing()))
+
     def update_focus(self):
-        count = self.h_layout.count()
+        if self.virtual:
+            self._sync_window()
+        count = len(self.items)
+        if not count:
+            return
         curr = self.current_index
         nxt = curr+1 if curr+1<count else curr
 
-        # resize covers
-        for i in range(count):
-            item = self.h_layout.itemAt(i).widget()
-            size = 240 if i in (curr,nxt) else 160
-            if item.pixmap:
-                item.label_img.setPixmap(
-                    item.pixmap.scaled(size,size, Qt.KeepAspectRatio, Qt.SmoothTransformation)
-                )
-            item.label_img.setFixedSize(size, size)
+        # resize covers: only the old and new focused pair change size
+        focused = [self.widget_at(curr), self.widget_at(nxt)]
+        for w in self._focused:
+            if w not in focused:
+                w.set_size(COVER_SMALL)
+        for w in focused:
+            w.set_size(COVER_LARGE)
+        self._focused = focused
 
         # center current+next
-        w1 = self.h_layout.itemAt(curr).widget()
-        w2 = self.h_layout.itemAt(nxt).widget()
-        mid = (w1.x() + w2.x() + w2.width())/2
+        if self.virtual:
+            slot = ITEM_WIDTH + self.h_layout.spacing()
+            left = self.h_layout.contentsMargins().left()
+            mid = left + (curr*slot + nxt*slot + ITEM_WIDTH)/2
+        else:
+            w1 = self.widget_at(curr)
+            w2 = self.widget_at(nxt)
+            mid = (w1.x() + w2.x() + w2.width())/2
         vpw = self.scroll.viewport().width()
         tgt = int(mid - vpw/2)
 
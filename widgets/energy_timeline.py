@@ -0,0 +1,277 @@
+# widgets/energy_timeline.py
+
+from PySide6.QtWidgets import QWidget, QSizePolicy
+from PySide6.QtCore import Qt, QLineF, QPointF, QRect, QRectF
+from PySide6.QtGui import QColor, QFont, QImage, QPainter, QPen, QPixmap, QTransform
+import numpy as np
+
+from utils.camelot import RELATION, UNKNOWN
+
+NEON_GREEN = "#39FF14"
+CLASH_RED = "#FF3B3B"
+TARGET_GREY = "#B0B0B0"
+MARGIN_LEFT = 44
+MARGIN_RIGHT = 12
+MARGIN_TOP = 12
+KEY_STRIP = 8       # height of the per-track key colour strip
+AXIS_SPACE = 18     # room under the strip for the axis labels
+
+
+def key_color(code):
+    """Camelot wheel colour: hue by number, lighter for B (major) keys."""
+    if code == UNKNOWN:
+        return QColor(90, 90, 90)
+    return QColor.fromHsv((code // 2) * 30, 200, 255 if code % 2 else 190)
+
+
+KEY_RGB = np.array([key_color(c).rgb() for c in range(UNKNOWN + 1)], dtype=np.uint32)
+
+
+class EnergyTimeline(QWidget):
+    """
+    BPM curve of the set with a key strip underneath, key-clash
+    transitions in red and a marker on the current track. set_target()
+    overlays a planned curve (utils.set_planner) as a dashed line.
+
+    The curve, strip and clash marks are painted once into a cached
+    pixmap that is rebuilt only after the set changes; insert, remove
+    and move only touch the changed points and the transitions next to
+    them. Moving the current track repaints just the old and new marker.
+    """
+
+    def __init__(self, tracks=(), parent=None):
+        super().__init__(parent)
+        self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Fixed)
+        self.setMinimumHeight(160)
+        self.current_index = 0
+        self._bpm = []
+        self._codes = []
+        self._clash = []        # _clash[i]: transition i -> i+1 is a key clash
+        self._target = None     # target BPM per position (NaN: none), or None
+        self._cache = None      # static layer, None when stale
+        self.set_tracks(tracks)
+
+    # --- Data ---
+
+    def set_tracks(self, tracks):
+        self._bpm = [t.bpm for t in tracks]
+        self._target = None
+        self._codes = [t.key_code for t in tracks]
+        self._clash = [self._is_clash(i) for i in range(len(self._bpm) - 1)]
+        self.current_index = max(0, min(self.current_index, len(self._bpm) - 1))
+        self._invalidate()
+
+    def insert_track(self, index, track):
+        """Insert one point; the current track stays current."""
+        self._insert(index, track.bpm, track.key_code)
+        self._target = None
+        if index <= self.current_index and len(self._bpm) > 1:
+            self.current_index += 1
+        self._invalidate()
+
+    def remove_track(self, index):
+        self._remove(index)
+        self._target = None
+        if index < self.current_index:
+            self.current_index -= 1
+        self.current_index = max(0, min(self.current_index, len(self._bpm) - 1))
+        self._invalidate()
+
+    def move_track(self, src, dst):
+        """Move the point at src so it ends up at dst."""
+        if src == dst:
+            return
+        bpm, code = self._bpm[src], self._codes[src]
+        self._remove(src)
+        self._insert(dst, bpm, code)
+        curr = self.current_index
+        if curr == src:
+            self.current_index = dst
+        elif src < curr <= dst:
+            self.current_index = curr - 1
+        elif dst <= curr < src:
+            self.current_index = curr + 1
+        self._invalidate()
+
+    def set_target(self, targets):
+        """
+        Target BPM per track position, drawn dashed behind the curve;
+        NaN leaves a position out. Cleared by set_tracks and by inserts
+        and removals, which shift the positions it was planned for.
+        """
+        self._target = np.asarray(targets, dtype=np.float64) if targets is not None else None
+        self._invalidate()
+
+    def set_current(self, index):
+        """Move the marker, repainting only where it was and where it goes."""
+        if index == self.current_index:
+            return
+        old = self._marker_rect(self.current_index)
+        self.current_index = index
+        self.update(old)
+        self.update(self._marker_rect(index))
+
+    def clash_count(self):
+        return sum(self._clash)
+
+    def _is_clash(self, i):
+        return RELATION[self._codes[i]][self._codes[i + 1]] == "clash"
+
+    def _insert(self, index, bpm, code):
+        self._bpm.insert(index, bpm)
+        self._codes.insert(index, code)
+        # the transition into index is replaced by the (up to) two around it
+        lo = max(index - 1, 0)
+        self._clash[lo:index] = [
+            self._is_clash(j) for j in range(lo, min(index + 1, len(self._bpm) - 1))
+        ]
+
+    def _remove(self, index):
+        del self._bpm[index]
+        del self._codes[index]
+        # the (up to) two transitions around index become one
+        lo = max(index - 1, 0)
+        self._clash[lo:index + 1] = [
+            self._is_clash(j) for j in range(lo, min(index, len(self._bpm) - 1))
+        ]
+
+    def _invalidate(self):
+        self._cache = None
+        self.update()
+
+    # --- Geometry ---
+
+    def _plot_rect(self):
+        return QRectF(MARGIN_LEFT, MARGIN_TOP,
+                      max(1, self.width() - MARGIN_LEFT - MARGIN_RIGHT),
+                      max(1, self.height() - MARGIN_TOP - KEY_STRIP - AXIS_SPACE))
+
+    def _bpm_range(self):
+        known = [b for b in self._bpm if b > 0]
+        if self._target is not None:
+            known += [b for b in self._target if b > 0]
+        if not known:
+            return 100.0, 140.0
+        lo, hi = min(known), max(known)
+        pad = max(2.0, (hi - lo) * 0.1)
+        return lo - pad, hi + pad
+
+    def _x(self, i, rect):
+        n = len(self._bpm)
+        step = rect.width() / max(n - 1, 1)
+        return rect.left() + i * step
+
+    def _transform(self, rect):
+        # data space (track index, BPM) -> widget pixels
+        lo, hi = self._bpm_range()
+        n = len(self._bpm)
+        sx = rect.width() / max(n - 1, 1)
+        sy = rect.height() / (hi - lo)
+        return QTransform(sx, 0, 0, -sy, rect.left(), rect.bottom() + lo * sy)
+
+    def _marker_rect(self, i):
+        rect = self._plot_rect()
+        x = self._x(i, rect)
+        step = rect.width() / max(len(self._bpm) - 1, 1)
+        return QRect(int(x - 6), 0, int(step + 14), self.height())
+
+    # --- Painting ---
+
+    def resizeEvent(self, event):
+        self._cache = None
+        super().resizeEvent(event)
+
+    def paintEvent(self, event):
+        if self._cache is None or self._cache.size() != self.size():
+            self._cache = self._render_static()
+        p = QPainter(self)
+        p.drawPixmap(event.rect(), self._cache, event.rect())
+        self._paint_marker(p)
+        p.end()
+
+    def _render_static(self):
+        pm = QPixmap(self.size())
+        pm.fill(Qt.transparent)
+        p = QPainter(pm)
+        p.setRenderHint(QPainter.Antialiasing)
+        rect = self._plot_rect()
+        n = len(self._bpm)
+
+        # axes and BPM labels
+        lo, hi = self._bpm_range()
+        p.setPen(QColor(120, 120, 120))
+        p.setFont(QFont("Arial", 9))
+        p.drawLine(rect.bottomLeft(), rect.bottomRight())
+        p.drawText(QRectF(0, rect.top() - 6, MARGIN_LEFT - 6, 14),
+                   Qt.AlignRight, f"{hi:.0f}")
+        p.drawText(QRectF(0, rect.bottom() - 8, MARGIN_LEFT - 6, 14),
+                   Qt.AlignRight, f"{lo:.0f}")
+        p.drawText(QRectF(rect.left(), rect.bottom() + KEY_STRIP + 2, rect.width(), 14),
+                   Qt.AlignLeft, "BPM / key by track position")
+        if not n:
+            p.end()
+            return pm
+
+        # key strip: a 1-pixel-per-track image stretched across the plot,
+        # so cell i always contains point i
+        step = rect.width() / max(n - 1, 1)
+        strip = KEY_RGB[np.array(self._codes, dtype=np.intp)]
+        img = QImage(strip.tobytes(), n, 1, 4 * n, QImage.Format_RGB32)
+        p.drawImage(QRectF(rect.left(), rect.bottom() + 2, rect.width(), KEY_STRIP - 2), img)
+
+        # antialiasing buys nothing once points are under 2px apart
+        p.setRenderHint(QPainter.Antialiasing, step >= 2)
+
+        p.setTransform(self._transform(rect))
+
+        # planned target, dashed under the curve
+        if self._target is not None:
+            pen = QPen(QColor(TARGET_GREY), 1.5, Qt.DashLine)
+            pen.setCosmetic(True)
+            p.setPen(pen)
+            t = self._target
+            p.drawLines([QLineF(i, t[i], i + 1, t[i + 1])
+                         for i in range(min(len(t), n) - 1)
+                         if t[i] > 0 and t[i + 1] > 0])
+
+        # BPM curve in data space; unknown BPMs (0) leave a gap
+        pen = QPen(QColor(NEON_GREEN), 2)
+        pen.setCosmetic(True)
+        p.setPen(pen)
+        bpm = self._bpm
+        p.drawLines([QLineF(i, a, i + 1, b)
+                     for i, (a, b) in enumerate(zip(bpm, bpm[1:])) if a > 0 and b > 0])
+
+        # key clashes: red segments on top of the curve
+        pen = QPen(QColor(CLASH_RED), 3)
+        pen.setCosmetic(True)
+        p.setPen(pen)
+        clashes = [i for i, c in enumerate(self._clash) if c]
+        p.drawLines([QLineF(i, bpm[i], i + 1, bpm[i + 1])
+                     for i in clashes if bpm[i] > 0 and bpm[i + 1] > 0])
+        p.resetTransform()
+
+        # and a tick under the strip, so clashes at unknown BPM still show
+        p.setPen(QColor(CLASH_RED))
+        y = rect.bottom() + KEY_STRIP + 1
+        x0 = rect.left() + step / 2
+        p.drawLines([QLineF(x0 + i * step, y, x0 + i * step, y + 4) for i in clashes])
+        p.end()
+        return pm
+
+    def _paint_marker(self, p):
+        n = len(self._bpm)
+        if not n:
+            return
+        rect = self._plot_rect()
+        i = self.current_index
+        x = self._x(i, rect)
+        p.setRenderHint(QPainter.Antialiasing)
+        pen = QPen(QColor(255, 255, 255, 160), 1, Qt.DashLine)
+        p.setPen(pen)
+        p.drawLine(QPointF(x, rect.top()), QPointF(x, rect.bottom() + KEY_STRIP))
+        if self._bpm[i] > 0:
+            y = self._transform(rect).map(QPointF(i, self._bpm[i])).y()
+            p.setPen(QPen(QColor(NEON_GREEN), 2))
+            p.setBrush(QColor(0, 0, 0))
+            p.drawEllipse(QPointF(x, y), 5, 5)
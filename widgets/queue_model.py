@@ -0,0 +1,194 @@
+# widgets/queue_model.py
+
+from bisect import bisect_left
+
+from PySide6.QtCore import Qt, QAbstractListModel, QModelIndex, QSize, QTimer
+from PySide6.QtGui import QColor
+
+# wait this long after the last keystroke before filtering
+FILTER_DELAY_MS = 150
+
+
+class QueueModel(QAbstractListModel):
+    """
+    The ordered set, one row per track, with the current track
+    highlighted. Edits are reported row by row (rowsInserted etc.), so
+    views and QueueFilter only touch what changed.
+    """
+    def __init__(self, items=(), parent=None):
+        super().__init__(parent)
+        self._items = list(items)
+        self.current = 0
+
+    def set_items(self, items):
+        self.beginResetModel()
+        self._items = list(items)
+        self.current = max(0, min(self.current, len(self._items) - 1))
+        self.endResetModel()
+
+    def insert_track(self, index, track):
+        """Insert one track; the current track stays current."""
+        self.beginInsertRows(QModelIndex(), index, index)
+        self._items.insert(index, track)
+        self.endInsertRows()
+        if index <= self.current and len(self._items) > 1:
+            self.current += 1
+
+    def remove_track(self, index):
+        self.beginRemoveRows(QModelIndex(), index, index)
+        del self._items[index]
+        self.endRemoveRows()
+        if index < self.current:
+            self.current -= 1
+        self.current = max(0, min(self.current, len(self._items) - 1))
+
+    def set_current(self, row):
+        old, self.current = self.current, row
+        for r in (old, row):
+            if 0 <= r < len(self._items):
+                i = self.index(r)
+                self.dataChanged.emit(i, i, [Qt.BackgroundRole])
+
+    def track(self, row):
+        return self._items[row]
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._items)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        row = index.row()
+        if role == Qt.DisplayRole:
+            return self._items[row].title
+        if role == Qt.BackgroundRole and row == self.current:
+            return QColor(57, 255, 20, 60)
+        if role == Qt.SizeHintRole:
+            return QSize(0, 50)
+        if role == Qt.UserRole:
+            return self._items[row]
+        return None
+
+
+class QueueFilter(QAbstractListModel):
+    """
+    The rows of a QueueModel whose title contains the query (case-
+    insensitive), shown as "N. Title" with N the position in the full set.
+
+    Keeps its own index (lower-cased titles and the matching source
+    rows) in step with the source's row signals, so an insert costs one
+    comparison rather than a re-filter, and a query that extends the
+    last one only re-checks the current matches. set_query() may be
+    called on every keystroke; the filter is applied once typing pauses.
+    """
+    def __init__(self, source, delay_ms=FILTER_DELAY_MS, parent=None):
+        super().__init__(parent)
+        self.source = source
+        self._query = ""
+        self._applied = ""
+        self._keys = []         # lower-cased title per source row
+        self._rows = []         # matching source rows, ascending
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(delay_ms)
+        self._timer.timeout.connect(self.apply_query)
+        source.modelReset.connect(self._reset)
+        source.rowsInserted.connect(self._on_inserted)
+        source.rowsRemoved.connect(self._on_removed)
+        source.dataChanged.connect(self._on_data_changed)
+        self._reset()
+
+    # --- Query ---
+
+    def set_query(self, text):
+        self._query = text
+        self._timer.start()
+
+    def apply_query(self):
+        """Filter now (what the timer does once typing pauses)."""
+        self._timer.stop()
+        q = self._query.lower()
+        if q == self._applied:
+            return
+        # narrowing: only the current matches can still match
+        if self._applied and q.startswith(self._applied):
+            pool = self._rows
+        else:
+            pool = range(len(self._keys))
+        keys = self._keys
+        rows = [r for r in pool if q in keys[r]]
+        self._applied = q
+        self.beginResetModel()
+        self._rows = rows
+        self.endResetModel()
+
+    def _reset(self):
+        self.beginResetModel()
+        self._keys = [self.source.track(r).title.lower()
+                      for r in range(self.source.rowCount())]
+        q = self._applied
+        self._rows = [r for r, k in enumerate(self._keys) if q in k]
+        self.endResetModel()
+
+    # --- Source changes ---
+
+    def _on_inserted(self, parent, first, last):
+        n = last - first + 1
+        new_keys = [self.source.track(r).title.lower() for r in range(first, last + 1)]
+        self._keys[first:first] = new_keys
+        pos = bisect_left(self._rows, first)
+        for i in range(pos, len(self._rows)):
+            self._rows[i] += n
+        added = [first + j for j, k in enumerate(new_keys) if self._applied in k]
+        if added:
+            self.beginInsertRows(QModelIndex(), pos, pos + len(added) - 1)
+            self._rows[pos:pos] = added
+            self.endInsertRows()
+        self._renumbered(pos + len(added))
+
+    def _on_removed(self, parent, first, last):
+        n = last - first + 1
+        del self._keys[first:last + 1]
+        lo = bisect_left(self._rows, first)
+        hi = bisect_left(self._rows, last + 1)
+        if hi > lo:
+            self.beginRemoveRows(QModelIndex(), lo, hi - 1)
+            del self._rows[lo:hi]
+            self.endRemoveRows()
+        for i in range(lo, len(self._rows)):
+            self._rows[i] -= n
+        self._renumbered(lo)
+
+    def _renumbered(self, first):
+        # matches after an edit show a new position; views only repaint
+        # the visible ones
+        if first < len(self._rows):
+            self.dataChanged.emit(self.index(first), self.index(len(self._rows) - 1),
+                                  [Qt.DisplayRole])
+
+    def _on_data_changed(self, top_left, bottom_right, roles=()):
+        lo = bisect_left(self._rows, top_left.row())
+        hi = bisect_left(self._rows, bottom_right.row() + 1)
+        if hi > lo:
+            self.dataChanged.emit(self.index(lo), self.index(hi - 1), roles)
+
+    # --- Mapping ---
+
+    def source_row(self, row):
+        return self._rows[row]
+
+    def row_for_source(self, source_row):
+        """Row showing source_row, or -1 if it is filtered out."""
+        i = bisect_left(self._rows, source_row)
+        return i if i < len(self._rows) and self._rows[i] == source_row else -1
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        src = self._rows[index.row()]
+        if role == Qt.DisplayRole:
+            return f"{src + 1}. {self.source.track(src).title}"
+        return self.source.data(self.source.index(src), role)
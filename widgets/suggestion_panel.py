@@ -0,0 +1,78 @@
+# widgets/suggestion_panel.py
+
+from PySide6.QtWidgets import (
+    QWidget, QVBoxLayout, QHBoxLayout, QLabel, QListWidget,
+    QListWidgetItem, QSpinBox
+)
+from PySide6.QtCore import Qt, Signal
+from PySide6.QtGui import QFont
+
+SUGGESTIONS = 8
+DEFAULT_BPM_RANGE = 6
+PANEL_WIDTH = 260
+_TEMPO = {2.0: " · double time", 0.5: " · half time"}
+
+
+class SuggestionPanel(QWidget):
+    """
+    Library tracks that mix well out of the current one, from a
+    CompatibilityIndex (utils.recommender). Sits beside the carousel;
+    double-clicking a suggestion emits trackChosen(track).
+    """
+    trackChosen = Signal(object)
+
+    def __init__(self, k=SUGGESTIONS, parent=None):
+        super().__init__(parent)
+        self.k = k
+        self.index = None
+        self.track = None
+        self.exclude_ids = frozenset()
+        self.setFixedWidth(PANEL_WIDTH)
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0,0,0,0)
+        layout.setSpacing(6)
+        header = QHBoxLayout()
+        lbl = QLabel("Mixes Well Next")
+        lbl.setFont(QFont("Arial",14, QFont.Bold))
+        header.addWidget(lbl)
+        header.addStretch()
+        self.bpm_range = QSpinBox()
+        self.bpm_range.setRange(1, 20)
+        self.bpm_range.setValue(DEFAULT_BPM_RANGE)
+        self.bpm_range.setPrefix("±")
+        self.bpm_range.setSuffix(" BPM")
+        self.bpm_range.valueChanged.connect(self.refresh)
+        header.addWidget(self.bpm_range)
+        layout.addLayout(header)
+
+        self.list = QListWidget()
+        self.list.setWordWrap(True)
+        self.list.itemActivated.connect(
+            lambda item: self.trackChosen.emit(item.data(Qt.UserRole))
+        )
+        layout.addWidget(self.list)
+
+    def set_index(self, index):
+        self.index = index
+        self.refresh()
+
+    def show_for(self, track, exclude_ids=frozenset()):
+        """Suggest follow-ups for track, leaving out library ids in exclude_ids."""
+        self.track = track
+        self.exclude_ids = exclude_ids
+        self.refresh()
+
+    def refresh(self):
+        self.list.clear()
+        if self.index is None or self.track is None:
+            return
+        for s in self.index.suggest(self.track, self.k, self.bpm_range.value(),
+                                    self.exclude_ids):
+            t = s.track
+            item = QListWidgetItem(
+                f"{t.title}\n{t.artist} · {t.bpm:g} BPM · {t.key} "
+                f"({s.relation}){_TEMPO.get(s.ratio, '')}"
+            )
+            item.setData(Qt.UserRole, t)
+            self.list.addItem(item)
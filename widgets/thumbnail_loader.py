@@ -0,0 +1,211 @@
+# widgets/thumbnail_loader.py
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from PySide6.QtCore import Qt, QObject, Signal, QCoreApplication
+from PySide6.QtGui import QPixmap
+
+from utils.track_db import DATA_DIR
+
+COVER_DIR = DATA_DIR / "covers"
+
+
+def scale_pixmap(pixmap, size):
+    """Square-fit a cover; every cover rescale in the UI goes through here."""
+    return pixmap.scaled(size,size, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+
+
+class ThumbnailLoader(QObject):
+    """
+    Fetches cover art off the UI thread.
+    Raw bytes are downloaded on a small thread pool and stored on disk
+    under data/covers/ by content hash (index.json maps URL -> hash).
+    Decoded QPixmaps are kept in an in-memory LRU on the UI thread,
+    together with pre-scaled copies at the carousel's cover sizes.
+    With offline set, covers not on disk come back null instead of
+    being downloaded (e.g. when resuming a session).
+    A URL whose download failed is not retried for failure_ttl seconds.
+    """
+    # emitted from worker threads, delivered queued on the UI thread
+    _fetched = Signal(str, bytes)
+
+    _instance = None
+
+    def __init__(self, cache_dir=COVER_DIR, max_items=256, max_workers=6,
+                 timeout=5, prescale=(160, 240), offline=False, failure_ttl=300,
+                 parent=None):
+        super().__init__(parent)
+        self.cache_dir = Path(cache_dir)
+        self.offline = offline
+        self.max_items = max_items
+        self.timeout = timeout
+        self.prescale = prescale
+        self.failure_ttl = failure_ttl
+
+        self._lru = OrderedDict()   # url -> QPixmap
+        self._scaled = {}           # url -> {size: QPixmap}
+        self._waiting = {}          # url -> [callback, ...]
+        self._failed = OrderedDict()    # url -> time.monotonic() of the failed fetch
+        self._pool = ThreadPoolExecutor(max_workers=max_workers,
+                                        thread_name_prefix="covers")
+        self._index_lock = threading.Lock()
+        self._index = self._load_index()
+        self._fetched.connect(self._on_fetched)
+
+    @classmethod
+    def instance(cls):
+        """Shared loader, so covers survive carousel rebuilds."""
+        if cls._instance is None:
+            cls._instance = cls()
+            app = QCoreApplication.instance()
+            if app is not None:
+                app.aboutToQuit.connect(cls._instance.shutdown)
+        return cls._instance
+
+    def get(self, url, callback):
+        """
+        Return the decoded pixmap for url if it is in memory.
+        Otherwise schedule a fetch, return None, and call
+        callback(pixmap) on the UI thread once it arrives
+        (the pixmap is null if the download failed). A URL that failed
+        within failure_ttl returns a null pixmap right away.
+        """
+        pm = self._lru.get(url)
+        if pm is not None:
+            self._lru.move_to_end(url)
+            return pm
+        failed_at = self._failed.get(url)
+        if failed_at is not None:
+            if time.monotonic() - failed_at < self.failure_ttl:
+                return QPixmap()
+            del self._failed[url]
+
+        waiters = self._waiting.get(url)
+        if waiters is not None:
+            waiters.append(callback)
+            return None
+        self._waiting[url] = [callback]
+        self._pool.submit(self._fetch, url)
+        return None
+
+    def scaled(self, url, size):
+        """The cover for url scaled to size x size, or None if not in memory."""
+        sizes = self._scaled.get(url)
+        if sizes is None:
+            return None
+        pm = sizes.get(size)
+        if pm is None:
+            pm = sizes[size] = scale_pixmap(self._lru[url], size)
+        return pm
+
+    def cancel(self, url, callback):
+        """Forget a callback, e.g. when its widget goes away."""
+        waiters = self._waiting.get(url)
+        if waiters and callback in waiters:
+            waiters.remove(callback)
+
+    def pending(self):
+        """Number of URLs still being fetched."""
+        return len(self._waiting)
+
+    def refs(self, urls):
+        """Disk cache entries for urls, as {url: content hash}."""
+        with self._index_lock:
+            return {u: self._index[u] for u in urls if u in self._index}
+
+    def add_refs(self, refs):
+        """Use cached covers recorded elsewhere (see refs())."""
+        with self._index_lock:
+            for url, digest in refs.items():
+                self._index.setdefault(url, digest)
+
+    def shutdown(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+    # --- worker side ---
+
+    def _fetch(self, url):
+        data = self._read_disk(url)
+        if data is None and self.offline:
+            data = b""
+        if data is None:
+            import requests  # only needed once a cover misses the disk cache
+            try:
+                resp = requests.get(url, timeout=self.timeout)
+                resp.raise_for_status()
+                data = resp.content
+            except Exception:
+                data = b""
+            if data:
+                self._write_disk(url, data)
+        self._fetched.emit(url, data)
+
+    def _object_path(self, digest):
+        return self.cache_dir / digest[:2] / digest
+
+    def _load_index(self):
+        try:
+            with open(self.cache_dir / "index.json", "r") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _read_disk(self, url):
+        with self._index_lock:
+            digest = self._index.get(url)
+        if not digest:
+            return None
+        try:
+            return self._object_path(digest).read_bytes()
+        except OSError:
+            return None
+
+    def _write_disk(self, url, data):
+        digest = hashlib.sha1(data).hexdigest()
+        path = self._object_path(digest)
+        try:
+            if not path.exists():
+                path.parent.mkdir(parents=True, exist_ok=True)
+                tmp = path.with_suffix(".tmp")
+                tmp.write_bytes(data)
+                os.replace(tmp, path)
+            with self._index_lock:
+                self._index[url] = digest
+                tmp = self.cache_dir / "index.json.tmp"
+                with open(tmp, "w") as f:
+                    json.dump(self._index, f)
+                os.replace(tmp, self.cache_dir / "index.json")
+        except OSError:
+            pass  # caching is best-effort
+
+    # --- UI side ---
+
+    def _on_fetched(self, url, data):
+        pm = QPixmap()
+        if data:
+            pm.loadFromData(data)
+        if not pm.isNull():
+            self._lru[url] = pm
+            self._lru.move_to_end(url)
+            self._scaled[url] = {s: scale_pixmap(pm, s) for s in self.prescale}
+            while len(self._lru) > self.max_items:
+                old, _ = self._lru.popitem(last=False)
+                self._scaled.pop(old, None)
+        elif not self.offline:
+            # offline misses are only missing from disk; don't hold those
+            self._failed[url] = time.monotonic()
+            self._failed.move_to_end(url)
+            while len(self._failed) > self.max_items:
+                self._failed.popitem(last=False)
+        for cb in self._waiting.pop(url, []):
+            try:
+                cb(pm)
+            except RuntimeError:
+                pass  # widget was deleted while we were fetching
@@ -0,0 +1,86 @@
+# widgets/track_completer.py
+
+from PySide6.QtWidgets import QCompleter
+from PySide6.QtCore import Qt, QAbstractListModel, QModelIndex, QTimer
+
+
+class TrackSearchModel(QAbstractListModel):
+    """
+    Completion rows for the current query only, fetched from the
+    TrackDB full-text index instead of holding every title in memory.
+    """
+    def __init__(self, db, limit=15, parent=None):
+        super().__init__(parent)
+        self.db = db
+        self.limit = limit
+        self._rows = []
+
+    def set_query(self, text):
+        rows = self.db.search(text, self.limit) if text.strip() else []
+        self.beginResetModel()
+        self._rows = rows
+        self.endResetModel()
+
+    def track(self, row):
+        return self._rows[row]
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        r = self._rows[index.row()]
+        if role in (Qt.DisplayRole, Qt.EditRole):
+            return r.title
+        if role == Qt.ToolTipRole:
+            return f"{r.artist} · {r.bpm} BPM · {r.key}"
+        if role == Qt.UserRole:
+            return r
+        return None
+
+
+class RequestCompleter(QCompleter):
+    """
+    Popup completer for the song-request box. Edits re-query the search
+    index once typing pauses for `delay_ms`; the popup shows the ranked
+    hits as they are, and selected_track() is the Track picked from it.
+    """
+    def __init__(self, db, line_edit, limit=15, delay_ms=150, parent=None):
+        super().__init__(parent)
+        self.search_model = TrackSearchModel(db, limit, self)
+        self.setModel(self.search_model)
+        self.setCompletionMode(QCompleter.UnfilteredPopupCompletion)
+        self.setCaseSensitivity(Qt.CaseInsensitive)
+        self.setWidget(line_edit)
+        self.line_edit = line_edit
+        self._picked = None
+        self._debounce = QTimer(self)
+        self._debounce.setSingleShot(True)
+        self._debounce.setInterval(delay_ms)
+        self._debounce.timeout.connect(self.run_query)
+        line_edit.textEdited.connect(self.update_query)
+        self.activated[QModelIndex].connect(self.pick)
+
+    def update_query(self, text):
+        """Restart the debounce; the search runs when it fires."""
+        self._picked = None
+        self._debounce.start()
+
+    def run_query(self):
+        self.search_model.set_query(self.line_edit.text())
+        if self.search_model.rowCount():
+            self.complete()
+        else:
+            self.popup().hide()
+
+    def pick(self, index):
+        track = index.data(Qt.UserRole)
+        self._picked = track
+        self.line_edit.setText(track.title)
+
+    def selected_track(self):
+        """The Track picked from the popup, if the box still shows it."""
+        if self._picked and self.line_edit.text() == self._picked.title:
+            return self._picked
+        return None